@@ -0,0 +1,125 @@
+import base64
+from datetime import date
+from typing import Any, Dict, List, Optional
+
+# Number of set bits in each byte value, used with bytes.translate to count a whole range in C
+_POPCOUNT = bytes(bin(value).count("1") for value in range(256))
+
+
+class ActivityCalendar:
+    """
+    Days on which a student completed a quiz, one bit per day.
+
+    Bit i of the bytearray is the day `start + i` (ordinal days, `start` aligned to a multiple of 8),
+    so marking and testing a day are O(1) and a year of history takes 46 bytes. Runs of consecutive
+    active days are kept up to date on every mark (run start <-> run end maps), which makes the current
+    and longest streak O(1) lookups instead of walks over the history.
+    """
+
+    def __init__(self):
+        self._start: Optional[int] = None # Ordinal of bit 0
+        self._bits = bytearray()
+        self._run_end_by_start: Dict[int, int] = {}
+        self._run_start_by_end: Dict[int, int] = {}
+        self._longest = 0
+
+    def __len__(self) -> int:
+        """Number of active days."""
+        return sum(self._bits.translate(_POPCOUNT))
+
+    def __contains__(self, day: date) -> bool:
+        return self._test(day.toordinal())
+
+    def _test(self, ordinal: int) -> bool:
+        if self._start is None:
+            return False
+        offset = ordinal - self._start
+        if offset < 0 or offset >= len(self._bits) * 8:
+            return False
+        return bool(self._bits[offset >> 3] & (1 << (offset & 7)))
+
+    def _ensure_covers(self, ordinal: int):
+        """Grow the bit array (at either end, in whole bytes) so it includes `ordinal`."""
+        aligned = ordinal - ordinal % 8
+        if self._start is None:
+            self._start = aligned
+        if aligned < self._start:
+            self._bits[0:0] = bytes((self._start - aligned) // 8)
+            self._start = aligned
+        needed = (ordinal - self._start) // 8 + 1
+        if needed > len(self._bits):
+            self._bits.extend(bytes(needed - len(self._bits)))
+
+    def mark(self, day: date) -> bool:
+        """Record activity on a day; returns False if it was already marked."""
+        ordinal = day.toordinal()
+        if self._test(ordinal):
+            return False
+        self._ensure_covers(ordinal)
+        offset = ordinal - self._start
+        self._bits[offset >> 3] |= 1 << (offset & 7)
+
+        # Join the runs that end the day before and start the day after
+        run_start = self._run_start_by_end.pop(ordinal - 1, ordinal)
+        run_end = self._run_end_by_start.pop(ordinal + 1, ordinal)
+        self._run_end_by_start[run_start] = run_end
+        self._run_start_by_end[run_end] = run_start
+        self._longest = max(self._longest, run_end - run_start + 1)
+        return True
+
+    def count(self, first: date, last: date) -> int:
+        """Active days from `first` to `last`, inclusive."""
+        if self._start is None or last < first:
+            return 0
+        low = max(first.toordinal() - self._start, 0)
+        high = min(last.toordinal() - self._start, len(self._bits) * 8 - 1)
+        if high < low:
+            return 0
+        low_byte, high_byte = low >> 3, high >> 3
+        total = sum(self._bits[low_byte:high_byte + 1].translate(_POPCOUNT))
+        # Take back the bits of the edge bytes that fall outside the range
+        total -= _POPCOUNT[self._bits[low_byte] & ((1 << (low & 7)) - 1)]
+        total -= _POPCOUNT[self._bits[high_byte] >> ((high & 7) + 1)]
+        return total
+
+    def days(self, first: date, last: date) -> List[bool]:
+        """Activity flag for every day from `first` to `last`, inclusive."""
+        return [self._test(ordinal) for ordinal in range(first.toordinal(), last.toordinal() + 1)]
+
+    def current_streak(self, today: date) -> int:
+        """Length of the run of active days ending today, or yesterday if today has no activity yet."""
+        ordinal = today.toordinal()
+        if not self._test(ordinal):
+            ordinal -= 1
+        start = self._run_start_by_end.get(ordinal)
+        if start is not None:
+            return ordinal - start + 1
+        # The run goes on past `today` (only when asking about a past day), so count back over the bits
+        streak = 0
+        while self._test(ordinal - streak):
+            streak += 1
+        return streak
+
+    def longest_streak(self) -> int:
+        return self._longest
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact JSON-safe form: the first day covered and the bit array in base64."""
+        if self._start is None:
+            return {"start": None, "bits": ""}
+        return {"start": date.fromordinal(self._start).isoformat(), "bits": base64.b64encode(bytes(self._bits)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ActivityCalendar":
+        calendar = cls()
+        if not data.get("start"):
+            return calendar
+        start = date.fromisoformat(data["start"]).toordinal()
+        bits = base64.b64decode(data["bits"])
+        # Replay set bits in day order, so the runs are rebuilt by the same code path as live marks
+        for index, byte in enumerate(bits):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        calendar.mark(date.fromordinal(start + index * 8 + bit))
+        return calendar
@@ -0,0 +1,109 @@
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from attempt_log import AttemptLog
+
+DAY_SECONDS = 24 * 3600
+ANALYTICS_WINDOW_DAYS = 14 # "Recent" accuracy window; the trend compares it with the window before
+DECAY_HALF_LIFE_DAYS = 14 # An attempt this old counts half as much towards the decayed accuracy
+PRIOR_ATTEMPTS = 4 # Weakness is shrunk towards 50% accuracy by this many imaginary attempts
+
+
+def _safe_ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """Elementwise numerator / denominator, NaN where the denominator is not positive."""
+    ratio = np.full(len(denominator), np.nan)
+    np.divide(numerator, denominator, out=ratio, where=denominator > 0)
+    return ratio
+
+
+def _rollup(log: AttemptLog, sums: Dict[str, np.ndarray]) -> Tuple[Dict[str, np.ndarray], List[str]]:
+    """
+    Add each topic's sums into its ancestors as well, so "physics/electrostatics" also counts attempts
+    filed under "physics/electrostatics/capacitors". Returns the sums re-indexed, and the rolled-up topic list.
+    """
+    targets: Dict[str, int] = {}
+    pairs = [] # (source code, target index)
+    for code, topic in enumerate(log.topics):
+        parts = topic.split("/")
+        for depth in range(1, len(parts) + 1):
+            target = "/".join(parts[:depth])
+            pairs.append((code, targets.setdefault(target, len(targets))))
+    sources, destinations = (np.array(values, dtype=np.intp) for values in zip(*pairs))
+    rolled = {}
+    for name, values in sums.items():
+        rolled[name] = np.bincount(destinations, weights=values[sources], minlength=len(targets))
+    return rolled, list(targets)
+
+
+def topic_analytics(log: AttemptLog, now: Optional[float] = None, window_days: float = ANALYTICS_WINDOW_DAYS,
+                    half_life_days: float = DECAY_HALF_LIFE_DAYS, rollup: bool = True) -> Dict[str, Dict[str, float]]:
+    """
+    Per-topic statistics from the attempt log, computed column-wise with one weighted bincount per
+    measure (no Python loop over attempts):
+
+    - attempts, accuracy: all time
+    - recent_attempts, recent_accuracy: the last `window_days`
+    - trend: recent_accuracy minus accuracy in the `window_days` before that (NaN if either is empty)
+    - decayed_accuracy: attempts weighted by 0.5 ** (age / half life)
+    - weakness: 1 - decayed accuracy, shrunk towards 0.5 for topics with few recent attempts
+    - accuracy_percentile: share of the student's topics with a lower all-time accuracy (0-100)
+
+    With `rollup`, chapters and subjects include their subtopics' attempts.
+    """
+    if not len(log):
+        return {}
+    now = time.time() if now is None else now
+    topic = log.column("topic").astype(np.intp)
+    weight = log.column("weight").astype(np.float64)
+    correct = weight * log.column("correct")
+    age_days = (now - log.column("timestamp")) / DAY_SECONDS
+    recent = age_days <= window_days
+    previous = (age_days > window_days) & (age_days <= 2 * window_days)
+    decay = weight * np.exp2(-age_days / half_life_days)
+
+    size = len(log.topics)
+    sums = {
+        "attempts": np.bincount(topic, weights=weight, minlength=size),
+        "correct": np.bincount(topic, weights=correct, minlength=size),
+        "recent_attempts": np.bincount(topic, weights=weight * recent, minlength=size),
+        "recent_correct": np.bincount(topic, weights=correct * recent, minlength=size),
+        "previous_attempts": np.bincount(topic, weights=weight * previous, minlength=size),
+        "previous_correct": np.bincount(topic, weights=correct * previous, minlength=size),
+        "decayed_attempts": np.bincount(topic, weights=decay, minlength=size),
+        "decayed_correct": np.bincount(topic, weights=decay * log.column("correct"), minlength=size),
+    }
+    topics = log.topics
+    if rollup:
+        sums, topics = _rollup(log, sums)
+
+    accuracy = _safe_ratio(sums["correct"], sums["attempts"])
+    recent_accuracy = _safe_ratio(sums["recent_correct"], sums["recent_attempts"])
+    trend = recent_accuracy - _safe_ratio(sums["previous_correct"], sums["previous_attempts"])
+    decayed_accuracy = _safe_ratio(sums["decayed_correct"], sums["decayed_attempts"])
+    weakness = 1 - (sums["decayed_correct"] + PRIOR_ATTEMPTS / 2) / (sums["decayed_attempts"] + PRIOR_ATTEMPTS)
+
+    # Percentile rank among topics that have attempts: searchsorted over the sorted accuracies
+    attempted = sums["attempts"] > 0
+    ranked = np.sort(accuracy[attempted])
+    percentile = np.full(len(topics), np.nan)
+    if len(ranked):
+        percentile[attempted] = np.searchsorted(ranked, accuracy[attempted], side="left") / len(ranked) * 100
+
+    result = {}
+    for index, topic_id in enumerate(topics):
+        if not attempted[index]:
+            continue
+        result[topic_id] = {
+            "attempts": int(sums["attempts"][index]),
+            "accuracy": float(accuracy[index]),
+            "recent_attempts": int(sums["recent_attempts"][index]),
+            "recent_accuracy": float(recent_accuracy[index]),
+            "trend": float(trend[index]),
+            "decayed_accuracy": float(decayed_accuracy[index]),
+            "weakness": float(weakness[index]),
+            "accuracy_percentile": float(percentile[index]),
+        }
+    return result
+
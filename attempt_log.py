@@ -0,0 +1,114 @@
+import json
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Column name -> dtype; serialised chunks store the columns back to back in this order (16 bytes per attempt)
+COLUMNS: Dict[str, np.dtype] = {
+    "timestamp": np.dtype("<f8"), # Unix seconds
+    "topic": np.dtype("<u4"), # Index into AttemptLog.topics
+    "correct": np.dtype("u1"),
+    "difficulty": np.dtype("u1"), # Index into DIFFICULTIES
+    "source": np.dtype("u1"), # Index into SOURCES
+    "weight": np.dtype("i1"), # 1 for an attempt, -1 for taking back an attempt recorded earlier
+}
+ROW_BYTES = sum(dtype.itemsize for dtype in COLUMNS.values())
+DIFFICULTIES = ("", "JEE Mains", "JEE Advanced") # "" when unknown, e.g. questions read from a PDF
+SOURCES = ("quiz", "pdf")
+INITIAL_CAPACITY = 256
+
+
+class AttemptLog:
+    """
+    Append-only, columnar log of answered questions: one NumPy array per column, grown by doubling,
+    with topic ids interned to small integer codes. Analytics read the columns directly (see
+    attempt_analytics); nothing is ever updated in place, a revision is recorded as a -1 weight event.
+    """
+
+    def __init__(self):
+        self.topics: List[str] = [] # Topic code -> canonical topic id
+        self._topic_codes: Dict[str, int] = {}
+        self._size = 0
+        self._columns = {name: np.empty(INITIAL_CAPACITY, dtype=dtype) for name, dtype in COLUMNS.items()}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def column(self, name: str) -> np.ndarray:
+        """Read-only view of a column's filled part."""
+        view = self._columns[name][:self._size]
+        view.flags.writeable = False
+        return view
+
+    def topic_code(self, topic: str) -> int:
+        code = self._topic_codes.get(topic)
+        if code is None:
+            code = self._topic_codes[topic] = len(self.topics)
+            self.topics.append(topic)
+        return code
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        capacity = len(self._columns["timestamp"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, values in self._columns.items():
+            grown = np.empty(capacity, dtype=values.dtype)
+            grown[:self._size] = values[:self._size]
+            self._columns[name] = grown
+
+    def extend(self, topics: Sequence[str], correct: Sequence[bool], difficulty: str = "", source: str = "quiz",
+               timestamp: Optional[float] = None, weight: int = 1):
+        """Append one attempt per (topic, correct) pair, all sharing difficulty, source, timestamp and weight."""
+        count = len(topics)
+        if count == 0:
+            return
+        self._reserve(count)
+        end = self._size + count
+        self._columns["timestamp"][self._size:end] = time.time() if timestamp is None else timestamp
+        self._columns["topic"][self._size:end] = [self.topic_code(topic) for topic in topics]
+        self._columns["correct"][self._size:end] = np.asarray(correct, dtype=bool)
+        self._columns["difficulty"][self._size:end] = DIFFICULTIES.index(difficulty) if difficulty in DIFFICULTIES else 0
+        self._columns["source"][self._size:end] = SOURCES.index(source)
+        self._columns["weight"][self._size:end] = weight
+        self._size = end
+
+    def append(self, topic: str, correct: bool, difficulty: str = "", source: str = "quiz",
+               timestamp: Optional[float] = None, weight: int = 1):
+        self.extend([topic], [correct], difficulty, source, timestamp, weight)
+
+    def merge(self, other: "AttemptLog"):
+        """Append every event of another log, translating its topic codes into this log's."""
+        if not len(other):
+            return
+        self._reserve(len(other))
+        end = self._size + len(other)
+        translate = np.array([self.topic_code(topic) for topic in other.topics], dtype=COLUMNS["topic"])
+        for name in COLUMNS:
+            values = other.column(name)
+            self._columns[name][self._size:end] = translate[values] if name == "topic" else values
+        self._size = end
+
+    def to_chunk(self) -> Tuple[str, bytes]:
+        """(topic list as JSON, column bytes) for storage; decode with from_chunks."""
+        return json.dumps(self.topics), b"".join(self.column(name).tobytes() for name in COLUMNS)
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Tuple[str, bytes]]) -> "AttemptLog":
+        """Rebuild a log from stored chunks, in the order they were written."""
+        log = cls()
+        for topics_json, data in chunks:
+            count = len(data) // ROW_BYTES
+            chunk = cls()
+            chunk.topics = json.loads(topics_json)
+            chunk._topic_codes = {topic: code for code, topic in enumerate(chunk.topics)}
+            offset = 0
+            for name, dtype in COLUMNS.items():
+                chunk._columns[name] = np.frombuffer(data, dtype=dtype, count=count, offset=offset)
+                offset += count * dtype.itemsize
+            chunk._size = count
+            log.merge(chunk)
+        return log
@@ -0,0 +1,78 @@
+"""
+Startup-time benchmark.
+
+Imports each entry module in a fresh interpreter with `python -X importtime` and reports the total
+import cost plus the most expensive modules it pulled in. Run from the project root:
+
+    python bench_startup.py
+    python bench_startup.py --top 25 main quiz_module
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Tuple
+
+DEFAULT_TARGETS = ("main", "profile_module", "chat_module", "quiz_module", "pdf_analyzer_module")
+
+
+def import_times(module: str) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    Import `module` in a fresh interpreter. Returns the wall time in seconds and
+    {imported module: (self microseconds, cumulative microseconds)} parsed from -X importtime.
+    """
+    env = dict(os.environ)
+    env.setdefault("GEMINI_API_KEY", "benchmark")
+    env.setdefault("YOUTUBE_API_KEY", "benchmark")
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    elapsed = time.perf_counter() - started
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    modules = {}
+    for line in completed.stderr.splitlines():
+        # "import time:       self [us] |     cumulative | imported package"
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        modules[name.strip()] = (int(self_us), int(cumulative_us))
+    return elapsed, modules
+
+
+def report(module: str, runs: int, top: int):
+    walls: List[float] = []
+    modules: Dict[str, Tuple[int, int]] = {}
+    for _ in range(runs):
+        wall, modules = import_times(module)
+        walls.append(wall)
+
+    total_us = modules.get(module, (0, 0))[1]
+    print(f"\n== import {module}: {total_us / 1000:.1f} ms (interpreter wall time median {statistics.median(walls) * 1000:.0f} ms over {runs} runs)")
+    # Under `streamlit run` the server has already imported streamlit, so that part is not paid per session
+    streamlit_us = modules.get("streamlit", (0, 0))[1]
+    print(f"   excluding streamlit itself: {(total_us - streamlit_us) / 1000:.1f} ms")
+    print(f"{'cumulative ms':>14} {'self ms':>9}  module")
+    top_level = sorted(((name, times) for name, times in modules.items() if name != module),
+                       key=lambda item: -item[1][1])
+    for name, (self_us, cumulative_us) in top_level[:top]:
+        print(f"{cumulative_us / 1000:>14.1f} {self_us / 1000:>9.1f}  {name}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report per-module import cost of the app's entry modules.")
+    parser.add_argument("modules", nargs="*", default=list(DEFAULT_TARGETS))
+    parser.add_argument("--runs", type=int, default=3, help="fresh interpreters per module (wall time median)")
+    parser.add_argument("--top", type=int, default=15, help="most expensive imports to list per module")
+    args = parser.parse_args()
+    for module in args.modules:
+        report(module, args.runs, args.top)
+
+
+if __name__ == "__main__":
+    main()
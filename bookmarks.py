@@ -0,0 +1,58 @@
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+
+from question_ids import question_id
+
+
+class BookmarkStore:
+    """
+    Bookmarked questions keyed by stable question id.
+
+    Each entry refers to the quiz's own question record instead of a copy, plus the bookmark's
+    metadata (quiz topic and position in the quiz). Add, remove and membership checks are dict
+    operations on the exact id, never a fuzzy match, so removing a bookmark cannot touch another one.
+    Entries keep bookmarking order.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, qid: str) -> bool:
+        return qid in self._entries
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._entries.values())
+
+    def add(self, question: Dict[str, Any], quiz_topic: Optional[str] = None, question_idx: Optional[int] = None) -> Optional[str]:
+        """Bookmark a question; returns its id, or None if it is already bookmarked."""
+        qid = question_id(question)
+        if qid in self._entries:
+            return None
+        self._entries[qid] = {"id": qid, "question": question, "quiz_topic": quiz_topic, "question_idx": question_idx}
+        return qid
+
+    def remove(self, qid: str) -> bool:
+        """Remove a bookmark by id; returns False if it was not bookmarked."""
+        return self._entries.pop(qid, None) is not None
+
+    def page(self, page_number: int, page_size: int) -> List[Dict[str, Any]]:
+        """Entries on a 0-based page, in bookmarking order."""
+        start = page_number * page_size
+        return list(islice(self._entries.values(), start, start + page_size))
+
+    def page_count(self, page_size: int) -> int:
+        return max(1, -(-len(self._entries) // page_size))
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Entries for the stored profile (questions are shared, not copied)."""
+        return list(self._entries.values())
+
+    @classmethod
+    def from_list(cls, entries: List[Dict[str, Any]]) -> "BookmarkStore":
+        store = cls()
+        for entry in entries:
+            store._entries[entry["id"]] = dict(entry)
+        return store
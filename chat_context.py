@@ -0,0 +1,89 @@
+import concurrent.futures
+import threading
+from collections import deque
+from typing import List, Optional, Tuple
+
+from llm_gateway import get_gateway
+
+CHAT_CONTEXT_TURNS = 6 # Most recent exchanges sent verbatim with every message
+CHAT_SUMMARY_MAX_CHARS = 1500 # Hard cap on the running summary, whatever the model returns
+CHAT_MAX_PENDING_TURNS = 6 # Turns waiting to be summarised; beyond this the oldest are dropped
+_compaction_executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="chat-compaction")
+
+Turn = Tuple[str, str] # (student message, assistant reply)
+
+
+class ChatContext:
+    """
+    Bounded conversation context for the chat.
+
+    The last CHAT_CONTEXT_TURNS exchanges are kept verbatim; older ones are folded into a running
+    summary by a background Gemini call, so the prompt for a new message (summary + recent turns +
+    message) stays roughly the same size however long the session runs. Turns that are waiting for
+    the summariser are still sent verbatim, so nothing is lost while a compaction is in flight.
+    """
+
+    def __init__(self):
+        self.summary = ""
+        self._recent: deque = deque()
+        self._pending: List[Turn] = [] # Evicted from _recent, not yet in the summary
+        self._compaction: Optional[concurrent.futures.Future] = None
+        self._lock = threading.Lock()
+
+    def add_turn(self, message: str, reply: str):
+        """Record a finished exchange, evicting the oldest to the summariser once the window is full."""
+        with self._lock:
+            self._recent.append((message, reply))
+            while len(self._recent) > CHAT_CONTEXT_TURNS:
+                self._pending.append(self._recent.popleft())
+            # If summarising keeps failing, stay bounded by forgetting the oldest waiting turns
+            del self._pending[:-CHAT_MAX_PENDING_TURNS]
+            if self._pending and self._compaction is None:
+                self._compaction = _compaction_executor.submit(self._compact, self.summary, list(self._pending))
+
+    def _compact(self, summary: str, turns: List[Turn]):
+        """Background task: fold `turns` into `summary`, then start another round if more turns arrived."""
+        try:
+            new_summary = get_gateway().generate(
+                _build_summary_prompt(summary, turns), generation_config={"temperature": 0.2}, use_cache=False
+            ).strip()[:CHAT_SUMMARY_MAX_CHARS]
+        except Exception as e: # Turns stay pending and are retried with the next turn
+            print(f"Chat summary compaction failed: {e!r}")
+            new_summary = None
+        with self._lock:
+            self._compaction = None
+            if new_summary is not None:
+                self.summary = new_summary
+                # Drop exactly the turns that were summarised (by identity; the oldest may have been dropped already)
+                summarised = {id(turn) for turn in turns}
+                self._pending = [turn for turn in self._pending if id(turn) not in summarised]
+                if self._pending:
+                    self._compaction = _compaction_executor.submit(self._compact, self.summary, list(self._pending))
+
+    def context_text(self) -> str:
+        """Summary and verbatim recent turns, formatted for the reply prompt ("" for a new conversation)."""
+        with self._lock:
+            summary = self.summary
+            turns = self._pending + list(self._recent)
+        parts = []
+        if summary:
+            parts.append(f"Summary of the earlier conversation:\n{summary}")
+        if turns:
+            parts.append("Most recent messages:\n" + "\n".join(f"Student: {message}\nYou: {reply}" for message, reply in turns))
+        return "\n\n".join(parts)
+
+
+def _build_summary_prompt(summary: str, turns: List[Turn]) -> str:
+    transcript = "\n".join(f"Student: {message}\nTutor: {reply}" for message, reply in turns)
+    return f"""
+    You maintain a running summary of a tutoring chat with a JEE aspirant.
+    Update the summary with the new exchanges below. Keep what matters for later turns: the student's
+    goals, topics discussed, difficulties and misconceptions, and anything the tutor promised or recommended.
+    Write at most 150 words of plain text, no preamble.
+
+    Current summary:
+    {summary or "(none yet)"}
+
+    New exchanges:
+    {transcript}
+    """
@@ -1,92 +1,185 @@
 import streamlit as st
-import google.generativeai as genai
-from typing import Set
-from utils import get_youtube_links # Import get_youtube_links
-
-def initialize_chat():
-    """Initialize the Gemini chat model."""
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    chat = model.start_chat(history=[])
-    return chat
-
-def process_message(message: str) -> Set[str]:
-    """Process a user message to identify weak topics."""
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
+import re
+import time
+import concurrent.futures
+from typing import Dict, Iterator, List, Set
+from utils import search_youtube_videos
+from topic_taxonomy import canonical_topic, topic_name
+from topic_classifier import get_topic_classifier
+from llm_gateway import get_gateway
+from chat_context import ChatContext
+
+CHAT_VIDEO_TIMEOUT = 8 # Seconds from the start of a turn for topic extraction plus all video searches
+CHAT_LATENCY_HISTORY = 50 # Per-turn latency samples kept in st.session_state.chat_latency
+CHAT_PIPELINE_WORKERS = 16 # Threads for each turn's background task (topic extraction, then video lookup), shared by all chat turns
+CHAT_VIDEO_SEARCH_WORKERS = 16 # Threads for the per-topic YouTube searches those tasks fan out
+CHAT_HISTORY_MAX_MESSAGES = 200 # Messages kept for display; the model only ever sees the bounded ChatContext
+# Two pools so a task never waits on work queued behind it in its own pool
+_chat_executor = concurrent.futures.ThreadPoolExecutor(max_workers=CHAT_PIPELINE_WORKERS, thread_name_prefix="chat-pipeline")
+_video_executor = concurrent.futures.ThreadPoolExecutor(max_workers=CHAT_VIDEO_SEARCH_WORKERS, thread_name_prefix="chat-videos")
+
+def initialize_chat() -> ChatContext:
+    """Start a new conversation context (recent turns verbatim plus a running summary)."""
+    return ChatContext()
+
+def _parse_topic_list(text: str) -> Set[str]:
+    """Canonical topic ids from a comma/newline separated topic list ("organic chemistry, optics")."""
+    text = text.strip().lower()
+    if text == "none" or not text:
+        return set()
+    return {canonical_topic(part) for part in re.split(r"[,;\n]+", text) if part.strip(" .-*\"'") and part.strip() != "none"}
+
+def _extract_weak_topics_with_llm(message: str) -> Set[str]:
+    """Ask Gemini which weak topics a student message points to and return them as canonical topic ids."""
     prompt = f"""
     From the following student message, identify any weak topics or subjects the student might be struggling with.
     Try to think from the students prospective that if he wrote the message then which topic he might be wanting to know more about.
-    If there are weak topics, respond with the list of topics separated by a single space (e.g., "calculus thermodynamics optics").
+    If there are weak topics, respond with the list of topics separated by commas (e.g., "calculus, organic chemistry, optics").
     If no weak topics are found, respond with "none".
     
     Message: "{message}"
     """
-    
-    try:
-        response = model.generate_content(
-            prompt,
-            generation_config={"temperature": 0.2}
-        )
-        
-        text = response.text.strip().lower()
-        if text == "none" or not text:
-            return set()
-        
-        new_topics = set(filter(None, text.split())) # Filter out empty strings
-        return new_topics
-    
-    except Exception as e:
-        st.error(f"Error processing message for weak topics: {str(e)}")
-        return set()
 
-def get_chatbot_response(message: str) -> str:
-    """Get a response from the chatbot based on the user's message."""
-    if st.session_state.chat is None:
-        st.session_state.chat = initialize_chat()
-    
-    # Get detected topics
-    new_topics = process_message(message)
-    youtube_links = {}
-    
-    # Get YouTube links for detected topics
-    if new_topics:
-        for topic in new_topics:
-            videos = get_youtube_links(topic)
-            if videos:
-                youtube_links[topic] = videos[:2]  # Get top 2 videos per topic
+    response_text = get_gateway().generate(
+        prompt,
+        generation_config={"temperature": 0.2}
+    )
 
-    prompt = f"""
+    return _parse_topic_list(response_text)
+
+def extract_weak_topics(message: str) -> Set[str]:
+    """
+    Weak topics a student message points to, as canonical topic ids. The local syllabus classifier
+    answers most messages; Gemini is only asked when its confidence is below TOPIC_CLASSIFIER_MIN_CONFIDENCE.
+    Raises on API errors and never touches the UI, so it is safe to call from background threads.
+    """
+    return get_topic_classifier().tag(message, _extract_weak_topics_with_llm)
+
+def _build_reply_prompt(message: str, context: ChatContext) -> str:
+    context_text = context.context_text()
+    conversation = f"\n    Conversation so far:\n    {context_text}\n" if context_text else ""
+    return f"""
     You are a student support chatbot. The user is preparing for the Joint Entrance Exam (JEE).
+    {conversation}
     Please provide an appropriate response to their message: "{message}"
-    
+
     Format your response in a clear, helpful manner.
     Keep information short and to the point.
     Highlight important information when needed.
     Keep the overall response brief and easy to read.
     """
-    
+
+def _find_videos_for_message(message: str, deadline: float):
+    """
+    Background task on _chat_executor: extract weak topics from a message, fan out one YouTube search
+    per topic on _video_executor and gather whatever finishes before the deadline.
+    Returns (detected topics, {topic: top videos}).
+    """
     try:
-        response = st.session_state.chat.send_message(prompt)
-        response_text = response.text
-        
-        # Add YouTube links if available
-        if youtube_links:
-            response_text += "\n\n**Recommended Study Videos:**\n"
-            for topic, videos in youtube_links.items():
-                response_text += f"\n📺 **{topic.title()}**:\n"
-                for vid in videos:
-                    response_text += f"- [{vid['title']}]({vid['url']})\n"
-        
-        st.session_state.weak_topics.update(new_topics)
-        return response_text
-        
+        new_topics = extract_weak_topics(message)
+    except Exception as e: # The reply goes out without recommendations
+        print(f"Weak topic extraction skipped: {e!r}")
+        return set(), {}
+
+    # One search per canonical topic id, so "thermo" and "thermodynamics" share a search and its cache entry
+    video_futures = {topic: _video_executor.submit(search_youtube_videos, topic) for topic in sorted(new_topics)}
+    concurrent.futures.wait(video_futures.values(), timeout=max(0.0, deadline - time.monotonic()))
+
+    youtube_links: Dict[str, List[Dict[str, str]]] = {}
+    for topic, future in video_futures.items(): # Keep topic order stable for the message
+        if future.done() and future.exception() is None and future.result():
+            youtube_links[topic] = future.result()[:2]  # Get top 2 videos per topic
+        else:
+            future.cancel()
+    return new_topics, youtube_links
+
+def _format_video_recommendations(youtube_links: Dict[str, List[Dict[str, str]]]) -> str:
+    text = "\n\n**Recommended Study Videos:**\n"
+    for topic, videos in youtube_links.items():
+        text += f"\n📺 **{topic_name(topic)}**:\n"
+        for vid in videos:
+            text += f"- [{vid['title']}]({vid['url']})\n"
+    return text
+
+def _stream_reply_tokens(message: str, timings: Dict[str, float]) -> Iterator[str]:
+    """Yield the chat reply chunk by chunk as Gemini streams it, recording time-to-first-token and prompt size."""
+    started = time.monotonic()
+    prompt = _build_reply_prompt(message, st.session_state.chat)
+    timings["prompt_chars"] = len(prompt)
+    for text in get_gateway().stream(prompt, use_cache=False):
+        if "ttft" not in timings:
+            timings["ttft"] = time.monotonic() - started
+        yield text
+    timings["total"] = time.monotonic() - started
+
+def _record_chat_latency(timings: Dict[str, float]):
+    """Keep the most recent per-turn latencies for the session; the chat diagnostics show them."""
+    if "ttft" not in timings:
+        return
+    st.session_state.chat_latency.append(timings)
+    del st.session_state.chat_latency[:-CHAT_LATENCY_HISTORY]
+
+def stream_chatbot_response(message: str) -> str:
+    """
+    Stream the chatbot reply into the current container token by token, then append the video
+    recommendations once they resolve. Returns the assembled message for the chat history.
+    """
+    if st.session_state.chat is None:
+        st.session_state.chat = initialize_chat()
+
+    deadline = time.monotonic() + CHAT_VIDEO_TIMEOUT
+    videos_future = _chat_executor.submit(_find_videos_for_message, message, deadline)
+
+    timings: Dict[str, float] = {}
+    try:
+        response_text = st.write_stream(_stream_reply_tokens(message, timings))
+        st.session_state.chat.add_turn(message, response_text)
     except Exception as e:
         st.error(f"Error generating chatbot response: {str(e)}")
         return "Sorry, something went wrong. Please try again later."
-    
+    finally:
+        _record_chat_latency(timings)
+
+    try: # Topic extraction runs inside the task, so this wait is what bounds it
+        with st.spinner("Finding study videos..."):
+            new_topics, youtube_links = videos_future.result(timeout=max(0.0, deadline - time.monotonic()) + 1)
+    except Exception:
+        return response_text
+
+    # Add YouTube links if available
+    if youtube_links:
+        recommendations = _format_video_recommendations(youtube_links)
+        st.markdown(recommendations)
+        response_text += recommendations
+
+    st.session_state.weak_topics.update(new_topics)
+    return response_text
+
+def _display_chat_diagnostics():
+    """Sidebar counters: this session's reply latency, and for the whole process how weak topics were tagged and how Gemini calls went."""
+    stats = get_topic_classifier().stats()
+    llm = get_gateway().stats()
+    latency = st.session_state.chat_latency
+    with st.sidebar.expander("⚙️ Chat diagnostics"):
+        if latency:
+            last = latency[-1]
+            first_tokens = sorted(turn["ttft"] for turn in latency)
+            st.write(f"Last reply: first token {last['ttft']:.2f}s, full reply {last.get('total', float('nan')):.2f}s, prompt {last['prompt_chars']} chars")
+            st.write(f"First token over the last {len(latency)} replies: median {first_tokens[len(first_tokens) // 2]:.2f}s, slowest {first_tokens[-1]:.2f}s")
+        st.write(f"Weak topic tagging: {stats['fallbacks']}/{stats['messages']} messages fell back to the LLM ({stats['fallback_rate']:.0%})")
+        if stats["fallback_errors"]:
+            st.write(f"LLM fallback errors: {stats['fallback_errors']}")
+        st.write(f"Gemini calls: {llm['calls']} ({llm['cache_hits']} more answered from cache), {llm['errors']} failed")
+        st.write(f"Retries: {llm['retries']}, hedged requests: {llm['hedges']} ({llm['hedge_wins']} won)")
+        st.write(f"Rate limited: {llm['throttled']} calls waited {llm['throttle_seconds']:.1f}s in total")
+        if "latency_p50" in llm:
+            st.write(f"Latency: p50 {llm['latency_p50']:.2f}s, p95 {llm['latency_p95']:.2f}s")
+        st.write(f"Tokens: {llm['prompt_tokens']} prompt, {llm['output_tokens']} output")
+
 def display_chat():
     """Display the chat interface."""
     st.subheader("💬 Chat with your Study Buddy")
+    _display_chat_diagnostics()
     
     for message in st.session_state.chat_history:
         with st.chat_message(message["role"]):
@@ -100,9 +193,8 @@ def display_chat():
             st.markdown(user_message)
         
         with st.chat_message("assistant"):
-            with st.spinner("Thinking..."):
-                ai_response = get_chatbot_response(user_message)
-                st.markdown(ai_response) # Display AI response using markdown
+            ai_response = stream_chatbot_response(user_message) # Renders the reply as it streams in
         
         st.session_state.chat_history.append({"role": "assistant", "content": ai_response})
+        del st.session_state.chat_history[:-CHAT_HISTORY_MAX_MESSAGES]
         st.rerun()
\ No newline at end of file
@@ -1,7 +1,9 @@
 import streamlit as st
-import google.generativeai as genai
 import os
 from dotenv import load_dotenv
+from bookmarks import BookmarkStore
+from activity_calendar import ActivityCalendar
+from review_scheduler import ReviewScheduler
 
 load_dotenv()
 
@@ -11,8 +13,6 @@ try:
 except:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-genai.configure(api_key=GEMINI_API_KEY)
-
 # YouTube API Configuration
 try:
     YOUTUBE_API_KEY = st.secrets["YOUTUBE_API_KEY"]
@@ -22,16 +22,53 @@ except:
 YOUTUBE_API_SERVICE_NAME = "youtube"
 YOUTUBE_API_VERSION = "v3"
 
+# Gemini gateway: one shared model per name, process-wide rate limit, retries and hedged requests
+GEMINI_MODEL_NAME = os.getenv("GEMINI_MODEL_NAME", "gemini-1.5-flash")
+LLM_RATE_LIMIT_PER_MINUTE = float(os.getenv("LLM_RATE_LIMIT_PER_MINUTE", 60))
+LLM_RATE_LIMIT_BURST = float(os.getenv("LLM_RATE_LIMIT_BURST", 10))
+LLM_MAX_IN_FLIGHT = int(os.getenv("LLM_MAX_IN_FLIGHT", 8))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", 4))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", 0.5))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", 8))
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "1") == "1"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", 95))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", 20)) # Calls observed before hedging kicks in
+
+# Persistent LLM response cache (shared by all worker processes on this machine)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", os.path.join(".cache", "llm_responses.sqlite3"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+
+# Local bank of every generated quiz question; quizzes are filled from it before asking Gemini
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", os.path.join("data", "question_bank.sqlite3"))
+
+# Durable per-user progress; updates are buffered in memory and written in batches
+PROFILE_DB_PATH = os.getenv("PROFILE_DB_PATH", os.path.join("data", "profiles.sqlite3"))
+PROFILE_FLUSH_INTERVAL_SECONDS = float(os.getenv("PROFILE_FLUSH_INTERVAL_SECONDS", 30))
+
+# Chat weak-topic tagging: the local classifier answers when its confidence reaches this, otherwise Gemini is asked
+TOPIC_CLASSIFIER_MIN_CONFIDENCE = float(os.getenv("TOPIC_CLASSIFIER_MIN_CONFIDENCE", 0.5))
+
 def initialize_session_state():
     """Initialize session state variables."""
     if "chat" not in st.session_state:
         st.session_state.chat = None
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
+    if "chat_latency" not in st.session_state:
+        st.session_state.chat_latency = [] # [{"ttft": seconds, "total": seconds, "prompt_chars": n}] for recent chat turns, shown in the chat diagnostics
     if "weak_topics" not in st.session_state:
         st.session_state.weak_topics = set()
     if "quiz_questions" not in st.session_state:
         st.session_state.quiz_questions = []
+    if "quiz_links" not in st.session_state:
+        st.session_state.quiz_links = {} # {question_idx: {"text": Future, "youtube": Future}} for the active quiz
+    if "quiz_question_topics" not in st.session_state:
+        st.session_state.quiz_question_topics = [] # Per-question topic ids in a review session; empty for a generated quiz
+    if "review_scheduler" not in st.session_state:
+        st.session_state.review_scheduler = ReviewScheduler() # Missed and bookmarked questions, by next review time
+    if "quiz_stream" not in st.session_state:
+        st.session_state.quiz_stream = None # QuizStream while questions are still being generated in the background
     if "current_question" not in st.session_state:
         st.session_state.current_question = 0
     if "showing_quiz" not in st.session_state:
@@ -42,6 +79,10 @@ def initialize_session_state():
         st.session_state.answered_questions = {} # Store answers and results
     if "pdf_analysis_result" not in st.session_state:
         st.session_state.pdf_analysis_result = None
+    if "pdf_analyses" not in st.session_state:
+        st.session_state.pdf_analyses = {} # {document hash: {"fingerprints": [...], "chunks": {...}, "result": {...}, "lineage": first version's hash}}
+    if "pdf_revision_pending" not in st.session_state:
+        st.session_state.pdf_revision_pending = None # {"new": stored analysis, "previous": stored analysis} awaiting the student's answer
 
     # Gamification additions
     if "total_questions_solved" not in st.session_state:
@@ -50,21 +91,31 @@ def initialize_session_state():
         st.session_state.total_correct_answers = 0
     if "topics_covered" not in st.session_state:
         st.session_state.topics_covered = set()
-    if "current_streak" not in st.session_state:
-        st.session_state.current_streak = 0
-    if "last_quiz_date" not in st.session_state:
-        st.session_state.last_quiz_date = None # To track consecutive days
-    if "streak_history" not in st.session_state:
-        st.session_state.streak_history = {} # {date: True/False if quiz completed on that day}
+    if "activity_calendar" not in st.session_state:
+        st.session_state.activity_calendar = ActivityCalendar() # Days with a completed quiz; streaks are derived from it
     if "user_name" not in st.session_state:
         st.session_state.user_name = "" # For personalization
+    if "profile_id" not in st.session_state:
+        st.session_state.profile_id = "" # Generated id the user's profile is stored under (profile_store.start_profile)
+    if "profile_versions" not in st.session_state:
+        st.session_state.profile_versions = {"topics": 0, "streak": 0} # Bumped on every change; keys the profile page's rendered HTML
+    if "profile_render_cache" not in st.session_state:
+        st.session_state.profile_render_cache = {} # {part: (key, html)} for the profile page's tag cloud and streak chart
+    if "profile_user" not in st.session_state:
+        st.session_state.profile_user = None # User whose stored profile has been loaded into this session
 
     # New: For topic-specific performance tracking
     if "topic_performance" not in st.session_state:
         st.session_state.topic_performance = {} # {topic: {"total_solved": int, "correct_solved": int}}
     if "current_quiz_main_topic" not in st.session_state: # To store the topic of the currently active quiz
         st.session_state.current_quiz_main_topic = ""
+    if "current_quiz_difficulty" not in st.session_state:
+        st.session_state.current_quiz_difficulty = ""
+    if "attempt_log" not in st.session_state:
+        st.session_state.attempt_log = None # AttemptLog of every answered question, loaded on first use (profile_store.session_attempt_log)
 
     # New: For bookmarked questions
     if "bookmarked_questions" not in st.session_state:
-        st.session_state.bookmarked_questions = [] # Store bookmarked questions
\ No newline at end of file
+        st.session_state.bookmarked_questions = BookmarkStore() # Bookmarked questions keyed by question id
+    if "bookmark_page" not in st.session_state:
+        st.session_state.bookmark_page = 0 # Page of saved questions shown on the profile
\ No newline at end of file
@@ -0,0 +1,74 @@
+import json
+from typing import Any, List
+
+
+class JSONArrayStreamParser:
+    """
+    Incremental parser for a JSON array of objects that arrives in arbitrary text chunks.
+
+    Each call to feed() returns the array elements that were completed by that chunk, so callers
+    can act on the first object while the rest of the array is still being generated. Anything
+    before the opening '[' (markdown fences, chatter) is ignored, as is anything after the closing ']'.
+    Elements that are not valid JSON on their own are skipped and counted in `skipped`.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0 # Next character of the buffer to scan
+        self._started = False
+        self._depth = 0 # Nesting depth, where 1 means directly inside the top-level array
+        self._in_string = False
+        self._escape = False
+        self._element_start = -1
+        self.done = False
+        self.skipped = 0
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume the next chunk of text and return the elements it completed."""
+        if self.done or not chunk:
+            return []
+        self._buffer += chunk
+        completed = []
+        buffer = self._buffer
+        i = self._pos
+        while i < len(buffer):
+            char = buffer[i]
+            if not self._started:
+                if char == "[":
+                    self._started = True
+                    self._depth = 1
+            elif self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in "{[":
+                if self._depth == 1:
+                    self._element_start = i
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._depth == 1 and self._element_start != -1:
+                    try:
+                        completed.append(json.loads(buffer[self._element_start:i + 1]))
+                    except json.JSONDecodeError:
+                        self.skipped += 1
+                    self._element_start = -1
+                elif self._depth == 0:
+                    self.done = True
+                    break
+            i += 1
+
+        # Drop text that can no longer be part of an element to keep the buffer small.
+        if self._element_start == -1:
+            self._buffer = ""
+            self._pos = 0
+        else:
+            self._buffer = buffer[self._element_start:]
+            self._pos = i - self._element_start
+            self._element_start = 0
+        return completed
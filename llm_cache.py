@@ -0,0 +1,168 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from config import LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_BYTES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access);
+CREATE INDEX IF NOT EXISTS responses_created_at ON responses (created_at);
+CREATE TABLE IF NOT EXISTS stats (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO stats (name, value) VALUES ('hits', 0), ('misses', 0), ('evictions', 0);
+INSERT OR IGNORE INTO stats (name, value) SELECT 'bytes', COALESCE(SUM(size), 0) FROM responses;
+"""
+
+ACCESS_BATCH = 64 # Lookups whose recency and hit/miss counts are kept in memory before being written in one transaction
+
+
+class LLMResponseCache:
+    """
+    Disk-backed cache of LLM responses stored in SQLite.
+
+    Entries are keyed by a hash of the model name, prompt and generation config, expire after a TTL
+    and are evicted least-recently-used first once the stored responses exceed a byte budget.
+    The database runs in WAL mode with a busy timeout, so several Streamlit worker processes
+    (and threads within them) can share one cache file. Lookups are plain reads: the access times
+    they refresh and the hit/miss counters are buffered and written in batches (and before every
+    store, so eviction sees them). The stored byte total is kept as a running counter, so a store only
+    walks the LRU order when the budget is actually exceeded. Counters live in the database, so they
+    add up across processes and restarts.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float, max_bytes: int):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._access_lock = threading.Lock()
+        self._accessed: Dict[str, float] = {} # Key -> latest hit time not yet written
+        self._lookups = {"hits": 0, "misses": 0} # Not yet written
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def make_key(model_name: str, prompt: Any, generation_config: Optional[Dict[str, Any]] = None) -> str:
+        """Hash the model name, prompt and generation config into a cache key."""
+        payload = json.dumps(
+            {"model": model_name, "prompt": prompt, "config": generation_config or {}},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _bump(self, conn: sqlite3.Connection, counter: str, amount: int = 1):
+        conn.execute("UPDATE stats SET value = value + ? WHERE name = ?", (amount, counter))
+
+    def get(self, model_name: str, prompt: Any, generation_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Return the cached response text, or None on a miss or an expired entry (left for eviction to remove)."""
+        key = self.make_key(model_name, prompt, generation_config)
+        now = time.time()
+        row = self._connection().execute("SELECT response, created_at FROM responses WHERE key = ?", (key,)).fetchone()
+        hit = row is not None and now - row[1] <= self.ttl_seconds
+        with self._access_lock:
+            self._lookups["hits" if hit else "misses"] += 1
+            if hit:
+                self._accessed[key] = now
+            full = sum(self._lookups.values()) >= ACCESS_BATCH
+        if full:
+            conn = self._connection()
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                self._write_accesses(conn)
+        return row[0] if hit else None
+
+    def _write_accesses(self, conn: sqlite3.Connection):
+        """Write buffered access times and hit/miss counts inside the caller's transaction."""
+        with self._access_lock:
+            accessed, self._accessed = self._accessed, {}
+            lookups, self._lookups = self._lookups, {"hits": 0, "misses": 0}
+        conn.executemany("UPDATE responses SET last_access = max(last_access, ?) WHERE key = ?",
+                         [(when, key) for key, when in accessed.items()])
+        for counter, amount in lookups.items():
+            if amount:
+                self._bump(conn, counter, amount)
+
+    def set(self, model_name: str, prompt: Any, generation_config: Optional[Dict[str, Any]], response_text: str):
+        """Store a response and evict expired and least-recently-used entries beyond the byte budget."""
+        key = self.make_key(model_name, prompt, generation_config)
+        now = time.time()
+        size = len(response_text.encode("utf-8"))
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_accesses(conn)
+            replaced = conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, size, created_at, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model_name, response_text, size, now, now)
+            )
+            self._bump(conn, "bytes", size - (replaced[0] if replaced else 0))
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute("SELECT key, size FROM responses WHERE created_at < ?", (now - self.ttl_seconds,)).fetchall()
+        total = conn.execute("SELECT value FROM stats WHERE name = 'bytes'").fetchone()[0] - sum(size for _, size in expired)
+        victims = [(key,) for key, _ in expired]
+        if total > self.max_bytes:
+            excess = total - self.max_bytes
+            for key, size in conn.execute("SELECT key, size FROM responses WHERE created_at >= ? ORDER BY last_access",
+                                          (now - self.ttl_seconds,)):
+                victims.append((key,))
+                excess -= size
+                if excess <= 0:
+                    break
+            total = self.max_bytes + excess
+        if victims:
+            conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+            self._bump(conn, "evictions", len(victims))
+            conn.execute("UPDATE stats SET value = ? WHERE name = 'bytes'", (total,))
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters plus the current entry count and stored bytes."""
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            self._write_accesses(conn)
+        result = dict(conn.execute("SELECT name, value FROM stats").fetchall())
+        result["entries"] = conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return result
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Return the process-wide LLM response cache, creating it on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = LLMResponseCache(LLM_CACHE_PATH, LLM_CACHE_TTL_SECONDS, LLM_CACHE_MAX_BYTES)
+        return _cache
+
@@ -0,0 +1,292 @@
+import random
+import threading
+import time
+import concurrent.futures
+from collections import deque
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from config import (
+    GEMINI_API_KEY, GEMINI_MODEL_NAME, LLM_RATE_LIMIT_PER_MINUTE, LLM_RATE_LIMIT_BURST, LLM_MAX_IN_FLIGHT,
+    LLM_MAX_RETRIES, LLM_BACKOFF_BASE_SECONDS, LLM_BACKOFF_MAX_SECONDS,
+    LLM_HEDGE_ENABLED, LLM_HEDGE_PERCENTILE, LLM_HEDGE_MIN_SAMPLES
+)
+from llm_cache import get_llm_cache
+
+# Errors worth retrying: rate limiting, overload and timeouts on Google's side, plus dropped connections
+TRANSIENT_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.TooManyRequests,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.GatewayTimeout,
+    ConnectionError,
+    TimeoutError,
+)
+
+LATENCY_WINDOW = 200 # Recent call latencies kept for the hedging percentile
+RECENT_CALLS = 100 # Per-call records kept for reporting
+
+
+class TokenBucket:
+    """Process-wide token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        """Take a token if one is available right now."""
+        with self._lock:
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def acquire(self) -> float:
+        """Block until a token is available and take it. Returns the seconds spent waiting."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+
+class LLMGateway:
+    """
+    The one place the app talks to Gemini.
+
+    Model objects are created once and reused. Every request passes through a process-wide token
+    bucket and a cap on in-flight requests, transient errors are retried with full-jitter exponential
+    backoff, and one-shot generations optionally send a hedged duplicate when the first attempt is
+    slower than a recent latency percentile. Responses to one-shot generations go through the
+    persistent LLM cache. Per-call latency, token usage and time spent waiting on the rate limit
+    are kept for reporting via stats(), which the Chat page shows in its sidebar.
+    """
+
+    def __init__(self):
+        genai.configure(api_key=GEMINI_API_KEY)
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        self._models_lock = threading.Lock()
+        self._bucket = TokenBucket(LLM_RATE_LIMIT_PER_MINUTE / 60.0, LLM_RATE_LIMIT_BURST)
+        self._slots = threading.BoundedSemaphore(LLM_MAX_IN_FLIGHT)
+        self._hedge_executor = concurrent.futures.ThreadPoolExecutor(max_workers=LLM_MAX_IN_FLIGHT * 2, thread_name_prefix="llm-hedge")
+        self._stats_lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._recent_calls = deque(maxlen=RECENT_CALLS)
+        self._counters = {
+            "calls": 0, "cache_hits": 0, "retries": 0, "hedges": 0, "hedge_wins": 0, "errors": 0,
+            "throttled": 0, "throttle_seconds": 0.0, "prompt_tokens": 0, "output_tokens": 0,
+        }
+
+    def model(self, model_name: str = GEMINI_MODEL_NAME) -> genai.GenerativeModel:
+        """Return the shared model object for `model_name`."""
+        with self._models_lock:
+            if model_name not in self._models:
+                self._models[model_name] = genai.GenerativeModel(model_name)
+            return self._models[model_name]
+
+    # --- Request plumbing -------------------------------------------------
+
+    def _attempt(self, call: Callable[[], Any], record: Dict[str, Any]) -> Any:
+        """Run one request under the rate limit and in-flight cap."""
+        record["throttle_wait"] += self._bucket.acquire()
+        with self._slots:
+            return call()
+
+    def _with_retries(self, call: Callable[[], Any], record: Dict[str, Any]) -> Any:
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                return self._attempt(call, record)
+            except TRANSIENT_ERRORS:
+                if attempt == LLM_MAX_RETRIES:
+                    raise
+                record["retries"] += 1
+                time.sleep(random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)))
+
+    def _hedge_after(self) -> Optional[float]:
+        """Latency after which a hedged duplicate is sent, or None if hedging is off or there is too little data."""
+        if not LLM_HEDGE_ENABLED:
+            return None
+        with self._stats_lock:
+            if len(self._latencies) < LLM_HEDGE_MIN_SAMPLES:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * LLM_HEDGE_PERCENTILE / 100))]
+
+    def _with_hedging(self, call: Callable[[], Any], record: Dict[str, Any]) -> Any:
+        hedge_after = self._hedge_after()
+        if hedge_after is None:
+            return self._with_retries(call, record)
+
+        primary = self._hedge_executor.submit(self._with_retries, call, record)
+        try:
+            return primary.result(timeout=hedge_after)
+        except concurrent.futures.TimeoutError:
+            pass
+        # Only hedge if it fits in the rate limit right now; never queue extra load behind a slow call.
+        if not self._bucket.try_acquire():
+            return primary.result()
+
+        def hedged_attempt():
+            with self._slots:
+                return call()
+
+        record["hedged"] = True
+        hedge = self._hedge_executor.submit(hedged_attempt)
+        for future in concurrent.futures.as_completed([primary, hedge]):
+            if future.exception() is None:
+                record["hedge_won"] = future is hedge
+                return future.result()
+        return primary.result() # Both failed: surface the primary's error
+
+    def _record(self, record: Dict[str, Any], started: float, response: Any = None, error: bool = False):
+        record["latency"] = time.monotonic() - started
+        usage = getattr(response, "usage_metadata", None)
+        record["prompt_tokens"] = getattr(usage, "prompt_token_count", 0) or 0
+        record["output_tokens"] = getattr(usage, "candidates_token_count", 0) or 0
+        with self._stats_lock:
+            self._counters["calls"] += 1
+            self._counters["retries"] += record["retries"]
+            self._counters["hedges"] += int(record["hedged"])
+            self._counters["hedge_wins"] += int(record.get("hedge_won", False))
+            self._counters["errors"] += int(error)
+            self._counters["throttled"] += int(record["throttle_wait"] > 0)
+            self._counters["throttle_seconds"] += record["throttle_wait"]
+            self._counters["prompt_tokens"] += record["prompt_tokens"]
+            self._counters["output_tokens"] += record["output_tokens"]
+            if not error and record["kind"] == "generate":
+                self._latencies.append(record["latency"])
+            self._recent_calls.append(record)
+
+    @staticmethod
+    def _new_record(kind: str, model_name: str, stream: bool = False) -> Dict[str, Any]:
+        return {"kind": kind, "model": model_name, "stream": stream, "retries": 0, "hedged": False, "throttle_wait": 0.0}
+
+    # --- Public API -------------------------------------------------------
+
+    def generate(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+                 model_name: str = GEMINI_MODEL_NAME, use_cache: bool = True,
+                 validate: Optional[Callable[[str], bool]] = None) -> str:
+        """
+        One-shot generation returning the response text.
+        If `validate` is given, only responses it accepts are written to the cache.
+        """
+        cache = get_llm_cache() if use_cache else None
+        if cache is not None:
+            cached = cache.get(model_name, prompt, generation_config)
+            if cached is not None:
+                with self._stats_lock:
+                    self._counters["cache_hits"] += 1
+                return cached
+
+        model = self.model(model_name)
+        record = self._new_record("generate", model_name)
+        started = time.monotonic()
+        try:
+            response = self._with_hedging(lambda: model.generate_content(prompt, generation_config=generation_config), record)
+            response_text = response.text
+        except Exception:
+            self._record(record, started, error=True)
+            raise
+        self._record(record, started, response)
+
+        if cache is not None and (validate is None or validate(response_text)):
+            cache.set(model_name, prompt, generation_config, response_text)
+        return response_text
+
+    def stream(self, prompt: str, generation_config: Optional[Dict[str, Any]] = None,
+               model_name: str = GEMINI_MODEL_NAME, use_cache: bool = True,
+               validate: Optional[Callable[[str], bool]] = None) -> Iterator[str]:
+        """
+        Streaming generation yielding text chunks. Transient errors are retried until the first chunk
+        arrives; a cached response is replayed as a single chunk. The full text is cached at the end if
+        `validate` accepts it.
+        """
+        cache = get_llm_cache() if use_cache else None
+        if cache is not None:
+            cached = cache.get(model_name, prompt, generation_config)
+            if cached is not None:
+                with self._stats_lock:
+                    self._counters["cache_hits"] += 1
+                yield cached
+                return
+
+        model = self.model(model_name)
+        received: List[str] = []
+        for chunk in self._stream_chunks(
+            lambda: model.generate_content(prompt, generation_config=generation_config, stream=True),
+            self._new_record("stream", model_name, stream=True)
+        ):
+            received.append(chunk.text)
+            yield received[-1]
+
+        response_text = "".join(received)
+        if cache is not None and (validate is None or validate(response_text)):
+            cache.set(model_name, prompt, generation_config, response_text)
+
+    def _stream_chunks(self, start: Callable[[], Any], record: Dict[str, Any]) -> Iterator[Any]:
+        """Hold an in-flight slot for the whole stream and retry only until the first chunk arrives."""
+        started = time.monotonic()
+        last_chunk = None
+        try:
+            for attempt in range(LLM_MAX_RETRIES + 1):
+                record["throttle_wait"] += self._bucket.acquire()
+                with self._slots:
+                    try:
+                        for chunk in start():
+                            if last_chunk is None:
+                                record["ttft"] = time.monotonic() - started
+                            last_chunk = chunk
+                            yield chunk
+                        break
+                    except TRANSIENT_ERRORS:
+                        if last_chunk is not None or attempt == LLM_MAX_RETRIES:
+                            raise
+                record["retries"] += 1
+                time.sleep(random.uniform(0, min(LLM_BACKOFF_MAX_SECONDS, LLM_BACKOFF_BASE_SECONDS * 2 ** attempt)))
+        except Exception:
+            self._record(record, started, error=True)
+            raise
+        self._record(record, started, last_chunk)
+
+    def stats(self) -> Dict[str, Any]:
+        """Aggregate counters, latency percentiles and the most recent per-call records."""
+        with self._stats_lock:
+            latencies = sorted(self._latencies)
+            summary = dict(self._counters)
+            summary["recent_calls"] = list(self._recent_calls)
+        if latencies:
+            summary["latency_p50"] = latencies[len(latencies) // 2]
+            summary["latency_p95"] = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return summary
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> LLMGateway:
+    """Return the process-wide LLM gateway, creating it on first use."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
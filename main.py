@@ -1,42 +1,39 @@
 import streamlit as st
-from config import initialize_session_state, YOUTUBE_API_KEY, YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION
-from chat_module import display_chat
-from quiz_module import display_quiz_generator, display_quiz
-from pdf_analyzer_module import display_pdf_analyzer
-from profile_module import display_profile
-from googleapiclient.discovery import build
+from config import initialize_session_state
+from profile_store import ensure_profile_loaded, save_profile_state, start_profile, resume_profile, delete_profile
+from topic_taxonomy import topic_names
 
 def main():
     """Main application function."""
     st.set_page_config(page_title="JEE Study Buddy", layout="wide")
     st.title("🚀 JEE Study Buddy")
     
-    # Initialize YouTube API client
-    if "youtube_client" not in st.session_state:
-        st.session_state.youtube_client = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=YOUTUBE_API_KEY)
-
     initialize_session_state()
 
-    # Personalization prompt if name is not set
-    if not st.session_state.user_name:
+    # Personalization prompt if name is not set and the URL does not name a saved profile
+    if not st.session_state.user_name and not resume_profile():
         st.info("Welcome to your JEE Study Buddy! What should I call you?")
         user_input_name = st.text_input("Your Name:", key="initial_name_input")
         if st.button("Start My Journey"):
-            if user_input_name:
-                st.session_state.user_name = user_input_name
+            if user_input_name.strip():
+                start_profile(user_input_name.strip())
                 st.success(f"Great, {user_input_name}! Let's get started.")
                 st.rerun()
             else:
                 st.warning("Please enter your name to begin.")
         st.stop() # Stop execution until name is set
 
+    # Load this user's saved progress on first access, then buffer a snapshot of whatever the previous run changed
+    ensure_profile_loaded()
+    save_profile_state()
+
     st.sidebar.title("Navigation")
     page = st.sidebar.radio("Go to", ["Chat", "Quiz Generator", "Test Results Analyzer", "Profile"])
     
     st.sidebar.markdown("---")
     st.sidebar.subheader("🧠 Identified Weak Topics")
     if st.session_state.weak_topics:
-        for topic in sorted(list(st.session_state.weak_topics)): 
+        for topic in topic_names(st.session_state.weak_topics): 
             st.sidebar.write(f"- {topic}")
     else:
         st.sidebar.write("No weak topics identified yet. Chat with the buddy or analyze a test!")
@@ -47,6 +44,9 @@ def main():
 
     st.sidebar.markdown("---")
     if st.sidebar.button("⚠️ Clear All App Data & Restart", key="clear_all_data"):
+        delete_profile()
+        if st.session_state.quiz_stream is not None:
+            st.session_state.quiz_stream.close() # The quiz being generated is thrown away with the rest
         keys_to_clear = list(st.session_state.keys())
         for key in keys_to_clear:
             del st.session_state[key]
@@ -56,16 +56,22 @@ def main():
         st.success("All application data cleared! Restarting...")
         st.rerun()
 
+    # Page modules are imported on the page that needs them, so a run only pays for its own dependencies
+    # (PyMuPDF for the analyzer, the Gemini SDK for chat and quizzes, ...). Python caches them after the first import.
     if page == "Chat":
+        from chat_module import display_chat
         display_chat()
     elif page == "Quiz Generator":
+        from quiz_module import display_quiz_generator, display_quiz
         if st.session_state.showing_quiz:
             display_quiz()
         else:
             display_quiz_generator()
     elif page == "Test Results Analyzer":
+        from pdf_analyzer_module import display_pdf_analyzer
         display_pdf_analyzer()
     elif page == "Profile":
+        from profile_module import display_profile
         display_profile()
 
 if __name__ == "__main__":
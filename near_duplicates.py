@@ -0,0 +1,140 @@
+import zlib
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set
+
+import numpy as np
+
+from question_ids import normalize_text
+
+MINHASH_PERMUTATIONS = 128 # Signature length
+LSH_BANDS = 32 # Bands of MINHASH_PERMUTATIONS // LSH_BANDS rows; candidates share at least one whole band
+NEAR_DUPLICATE_THRESHOLD = 0.85 # Estimated word-set Jaccard similarity at which two questions are the same
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_rng = np.random.RandomState(20240601) # Fixed seed: signatures are stored and compared across processes
+_PERM_A = _rng.randint(1, (1 << 31) - 1, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+_PERM_B = _rng.randint(0, (1 << 31) - 1, size=MINHASH_PERMUTATIONS).astype(np.uint64)
+_ROWS_PER_BAND = MINHASH_PERMUTATIONS // LSH_BANDS
+
+
+def question_text(question: Dict[str, Any]) -> str:
+    """The text a question is compared on: its statement followed by its answer options."""
+    return " ".join([str(question.get("question", ""))] + [str(a) for a in question.get("answers") or []])
+
+
+def shingles(text: str) -> Set[int]:
+    """
+    32-bit hashes of the distinct words of the normalised text. Whole words tolerate reworded
+    questions ("operates between" / "works between") better than character shingles do.
+    """
+    return {zlib.crc32(word.encode("utf-8")) for word in normalize_text(text).split()} or {0}
+
+
+def value_fingerprint(text: str) -> int:
+    """
+    32-bit hash of the tokens containing a digit ("2", "9.8", "ch3cooh"), in sorted order. Questions
+    that differ only in their numbers or formulae are different questions however similar the wording.
+    """
+    values = sorted(word for word in normalize_text(text).split() if any(char.isdigit() for char in word))
+    return zlib.crc32("\x1f".join(values).encode("utf-8"))
+
+
+def minhash_signature(text: str) -> np.ndarray:
+    """
+    Signature of the text: its value fingerprint, then the MinHash of its word set under
+    MINHASH_PERMUTATIONS universal hash functions.
+    """
+    values = np.fromiter(shingles(text), dtype=np.uint64)
+    # a * x + b stays below 2**63 since a, b < 2**31 and x < 2**32
+    hashed = (_PERM_A[:, None] * values[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return np.concatenate(([value_fingerprint(text)], hashed.min(axis=1))).astype(np.uint32)
+
+
+def question_signature(question: Dict[str, Any]) -> np.ndarray:
+    return minhash_signature(question_text(question))
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the word sets behind two signatures; 0 unless their values match exactly."""
+    if a[0] != b[0]:
+        return 0.0
+    return float(np.count_nonzero(a[1:] == b[1:])) / (len(a) - 1)
+
+
+def band_hashes(signature: np.ndarray) -> List[bytes]:
+    """
+    One bucket key per LSH band of the signature. Every key starts with the value fingerprint, so
+    questions with different numbers never even become candidates.
+    """
+    fingerprint, minhash = signature[:1].tobytes(), signature[1:]
+    return [fingerprint + minhash[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND].tobytes() for band in range(LSH_BANDS)]
+
+
+class LSHIndex:
+    """
+    In-memory locality-sensitive hashing index over MinHash signatures.
+
+    Each signature is split into LSH_BANDS bands and filed under one bucket per band, so looking up
+    near-duplicates only compares against items sharing a bucket instead of the whole collection.
+    """
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._buckets: List[Dict[bytes, Set[Hashable]]] = [{} for _ in range(LSH_BANDS)]
+        self._signatures: Dict[Hashable, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._signatures
+
+    def insert(self, key: Hashable, signature: np.ndarray):
+        if key in self._signatures:
+            self.remove(key)
+        self._signatures[key] = signature
+        for band, bucket in enumerate(band_hashes(signature)):
+            self._buckets[band].setdefault(bucket, set()).add(key)
+
+    def remove(self, key: Hashable):
+        signature = self._signatures.pop(key, None)
+        if signature is None:
+            return
+        for band, bucket in enumerate(band_hashes(signature)):
+            keys = self._buckets[band].get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[band][bucket]
+
+    def candidates(self, signature: np.ndarray) -> Set[Hashable]:
+        """Keys sharing at least one band bucket with the signature."""
+        found: Set[Hashable] = set()
+        for band, bucket in enumerate(band_hashes(signature)):
+            found |= self._buckets[band].get(bucket, set())
+        return found
+
+    def find_duplicate(self, signature: np.ndarray) -> Optional[Hashable]:
+        """Key of the most similar indexed item at or above the threshold, or None."""
+        best_key, best_similarity = None, self.threshold
+        for key in self.candidates(signature):
+            similarity = estimated_similarity(signature, self._signatures[key])
+            if similarity >= best_similarity:
+                best_key, best_similarity = key, similarity
+        return best_key
+
+    def add_if_new(self, key: Hashable, signature: np.ndarray) -> Optional[Hashable]:
+        """Insert the item unless a near-duplicate is indexed; returns that duplicate's key, or None if inserted."""
+        duplicate = self.find_duplicate(signature)
+        if duplicate is None:
+            self.insert(key, signature)
+        return duplicate
+
+
+def unique_questions(questions: Iterable[Dict[str, Any]], index: Optional[LSHIndex] = None) -> List[Dict[str, Any]]:
+    """Drop near-duplicates from a sequence of questions, keeping the first of each group."""
+    index = index if index is not None else LSHIndex()
+    kept = []
+    for question in questions:
+        if index.add_if_new(object(), question_signature(question)) is None:
+            kept.append(question)
+    return kept
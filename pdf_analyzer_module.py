@@ -1,101 +1,436 @@
 import streamlit as st
-import google.generativeai as genai
-import fitz # PyMuPDF
 import json
-from typing import Any, Dict
+import re
+import hashlib
+import time
+import concurrent.futures
+from typing import Any, Dict, List, Optional, Set
+from llm_gateway import get_gateway
+from pdf_extraction import document_hash, extract_pages
+from result_parser import is_unattempted, parse_test_results
+from profile_store import record_progress, record_attempts, flush_profile
+from topic_taxonomy import canonical_topic
 
-def extract_text_from_pdf(pdf_file):
-    """Extract text from uploaded PDF file."""
+PDF_CHUNK_CHARS = 6000 # Max characters of test text sent in one map request
+PDF_ANALYSIS_WORKERS = 6 # Concurrent chunk analyses per document (the LLM gateway applies the global limits)
+PDF_PAGES_PER_CHUNK_TARGET = 3 # Average pages per chunk when analyzing an uploaded PDF page-wise
+PDF_REVISION_MIN_OVERLAP = 0.8 # Share of question pages an upload must have in common with a stored analysis to count as a revision
+PDF_SUMMARY_MAX_INCORRECT = 30 # Incorrect questions listed in the summarization prompt
+PDF_TAG_QUESTION_CHARS = 400 # Question text sent per question when tagging locally parsed results
+ANALYSIS_GENERATION_CONFIG = {"temperature": 0.2}
+
+# Question markers at the start of a line; a bare "12." is too common in other text to count
+_QUESTION_BOUNDARIES = [
+    re.compile(r"(?im)^[ \t]*->[ \t]*question\b"),
+    re.compile(r"(?im)^[ \t]*(?:q|que|ques|question)[ \t]*\.?[ \t]*(?:no\.?[ \t]*)?\d+"),
+]
+
+_analysis_executor = concurrent.futures.ThreadPoolExecutor(max_workers=PDF_ANALYSIS_WORKERS, thread_name_prefix="pdf-analysis")
+
+def _json_span(response_text: str, open_char: str, close_char: str) -> str:
+    """Strip markdown fences and return the outermost JSON array/object in a response, or ""."""
+    response_text = response_text.replace("```json", "").replace("```", "").strip()
+    json_start = response_text.find(open_char)
+    json_end = response_text.rfind(close_char) + 1
+    if json_start != -1 and json_end > json_start:
+        return response_text[json_start:json_end]
+    return ""
+
+def _parses_as(response_text: str, open_char: str, close_char: str, kind: type) -> bool:
     try:
-        text = ""
-        doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
-        for page in doc:
-            text += page.get_text()
-        return text.strip()
-    except Exception as e:
-        st.error(f"Error extracting text from PDF: {str(e)}")
-        return ""
+        return isinstance(json.loads(_json_span(response_text, open_char, close_char)), kind)
+    except json.JSONDecodeError:
+        return False
 
-def analyze_test_results(text):
-    """Analyze PDF test results to identify questions, student answers, correct answers, and determine weak topics based on incorrect answers."""
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
+def _analyze_chunk(chunk: str, part: int, total_parts: int) -> List[Dict[str, Any]]:
+    """
+    Map step: ask Gemini for the question_analysis entries of one chunk.
+    Runs on a worker thread, so it never touches the UI; errors are raised.
+    """
     prompt = f"""
-    You are analyzing a student's test results for JEE preparation. The PDF content might contain questions, 
-    student's answers, and correct answers. The typical format is:
+    You are analyzing part {part} of {total_parts} of a student's test results for JEE preparation.
+    The content might contain questions, student's answers, and correct answers. The typical format is:
     
     ->question
     ->answer by student
     ->correct answer
     
     However, the format might vary. Please be flexible in parsing.
-    Here is the extracted content from the test result:
+    Here is the extracted content of this part:
     ---
-    {text}
+    {chunk}
     ---
     
-    Please analyze and respond with the following JSON structure:
+    Respond with a JSON array with one object per question found in this part:
+    [
+      {{
+        "question": "Question text (or a summary if too long)",
+        "student_answer": "Student's answer",
+        "correct_answer": "Correct answer",
+        "is_correct": boolean,
+        "topic": "Related topic (e.g., Kinematics, Thermodynamics, P-block elements)",
+        "explanation": "Brief explanation of why the answer is correct/incorrect and what concept the student needs to focus on. If the answer is incorrect, identify the specific sub-topic or concept."
+      }}
+    ]
+    
+    Infer the topics from the questions themselves.
+    If this part contains no questions (e.g. only instructions or a cover page), return [].
+    Return ONLY valid JSON with no additional text or markdown formatting.
+    """
+    response_text = get_gateway().generate(
+        prompt,
+        generation_config=ANALYSIS_GENERATION_CONFIG,
+        validate=lambda text: _parses_as(text, "[", "]", list)
+    )
+    entries = json.loads(_json_span(response_text, "[", "]"))
+    return [entry for entry in entries if isinstance(entry, dict)]
+
+def _reduce_question_analysis(question_analysis: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Reduce step: compute the exact counts from the merged per-question entries."""
+    total = len(question_analysis)
+    correct = sum(1 for entry in question_analysis if entry.get("is_correct") is True)
+    return {
+        "total_questions": total,
+        "correct_answers": correct,
+        "incorrect_answers": total - correct,
+        "accuracy_percentage": round(correct / total * 100, 2) if total else 0,
+    }
+
+def _topic_breakdown(question_analysis: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """{topic: {"total": n, "incorrect": n}} over the merged entries."""
+    breakdown: Dict[str, Dict[str, int]] = {}
+    for entry in question_analysis:
+        topic = entry.get("topic") if isinstance(entry.get("topic"), str) else "Unknown"
+        stats = breakdown.setdefault(topic, {"total": 0, "incorrect": 0})
+        stats["total"] += 1
+        if entry.get("is_correct") is not True:
+            stats["incorrect"] += 1
+    return breakdown
+
+def _summarize_analysis(question_analysis: List[Dict[str, Any]], analysis: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    One short Gemini call over the reduced statistics for the summary and weak topics.
+    Falls back to a locally written summary if the call fails.
+    """
+    breakdown = _topic_breakdown(question_analysis)
+    topic_lines = "\n".join(
+        f"- {topic}: {stats['total'] - stats['incorrect']}/{stats['total']} correct"
+        for topic, stats in sorted(breakdown.items(), key=lambda item: -item[1]["incorrect"])
+    )
+    incorrect_lines = "\n".join(
+        [f"- [{entry.get('topic', 'Unknown')}] {str(entry.get('question', ''))[:200]}"
+         for entry in question_analysis if entry.get("is_correct") is not True][:PDF_SUMMARY_MAX_INCORRECT]
+    )
+    prompt = f"""
+    A JEE aspirant's test has been graded: {analysis['correct_answers']} of {analysis['total_questions']} correct ({analysis['accuracy_percentage']}%).
+    
+    Per-topic results:
+    {topic_lines}
+    
+    Some of the questions answered incorrectly:
+    {incorrect_lines or "None"}
+    
+    Respond with the following JSON structure:
     {{
       "weak_topics": ["topic1 based on incorrect answers", "topic2", ...],
-      "analysis": {{
-        "total_questions": "number (infer if possible, otherwise state 'not determinable')",
-        "correct_answers": "number (infer if possible, otherwise state 'not determinable')",
-        "incorrect_answers": "number (infer if possible, otherwise state 'not determinable')",
-        "accuracy_percentage": "number (calculate if possible, otherwise 'not determinable')"
-      }},
-      "question_analysis": [
-        {{
-          "question": "Question text (or a summary if too long)",
-          "student_answer": "Student's answer",
-          "correct_answer": "Correct answer",
-          "is_correct": boolean,
-          "topic": "Related topic (e.g., Kinematics, Thermodynamics, P-block elements)",
-          "explanation": "Brief explanation of why the answer is correct/incorrect and what concept the student needs to focus on. If the answer is incorrect, identify the specific sub-topic or concept."
-        }}
-        // ... more questions
-      ],
       "summary": "Brief overall analysis of student performance and recommendations. Highlight areas for improvement and suggest actions."
     }}
-    
-    Infer the topics from the questions themselves.
-    If the number of questions, correct, or incorrect answers cannot be reliably determined from the text, use "not determinable".
     Return ONLY valid JSON with no additional text or markdown formatting.
     """
-    
     try:
-        response = model.generate_content(
+        response_text = get_gateway().generate(
             prompt,
-            generation_config={"temperature": 0.2}
+            generation_config=ANALYSIS_GENERATION_CONFIG,
+            validate=lambda text: _parses_as(text, "{", "}", dict)
         )
-        response_text = response.text
-        if response_text.startswith("```json"):
-            response_text = response_text[7:]
-        if response_text.endswith("```"):
-            response_text = response_text[:-3]
-        response_text = response_text.strip()
-
-        json_start = response_text.find("{")
-        json_end = response_text.rfind("}") + 1
-        
-        if json_start != -1 and json_end != -1 and json_end > json_start:
-            json_text = response_text[json_start:json_end]
-            try:
-                analysis_result = json.loads(json_text)
-                
-                if "weak_topics" in analysis_result and isinstance(analysis_result["weak_topics"], list):
-                    st.session_state.weak_topics.update(topic for topic in analysis_result["weak_topics"] if isinstance(topic, str))
-                    
-                return analysis_result
-            except json.JSONDecodeError as je:
-                st.error(f"JSON Decode Error analyzing test results: {str(je)}. Raw response: {response_text}")
-                return None
-        else:
-            st.error(f"Failed to parse analysis data from LLM. Raw response: {response_text}")
+        result = json.loads(_json_span(response_text, "{", "}"))
+        weak_topics = [topic for topic in result.get("weak_topics", []) if isinstance(topic, str)]
+        return {"weak_topics": weak_topics, "summary": result.get("summary") or "No summary provided."}
+    except Exception as e:
+        st.warning(f"Could not generate a written summary, showing computed results only: {str(e)}")
+        weak_topics = [topic for topic, stats in sorted(breakdown.items(), key=lambda item: -item[1]["incorrect"]) if stats["incorrect"]]
+        summary = f"You answered {analysis['correct_answers']} of {analysis['total_questions']} questions correctly ({analysis['accuracy_percentage']}%)."
+        if weak_topics:
+            summary += f" Focus your revision on: {', '.join(weak_topics[:5])}."
+        return {"weak_topics": weak_topics, "summary": summary}
+
+def _map_chunks(chunks: List[str]) -> List[Optional[List[Dict[str, Any]]]]:
+    """
+    Analyze chunks concurrently and return their question_analysis lists in order (None for a failed chunk).
+    Reports failures in the UI; returns None overall if every chunk failed.
+    """
+    futures = [_analysis_executor.submit(_analyze_chunk, chunk, i + 1, len(chunks)) for i, chunk in enumerate(chunks)]
+    results: List[Optional[List[Dict[str, Any]]]] = []
+    failed_parts = []
+    for i, future in enumerate(futures): # Keep the document order of the questions
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(None)
+            failed_parts.append(f"part {i + 1}: {str(e)}")
+
+    if failed_parts:
+        if len(failed_parts) == len(chunks):
+            st.error(f"Error analyzing test results: {'; '.join(failed_parts)}")
             return None
-            
+        st.warning(f"{len(failed_parts)} of {len(chunks)} parts of the test could not be analyzed and were skipped.")
+    return results
+
+def _finish_analysis(question_analysis: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Reduce the merged entries to exact counts and add the summary and weak topics."""
+    if not question_analysis:
+        st.error("Failed to find any questions in the test results.")
+        return None
+
+    analysis = _reduce_question_analysis(question_analysis)
+    analysis_result = {"analysis": analysis, "question_analysis": question_analysis}
+    analysis_result.update(_summarize_analysis(question_analysis, analysis))
+
+    st.session_state.weak_topics.update(canonical_topic(topic) for topic in analysis_result["weak_topics"])
+    return analysis_result
+
+def _tag_parsed_questions(entries: List[Dict[str, Any]], analysis: Dict[str, Any]) -> str:
+    """
+    One batched Gemini call for locally parsed results: tag every untagged entry with a topic, explain the
+    ones answered wrong and write the summary. Entries are updated in place; returns the summary.
+    """
+    untagged = [i for i, entry in enumerate(entries) if "topic" not in entry]
+    question_lines = "\n".join(
+        f"{i}. [{'correct' if entries[i]['is_correct'] else 'wrong'}] {entries[i]['question'][:PDF_TAG_QUESTION_CHARS]}"
+        f" (student: {entries[i]['student_answer']}, key: {entries[i]['correct_answer']})"
+        for i in untagged
+    )
+    prompt = f"""
+    A JEE aspirant's test has been graded: {analysis['correct_answers']} of {analysis['total_questions']} correct ({analysis['accuracy_percentage']}%).
+    
+    For each numbered question below, name its topic (e.g., Kinematics, Thermodynamics, P-block elements).
+    For questions marked [wrong], also give a brief explanation of the concept the student needs to focus on.
+    ---
+    {question_lines or "No new questions to tag."}
+    ---
+    
+    Respond with the following JSON structure:
+    {{
+      "questions": [{{"index": 0, "topic": "Topic", "explanation": "Only for wrong answers, otherwise empty"}}],
+      "summary": "Brief overall analysis of student performance and recommendations. Highlight areas for improvement and suggest actions."
+    }}
+    Return ONLY valid JSON with no additional text or markdown formatting.
+    """
+    try:
+        response_text = get_gateway().generate(
+            prompt,
+            generation_config=ANALYSIS_GENERATION_CONFIG,
+            validate=lambda text: _parses_as(text, "{", "}", dict)
+        )
+        result = json.loads(_json_span(response_text, "{", "}"))
+        for tag in result.get("questions", []):
+            index = tag.get("index") if isinstance(tag, dict) else None
+            if isinstance(index, int) and 0 <= index < len(entries) and "topic" not in entries[index]:
+                entries[index]["topic"] = tag.get("topic") or "Unknown"
+                entries[index]["explanation"] = tag.get("explanation") or ("Answered correctly." if entries[index]["is_correct"] else "")
+        summary = result.get("summary") or ""
     except Exception as e:
-        st.error(f"Error analyzing test results: {str(e)}. Raw response: {response_text}")
+        st.warning(f"Could not tag topics for the parsed questions: {str(e)}")
+        summary = ""
+
+    for entry in entries:
+        entry.setdefault("topic", "Unknown")
+        entry.setdefault("explanation", "Answered correctly." if entry["is_correct"] else "Not available.")
+    return summary or f"You answered {analysis['correct_answers']} of {analysis['total_questions']} questions correctly ({analysis['accuracy_percentage']}%)."
+
+def analyze_parsed_results(entries: List[Dict[str, Any]], previous_entries: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+    """
+    Build the analysis for results the local parser understood: correctness and counts are computed here,
+    and Gemini is only asked once to tag topics and explain wrong answers. Topics and explanations from
+    `previous_entries` (an earlier version of the same test) are reused for unchanged questions.
+    """
+    known = {
+        (entry.get("question"), entry.get("student_answer"), entry.get("correct_answer")): entry
+        for entry in previous_entries or [] if "topic" in entry
+    }
+    for entry in entries:
+        previous = known.get((entry["question"], entry["student_answer"], entry["correct_answer"]))
+        if previous is not None:
+            entry["topic"] = previous["topic"]
+            entry["explanation"] = previous.get("explanation", "")
+
+    analysis = _reduce_question_analysis(entries)
+    summary = _tag_parsed_questions(entries, analysis)
+    breakdown = _topic_breakdown(entries)
+    weak_topics = [topic for topic, stats in sorted(breakdown.items(), key=lambda item: -item[1]["incorrect"])
+                   if stats["incorrect"] and topic != "Unknown"]
+
+    st.session_state.weak_topics.update(canonical_topic(topic) for topic in weak_topics)
+    return {
+        "weak_topics": weak_topics,
+        "analysis": analysis,
+        "question_analysis": entries,
+        "summary": summary,
+        "parsed_locally": True,
+    }
+
+def page_fingerprint(page_text: str) -> str:
+    """Fingerprint of a page's text, insensitive to whitespace differences between PDF exports."""
+    return hashlib.sha1(" ".join(page_text.split()).encode("utf-8")).hexdigest()
+
+def group_pages_into_chunks(pages: List[str], fingerprints: List[str], max_chars: int = PDF_CHUNK_CHARS) -> List[List[int]]:
+    """
+    Group consecutive pages into chunks for analysis. Boundaries are content-defined (a chunk ends after a
+    page whose fingerprint hits a fixed residue) with a size cap, so editing, inserting or removing a page
+    only changes the chunk containing it and the rest of the document keeps the same chunks.
+    """
+    groups: List[List[int]] = []
+    current: List[int] = []
+    current_chars = 0
+    for page_number, (page_text, fingerprint) in enumerate(zip(pages, fingerprints)):
+        if current and current_chars + len(page_text) > max_chars:
+            groups.append(current)
+            current, current_chars = [], 0
+        current.append(page_number)
+        current_chars += len(page_text)
+        if int(fingerprint[:8], 16) % PDF_PAGES_PER_CHUNK_TARGET == 0:
+            groups.append(current)
+            current, current_chars = [], 0
+    if current:
+        groups.append(current)
+    return groups
+
+def analyze_test_pages(pages: List[str], fingerprints: List[str], previous: Optional[Dict[str, Any]] = None):
+    """
+    Analyze the pages of an uploaded test PDF: locally when the layout is one the result parser
+    understands, otherwise with one Gemini map request per chunk of pages and a short summary call.
+    Chunks whose page fingerprints match a chunk of `previous` (the stored analysis of an earlier version of
+    the same test) reuse that chunk's question_analysis; only the changed chunks are sent to Gemini.
+    Returns (analysis result or None, {chunk page fingerprints: question_analysis} for this version).
+    """
+    parsed = parse_test_results("".join(pages))
+    if parsed:
+        return analyze_parsed_results(parsed, previous["result"]["question_analysis"] if previous else None), {}
+
+    previous_chunks = previous["chunks"] if previous else {}
+    groups = [group for group in group_pages_into_chunks(pages, fingerprints) if "".join(pages[i] for i in group).strip()]
+    keys = [tuple(fingerprints[i] for i in group) for group in groups]
+    if not groups:
+        st.error("No content to analyze in the extracted text.")
+        return None, {}
+
+    pending = [idx for idx, key in enumerate(keys) if key not in previous_chunks]
+    chunk_results = {key: previous_chunks[key] for key in keys if key in previous_chunks}
+    if pending:
+        results = _map_chunks(["".join(pages[i] for i in groups[idx]) for idx in pending])
+        if results is None:
+            return None, {}
+        for idx, result in zip(pending, results):
+            if result is not None:
+                chunk_results[keys[idx]] = result
+
+    question_analysis = [entry for key in keys for entry in chunk_results.get(key, [])]
+    analysis_result = _finish_analysis(question_analysis)
+    if analysis_result is not None:
+        analysis_result["reanalyzed_parts"] = len(pending)
+        analysis_result["total_parts"] = len(keys)
+    return analysis_result, chunk_results
+
+def _is_question_page(page_text: str) -> bool:
+    """Whether a page holds questions, as opposed to a cover, instructions or a blank page."""
+    return any(pattern.search(page_text) for pattern in _QUESTION_BOUNDARIES)
+
+def _find_previous_version(pages: List[str], fingerprints: List[str]) -> Optional[Dict[str, Any]]:
+    """
+    The stored analysis this upload is a revision of: same page count, and at least PDF_REVISION_MIN_OVERLAP
+    of its question pages identical. Pages without questions, and pages that several stored tests share
+    (a coaching institute's cover and instruction pages), are boilerplate and do not count; earlier versions
+    of one test are a single test for this. Analyses that a later revision already replaced are skipped, so
+    their numbers are never taken back twice.
+    """
+    candidates = [stored for stored in st.session_state.pdf_analyses.values()
+                  if not stored.get("superseded") and len(stored["fingerprints"]) == len(fingerprints)]
+    page_tests: Dict[str, Set[str]] = {}
+    for stored in st.session_state.pdf_analyses.values():
+        for fingerprint in stored["fingerprints"]:
+            page_tests.setdefault(fingerprint, set()).add(stored["lineage"])
+    page_uses = {fingerprint: len(tests) for fingerprint, tests in page_tests.items()}
+    new_pages = {fingerprint for page, fingerprint in zip(pages, fingerprints)
+                 if _is_question_page(page) and page_uses.get(fingerprint, 0) < 2}
+    if not new_pages:
+        return None
+    best, best_overlap = None, 0
+    for stored in candidates:
+        overlap = len(new_pages & set(stored["fingerprints"]))
+        if overlap > best_overlap:
+            best, best_overlap = stored, overlap
+    if best is not None and best_overlap >= PDF_REVISION_MIN_OVERLAP * len(new_pages):
+        return best
+    return None
+
+def _replace_previous_version(new: Dict[str, Any], previous: Dict[str, Any]):
+    """Record that `new` replaces `previous`: the earlier one is superseded and both are the same test from now on."""
+    previous["superseded"] = True
+    new["lineage"] = previous["lineage"]
+
+_PLACEHOLDER_QUESTION = re.compile(r"(?i)^\s*(?:q|que|ques|question)?\s*\.?\s*(?:no\.?\s*)?\d*\s*$")
+
+def review_question(entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    A two-option quiz question (the key vs. the student's answer) built from a wrongly answered test
+    question, for the review schedule; None if the entry lacks what is needed: the question's own text
+    (score-table rows only have "Question 12") and an answer the student actually gave.
+    """
+    question = str(entry.get("question") or "")
+    correct_answer = str(entry.get("correct_answer") or "").strip()
+    student_answer = str(entry.get("student_answer") or "").strip()
+    if _PLACEHOLDER_QUESTION.match(question) or not correct_answer or is_unattempted(student_answer):
         return None
+    if correct_answer == student_answer:
+        return None
+    answers = sorted([correct_answer, student_answer]) # Stable order, so the question keeps its id across uploads
+    return {
+        "question": question,
+        "answers": answers,
+        "correctAnswer": answers.index(correct_answer),
+        "explanation": {"detailed_steps": entry.get("explanation") or "No explanation available."},
+    }
+
+def _apply_analysis_to_stats(analysis_result: Dict[str, Any], sign: int = 1):
+    """Add (sign=1) or take back (sign=-1) an analysis' contribution to the gamification counters."""
+    # Counts are computed locally, so always integers
+    st.session_state.total_questions_solved += sign * analysis_result["analysis"]["total_questions"]
+    st.session_state.total_correct_answers += sign * analysis_result["analysis"]["correct_answers"]
+    
+    # Update topic-specific performance from PDF analysis
+    topic_counts = {}
+    attempt_topics, attempt_correct = [], []
+    question_analysis_list = analysis_result.get("question_analysis", [])
+    for q_analysis in question_analysis_list:
+        topic = q_analysis.get("topic")
+        is_correct = q_analysis.get("is_correct")
+
+        if topic and isinstance(topic, str): 
+            topic = canonical_topic(topic)
+            if topic not in st.session_state.topic_performance:
+                st.session_state.topic_performance[topic] = {"total_solved": 0, "correct_solved": 0}
+            counts = topic_counts.setdefault(topic, {"total_solved": 0, "correct_solved": 0})
+            attempt_topics.append(topic)
+            attempt_correct.append(bool(is_correct))
+            if sign > 0 and not is_correct:
+                question = review_question(q_analysis)
+                if question is not None:
+                    st.session_state.review_scheduler.add(question, topic)
+            
+            st.session_state.topic_performance[topic]["total_solved"] += sign
+            counts["total_solved"] += sign
+            if is_correct:
+                st.session_state.topic_performance[topic]["correct_solved"] += sign
+                counts["correct_solved"] += sign
+
+    record_progress(sign * analysis_result["analysis"]["total_questions"],
+                    sign * analysis_result["analysis"]["correct_answers"], topic_counts)
+    # Taking an analysis back reuses its original time, so windowed and decayed analytics cancel out exactly
+    recorded_at = analysis_result.setdefault("recorded_at", time.time())
+    record_attempts(attempt_topics, attempt_correct, "", "pdf", recorded_at, weight=sign)
+
+    if sign > 0 and analysis_result.get("weak_topics"):
+        st.session_state.topics_covered.update(canonical_topic(topic) for topic in analysis_result["weak_topics"])
 
 def display_pdf_analyzer():
     """Display the PDF test results analyzer interface."""
@@ -105,44 +440,77 @@ def display_pdf_analyzer():
     
     if uploaded_file:
         if st.button("Analyze Test Results", key="analyze_pdf_button"):
+            if st.session_state.pdf_revision_pending is not None:
+                # Moving on without answering: count the unanswered upload as a separate test, never take anything back
+                _apply_analysis_to_stats(st.session_state.pdf_revision_pending["new"]["result"])
+                st.session_state.pdf_revision_pending = None
+            data = uploaded_file.getvalue()
+            doc_hash = document_hash(data)
+            stored = st.session_state.pdf_analyses.get(doc_hash)
+            if stored is not None:
+                # Identical upload: show the stored analysis without re-reading or re-counting anything
+                st.session_state.pdf_analysis_result = stored["result"]
+                st.success("This test was already analyzed. Showing the stored analysis.")
+                st.rerun()
+
             with st.spinner("Extracting text and analyzing test results... This may take some time."):
-                extracted_text = extract_text_from_pdf(uploaded_file)
-                if not extracted_text:
+                try:
+                    pages = extract_pages(data, doc_hash)
+                except Exception as e:
+                    st.error(f"Error extracting text from PDF: {str(e)}")
+                    pages = []
+                if not "".join(pages).strip():
                     st.error("Could not extract text from the PDF. Please ensure it's a text-based PDF and not an image.")
                 else:
-                    analysis_result = analyze_test_results(extracted_text)
+                    fingerprints = [page_fingerprint(page) for page in pages]
+                    previous = _find_previous_version(pages, fingerprints)
+                    analysis_result, chunk_results = analyze_test_pages(pages, fingerprints, previous)
                     if analysis_result:
                         st.session_state.pdf_analysis_result = analysis_result
-                        
-                        # Update gamification data from PDF analysis
-                        if analysis_result.get("analysis", {}).get("total_questions") != "not determinable":
-                            st.session_state.total_questions_solved += analysis_result["analysis"]["total_questions"]
-                        if analysis_result.get("analysis", {}).get("correct_answers") != "not determinable":
-                            st.session_state.total_correct_answers += analysis_result["analysis"]["correct_answers"]
-                        
-                        # Update topic-specific performance from PDF analysis
-                        question_analysis_list = analysis_result.get("question_analysis", [])
-                        for q_analysis in question_analysis_list:
-                            topic = q_analysis.get("topic")
-                            is_correct = q_analysis.get("is_correct")
-
-                            if topic and isinstance(topic, str): 
-                                if topic not in st.session_state.topic_performance:
-                                    st.session_state.topic_performance[topic] = {"total_solved": 0, "correct_solved": 0}
-                                
-                                st.session_state.topic_performance[topic]["total_solved"] += 1
-                                if is_correct:
-                                    st.session_state.topic_performance[topic]["correct_solved"] += 1
-
-                        if analysis_result.get("weak_topics"):
-                            st.session_state.topics_covered.update(analysis_result["weak_topics"])
-
-
-                        st.success("Analysis completed successfully!")
+                        st.session_state.pdf_analyses[doc_hash] = {
+                            "fingerprints": fingerprints,
+                            "chunks": chunk_results,
+                            "result": analysis_result,
+                            "lineage": doc_hash, # Hash of the test's first version; revisions that replace it share it
+                        }
+
+                        if previous is not None:
+                            # Whether this replaces the earlier version's numbers is the student's call
+                            st.session_state.pdf_revision_pending = {"new": st.session_state.pdf_analyses[doc_hash], "previous": previous}
+                        else:
+                            _apply_analysis_to_stats(analysis_result)
+                            flush_profile()
+
+                        if analysis_result.get("parsed_locally"):
+                            st.success("Scored locally from the answer key in your PDF.")
+                        elif previous is not None:
+                            st.success(f"Looks like a revised test: re-analyzed {analysis_result['reanalyzed_parts']} of {analysis_result['total_parts']} parts and merged the rest.")
+                        else:
+                            st.success("Analysis completed successfully!")
                         st.rerun() 
                     else:
                         st.error("Failed to analyze the test results. The content might not be in the expected format, or an API error occurred.")
     
+    pending = st.session_state.pdf_revision_pending
+    if pending is not None:
+        st.info("This upload looks like a revised version of a test you analyzed before. "
+                "Should it replace that test's numbers in your progress, or count as a separate test?")
+        col_replace, col_separate = st.columns(2)
+        with col_replace:
+            if st.button("Replace the earlier version", key="pdf_revision_replace"):
+                _apply_analysis_to_stats(pending["previous"]["result"], sign=-1)
+                _replace_previous_version(pending["new"], pending["previous"])
+                _apply_analysis_to_stats(pending["new"]["result"])
+                flush_profile()
+                st.session_state.pdf_revision_pending = None
+                st.rerun()
+        with col_separate:
+            if st.button("Count as a separate test", key="pdf_revision_separate"):
+                _apply_analysis_to_stats(pending["new"]["result"])
+                flush_profile()
+                st.session_state.pdf_revision_pending = None
+                st.rerun()
+
     if st.session_state.pdf_analysis_result:
         result = st.session_state.pdf_analysis_result
         
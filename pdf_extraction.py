@@ -0,0 +1,113 @@
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import concurrent.futures
+from collections import OrderedDict
+from typing import Iterator, List, Optional, Tuple
+
+import fitz # PyMuPDF
+
+PDF_PARALLEL_MIN_PAGES = 48 # Documents with at least this many pages are split across worker processes
+PDF_PAGES_PER_TASK = 24 # Pages extracted by one worker task
+PDF_EXTRACTION_PROCESSES = max(1, min(4, (os.cpu_count() or 1) - 1))
+PDF_PAGE_CACHE_DOCUMENTS = 16 # Documents whose per-page text is kept in memory
+
+_page_cache: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+_page_cache_lock = threading.Lock()
+_process_pool: Optional[concurrent.futures.ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def document_hash(data: bytes) -> str:
+    """Content hash identifying a PDF regardless of its file name."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _cached_pages(doc_hash: str) -> Optional[Tuple[str, ...]]:
+    with _page_cache_lock:
+        pages = _page_cache.get(doc_hash)
+        if pages is not None:
+            _page_cache.move_to_end(doc_hash)
+        return pages
+
+
+def _store_pages(doc_hash: str, pages: Tuple[str, ...]):
+    with _page_cache_lock:
+        _page_cache[doc_hash] = pages
+        _page_cache.move_to_end(doc_hash)
+        while len(_page_cache) > PDF_PAGE_CACHE_DOCUMENTS:
+            _page_cache.popitem(last=False)
+
+
+def _get_process_pool() -> concurrent.futures.ProcessPoolExecutor:
+    """Process pool for large documents, started on first use. Uses spawn since the app itself is threaded."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = concurrent.futures.ProcessPoolExecutor(
+                max_workers=PDF_EXTRACTION_PROCESSES, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def _extract_page_range(path: str, start: int, stop: int) -> List[str]:
+    """Worker task: extract the text of pages [start, stop) of the PDF at `path`."""
+    with fitz.open(path) as doc:
+        return [doc[page_number].get_text() for page_number in range(start, stop)]
+
+
+def _iter_pages_parallel(data: bytes, page_count: int) -> Iterator[str]:
+    """Spread page ranges over the process pool and yield the pages back in order."""
+    # Workers read the document from a temporary file instead of each receiving a pickled copy of it
+    with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+        tmp.write(data)
+        path = tmp.name
+    try:
+        pool = _get_process_pool()
+        futures = [
+            pool.submit(_extract_page_range, path, start, min(start + PDF_PAGES_PER_TASK, page_count))
+            for start in range(0, page_count, PDF_PAGES_PER_TASK)
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+    finally:
+        os.unlink(path)
+
+
+def iter_page_texts(data: bytes, doc_hash: Optional[str] = None) -> Iterator[str]:
+    """
+    Yield the text of each page of a PDF in order.
+
+    Small documents are read page by page in this process; large ones are split into page ranges
+    across a process pool. The per-page text is cached by document content hash once fully read,
+    so re-processing the same upload never parses the PDF again.
+    """
+    doc_hash = doc_hash or document_hash(data)
+    cached = _cached_pages(doc_hash)
+    if cached is not None:
+        yield from cached
+        return
+
+    pages = []
+    with fitz.open(stream=data, filetype="pdf") as doc:
+        page_count = doc.page_count
+        if page_count < PDF_PARALLEL_MIN_PAGES:
+            for page in doc:
+                pages.append(page.get_text())
+                yield pages[-1]
+    if page_count >= PDF_PARALLEL_MIN_PAGES:
+        for page_text in _iter_pages_parallel(data, page_count):
+            pages.append(page_text)
+            yield page_text
+    _store_pages(doc_hash, tuple(pages))
+
+
+def extract_pages(data: bytes, doc_hash: Optional[str] = None) -> List[str]:
+    """Text of every page of a PDF, served from the page cache when available."""
+    return list(iter_page_texts(data, doc_hash))
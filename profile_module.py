@@ -1,5 +1,33 @@
 import streamlit as st
 from datetime import datetime, timedelta
+from typing import Callable, List, Tuple
+from topic_taxonomy import topic_name
+from profile_render import topic_tags_html, streak_chart_svg
+from attempt_analytics import topic_analytics, ANALYTICS_WINDOW_DAYS
+from profile_store import session_attempt_log, start_profile
+
+BOOKMARKS_PER_PAGE = 10 # Saved questions shown per profile page
+STREAK_CHART_DAYS = 365 # Days shown in the streak chart
+
+def _memoized_html(part: str, build: Callable[[], str], *extra_key) -> str:
+    """
+    Rendered HTML for a profile part ("topics" or "streak"), rebuilt only when the part's version in
+    st.session_state.profile_versions (or an extra key such as today's date) has changed.
+    """
+    key = (st.session_state.profile_versions[part],) + extra_key
+    cache = st.session_state.profile_render_cache
+    cached = cache.get(part)
+    if cached is None or cached[0] != key:
+        cached = cache[part] = (key, build())
+    return cached[1]
+
+def _topic_tags() -> List[Tuple[str, int, int]]:
+    """(display name, total solved, correct solved) per covered topic, sorted by name."""
+    tags = []
+    for topic in st.session_state.topics_covered:
+        performance = st.session_state.topic_performance.get(topic, {"total_solved": 0, "correct_solved": 0})
+        tags.append((topic_name(topic), performance["total_solved"], performance["correct_solved"]))
+    return sorted(tags)
 
 def display_profile():
     """Display the user profile with gamification stats."""
@@ -13,8 +41,8 @@ def display_profile():
         with st.form("name_form"):
             user_input_name = st.text_input("What's your name?", key="name_input")
             if st.form_submit_button("Set Name"):
-                if user_input_name:
-                    st.session_state.user_name = user_input_name
+                if user_input_name.strip():
+                    start_profile(user_input_name.strip())
                     st.success(f"Name set to {user_input_name}!")
                     st.rerun()
                 else:
@@ -33,72 +61,43 @@ def display_profile():
     with col2:
         st.metric("Accuracy", f"{accuracy:.2f}%")
     with col3:
-        st.metric("Current Streak", f"{st.session_state.current_streak} days 🔥")
+        st.metric("Current Streak", f"{st.session_state.activity_calendar.current_streak(datetime.now().date())} days 🔥")
 
     st.markdown("---")
     st.markdown("### 📚 Topics Covered and Performance")
     if st.session_state.topics_covered:
-        # Get a sorted list of topics to display consistently
-        topics_list = sorted(list(st.session_state.topics_covered))
-        
-        # Start a container for the tags to allow for horizontal wrapping
-        st.markdown('<div style="display: flex; flex-wrap: wrap; gap: 10px; margin-bottom: 20px;">', unsafe_allow_html=True)
-        
-        for topic in topics_list:
-            performance = st.session_state.topic_performance.get(topic, {"total_solved": 0, "correct_solved": 0})
-            total = performance["total_solved"]
-            correct = performance["correct_solved"]
-            
-            percentage = (correct / total * 100) if total > 0 else 0
-
-            color = "var(--text-color)" # Default for no questions solved, adapting to theme
-            if total > 0:
-                if percentage >= 75: # Green for great accuracy
-                    color = "green"
-                elif percentage >= 50: # Orange for medium accuracy (better visibility)
-                    color = "orange" 
-                else: # Red for bad accuracy
-                    color = "red"
-            
-            # HTML for the compact tag
-            tag_html = f"""
-            <div style="
-                background-color: var(--secondary-background-color); /* Matches Streamlit's secondary background */
-                border-radius: 20px; /* Rounded corners like a button/tag */
-                padding: 8px 15px; /* Padding inside the tag */
-                display: flex;
-                align-items: center; /* Vertically center content */
-                font-size: 0.9em;
-                color: var(--text-color);
-                box-shadow: 1px 1px 3px rgba(0,0,0,0.2); /* Subtle shadow */
-                min-width: 120px; /* Ensure a minimum width */
-                justify-content: center; /* Center content horizontally if min-width is larger */
-                margin-right: 10px; /* Spacing between tags */
-                margin-bottom: 10px; /* Spacing for wrapping */
-            ">
-                <div style="
-                    width: 12px; 
-                    height: 12px; 
-                    border-radius: 50%; 
-                    background-color: {color}; 
-                    display: inline-block; 
-                    vertical-align: middle;
-                    margin-right: 8px; /* Space between circle and text */
-                "></div>
-                <strong>{topic}</strong>: {percentage:.1f}%
-            </div>
-            """
-            st.markdown(tag_html, unsafe_allow_html=True)
-        st.markdown('</div>', unsafe_allow_html=True) # Close the container div
-
+        # One HTML element for the whole cloud, rebuilt only when topic stats change
+        tags_html = _memoized_html("topics", lambda: topic_tags_html(_topic_tags()))
+        st.markdown(tags_html, unsafe_allow_html=True)
     else:
         st.write("Start solving quizzes or analyzing tests to see topics you've covered!")
 
+    analytics = topic_analytics(session_attempt_log(), rollup=False)
+    if analytics:
+        st.markdown("### ⏱️ Recent Performance")
+        rows = [
+            {
+                "Topic": topic_name(topic),
+                "Attempts": stats["attempts"],
+                "Accuracy %": round(stats["accuracy"] * 100, 1),
+                f"Last {ANALYTICS_WINDOW_DAYS} days %": None if stats["recent_attempts"] <= 0 else round(stats["recent_accuracy"] * 100, 1),
+                "Trend (pts)": None if stats["trend"] != stats["trend"] else round(stats["trend"] * 100, 1), # NaN: no data to compare
+                "Weakness": round(stats["weakness"], 2),
+            }
+            for topic, stats in sorted(analytics.items(), key=lambda item: -item[1]["weakness"])
+        ]
+        st.dataframe(rows, hide_index=True, use_container_width=True)
+
     st.markdown("---")
     st.markdown("### 🔖 Saved Questions")
-    if st.session_state.bookmarked_questions:
-        for idx, question in enumerate(st.session_state.bookmarked_questions):
-            with st.expander(f"Bookmarked Question {idx+1} - {question.get('quiz_topic', 'General')}"):
+    bookmarks = st.session_state.bookmarked_questions
+    if bookmarks:
+        page_count = bookmarks.page_count(BOOKMARKS_PER_PAGE)
+        page = min(st.session_state.bookmark_page, page_count - 1)
+        for offset, entry in enumerate(bookmarks.page(page, BOOKMARKS_PER_PAGE)):
+            idx = page * BOOKMARKS_PER_PAGE + offset
+            question = entry["question"]
+            with st.expander(f"Bookmarked Question {idx+1} - {entry.get('quiz_topic') or 'General'}"):
                 st.markdown(f"**Question:** {question['question']}")
                 
                 # Show answer options if available
@@ -118,89 +117,37 @@ def display_profile():
                     st.markdown(explanation)
                 
                 # Remove bookmark button
-                if st.button(f"Remove Bookmark {idx+1}", key=f"remove_bm_{idx}"):
-                    st.session_state.bookmarked_questions.remove(question)
+                if st.button(f"Remove Bookmark {idx+1}", key=f"remove_bm_{entry['id']}"):
+                    bookmarks.remove(entry["id"])
+                    st.rerun()
+
+        if page_count > 1:
+            col_prev, col_page, col_next = st.columns([1, 2, 1])
+            with col_prev:
+                if st.button("⬅️ Previous", key="bookmark_prev", disabled=page == 0):
+                    st.session_state.bookmark_page = page - 1
+                    st.rerun()
+            with col_page:
+                st.write(f"Page {page + 1} of {page_count} ({len(bookmarks)} saved questions)")
+            with col_next:
+                if st.button("Next ➡️", key="bookmark_next", disabled=page >= page_count - 1):
+                    st.session_state.bookmark_page = page + 1
                     st.rerun()
     else:
         st.write("No questions bookmarked yet. Click the 📖 icon in quizzes to save questions here.")
 
     st.markdown("---")
     st.markdown("### 🔥 Quiz Streak Chart")
-    st.write("🟢: Quiz completed | ⚪: No quiz")
-    
-    # Generate data for the streak chart (similar to GitHub's contribution graph)
-    today = datetime.now().date()
-    
-    # Get dates for the last 365 days (a year's worth, similar to GitHub)
-    num_days = 90 # Or 90 for a quarter, etc.
-    dates_to_display = []
-    for i in range(num_days):
-        dates_to_display.append(today - timedelta(days=num_days - 1 - i))
-
-    # Determine the number of columns (weeks) for the chart
-    # A standard GitHub chart has 7 rows (days of the week)
-    
-    # We need to arrange `num_days` into a grid.
-    # Start with the day of the week for the first date to align columns.
-    first_date_in_chart = dates_to_display[0]
-    first_day_of_week = first_date_in_chart.weekday() # Monday is 0, Sunday is 6
-
-    # Prepare the grid. 7 rows for days of the week.
-    # Fill in leading empty cells if the first day isn't a Monday in the chart's first column.
-    chart_grid = [[] for _ in range(7)] # 7 lists for 7 days of the week (rows)
-
-    # Add placeholders for days before the first day of the week for the first date
-    for i in range(7):
-        if i < first_day_of_week:
-            chart_grid[i].append(" ") # Empty cell for alignment
-        else:
-            break # Stop filling placeholders once we hit the starting day
-
-    for date in dates_to_display:
-        day_of_week = date.weekday() # 0=Monday, 6=Sunday
-        date_str = date.isoformat()
-        
-        symbol = "🟢" if st.session_state.streak_history.get(date_str, False) else "⚪"
-        chart_grid[day_of_week].append(symbol)
-
-    # Pad the last week's rows if they don't end on a Sunday
-    max_len = max(len(row) for row in chart_grid)
-    for i in range(7):
-        while len(chart_grid[i]) < max_len:
-            chart_grid[i].append(" ") # Pad with spaces
-
-    # Render the chart using columns for weeks
-    st.markdown("---")
+    st.write("🟩: Quiz completed | ⬜: No quiz")
     st.markdown("#### Contributions in last year")
-    
-    # Create a single row for the weekday labels
-    weekday_labels = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-    
-    # Calculate number of weeks (columns)
-    num_weeks = max_len
-    
-    # Create columns to simulate the GitHub graph
-    # Add an extra column at the beginning for weekday labels
-    cols = st.columns([0.5] + [1] * num_weeks) 
-    
-    with cols[0]: # First column for weekday labels
-        st.markdown("<br>", unsafe_allow_html=True) # Spacer
-        for label in weekday_labels:
-            st.markdown(f"<div style='height: 40px; display: flex; align-items: center;'>{label}</div>", unsafe_allow_html=True)
 
-
-    for week_idx in range(num_weeks):
-        with cols[week_idx + 1]: # Shift by 1 because the first column is for labels
-            # Optional: Add month label for first day of month in this column
-            # This is complex to do accurately for all weeks and months
-            # For simplicity, we'll omit explicit month labels for now.
-            st.write(" ") # Placeholder for alignment or month
-
-            for day_idx in range(7):
-                if week_idx < len(chart_grid[day_idx]): # Ensure index is valid
-                    st.markdown(f"<div style='font-size: 1.5em; text-align: center; margin: 0px;'>{chart_grid[day_idx][week_idx]}</div>", unsafe_allow_html=True)
-                else:
-                    st.markdown(f"<div style='font-size: 1.5em; text-align: center; margin: 0px;'> </div>", unsafe_allow_html=True)
+    today = datetime.now().date()
+    first_day = today - timedelta(days=STREAK_CHART_DAYS - 1)
+    chart_svg = _memoized_html("streak", lambda: streak_chart_svg(
+        st.session_state.activity_calendar.days(first_day, today), today
+    ), today)
+    st.markdown(chart_svg, unsafe_allow_html=True)
 
     st.markdown("---")
-    st.write(f"Your longest streak: **{st.session_state.current_streak} days** (Note: this is the *current* streak, not the historical longest)")
\ No newline at end of file
+    calendar = st.session_state.activity_calendar
+    st.write(f"Your longest streak: **{calendar.longest_streak()} days** ({calendar.count(first_day, today)} quiz days in the last year)")
\ No newline at end of file
@@ -0,0 +1,85 @@
+from datetime import date, timedelta
+from html import escape
+from typing import List, Sequence, Tuple
+
+# Tag styling is declared once per tag cloud instead of inline on every tag
+_TAG_CLOUD_STYLE = """<style>
+.topic-tags { display: flex; flex-wrap: wrap; gap: 10px; margin-bottom: 20px; }
+.topic-tag {
+    background-color: var(--secondary-background-color); border-radius: 20px; padding: 8px 15px;
+    display: flex; align-items: center; justify-content: center; min-width: 120px;
+    font-size: 0.9em; color: var(--text-color); box-shadow: 1px 1px 3px rgba(0,0,0,0.2);
+}
+.topic-tag-dot { width: 12px; height: 12px; border-radius: 50%; margin-right: 8px; }
+</style>"""
+
+STREAK_CELL_SIZE = 12 # Pixels per day square in the streak chart
+STREAK_CELL_GAP = 3
+STREAK_LABEL_WIDTH = 30 # Room for the weekday labels on the left
+STREAK_HEADER_HEIGHT = 16 # Room for the month labels on top
+STREAK_ACTIVE_COLOR = "#2ea043"
+STREAK_INACTIVE_COLOR = "#8b949e33"
+
+
+def accuracy_color(total: int, correct: int) -> str:
+    """Dot colour for a topic: theme text colour if unattempted, else green/orange/red by accuracy."""
+    if total <= 0:
+        return "var(--text-color)"
+    percentage = correct / total * 100
+    if percentage >= 75:
+        return "green"
+    if percentage >= 50:
+        return "orange"
+    return "red"
+
+
+def topic_tags_html(tags: List[Tuple[str, int, int]]) -> str:
+    """
+    The whole topic tag cloud as one HTML string, from (display name, total solved, correct solved)
+    tuples in display order.
+    """
+    parts = [_TAG_CLOUD_STYLE, '<div class="topic-tags">']
+    for name, total, correct in tags:
+        percentage = (correct / total * 100) if total > 0 else 0
+        parts.append(
+            f'<div class="topic-tag"><span class="topic-tag-dot" style="background-color: {accuracy_color(total, correct)};"></span>'
+            f'<strong>{escape(name)}</strong>: {percentage:.1f}%</div>'
+        )
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def streak_chart_svg(activity: Sequence[bool], end: date) -> str:
+    """
+    A GitHub-style contribution chart as one SVG: a column per week (Monday at the top) and a square per
+    day of the `len(activity)` days ending at `end`, filled where `activity` is true.
+    """
+    num_days = len(activity)
+    start = end - timedelta(days=num_days - 1)
+    first_monday = start - timedelta(days=start.weekday())
+    num_weeks = (end - first_monday).days // 7 + 1
+    step = STREAK_CELL_SIZE + STREAK_CELL_GAP
+    width = STREAK_LABEL_WIDTH + num_weeks * step
+    height = STREAK_HEADER_HEIGHT + 7 * step
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+             f'style="font-size: 10px; fill: currentColor; max-width: 100%;">']
+    for row, label in ((0, "Mon"), (2, "Wed"), (4, "Fri")):
+        parts.append(f'<text x="0" y="{STREAK_HEADER_HEIGHT + row * step + STREAK_CELL_SIZE - 2}">{label}</text>')
+
+    day = start
+    for offset in range(num_days):
+        week = (day - first_monday).days // 7
+        x = STREAK_LABEL_WIDTH + week * step
+        if day.day == 1 or (offset == 0 and day.day <= 21): # Skip a label for a month that is about to end
+            parts.append(f'<text x="{x}" y="{STREAK_HEADER_HEIGHT - 4}">{day.strftime("%b")}</text>')
+        iso_day = day.isoformat()
+        active = activity[offset]
+        parts.append(
+            f'<rect x="{x}" y="{STREAK_HEADER_HEIGHT + day.weekday() * step}" width="{STREAK_CELL_SIZE}" height="{STREAK_CELL_SIZE}" '
+            f'rx="2" fill="{STREAK_ACTIVE_COLOR if active else STREAK_INACTIVE_COLOR}">'
+            f'<title>{iso_day}: {"quiz completed" if active else "no quiz"}</title></rect>'
+        )
+        day += timedelta(days=1)
+    parts.append("</svg>")
+    return "".join(parts)
@@ -0,0 +1,375 @@
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any, Dict, Optional, Sequence
+
+import streamlit as st
+
+from config import PROFILE_DB_PATH, PROFILE_FLUSH_INTERVAL_SECONDS
+from topic_taxonomy import canonical_topic
+from activity_calendar import ActivityCalendar
+from bookmarks import BookmarkStore
+from review_scheduler import ReviewScheduler
+
+if TYPE_CHECKING: # attempt_log needs NumPy, so it is imported where attempts are first touched
+    from attempt_log import AttemptLog
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS profile_counters (
+    user_key TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value INTEGER NOT NULL,
+    PRIMARY KEY (user_key, name)
+);
+CREATE TABLE IF NOT EXISTS profile_state (
+    user_key TEXT PRIMARY KEY,
+    data TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempt_chunks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_key TEXT NOT NULL,
+    topics TEXT NOT NULL,
+    data BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempt_chunks_user ON attempt_chunks (user_key, seq);
+"""
+
+# Counter names: the two totals plus "topic_total:<topic>" / "topic_correct:<topic>" per topic
+TOPIC_TOTAL_PREFIX = "topic_total:"
+TOPIC_CORRECT_PREFIX = "topic_correct:"
+PROFILE_QUERY_PARAM = "profile" # URL query parameter holding the profile id, so a reload or saved link finds the profile again
+
+
+class SQLiteProfileBackend:
+    """
+    Profile storage in SQLite. Counters are stored as rows that flushes add to, so concurrent sessions
+    of the same user never overwrite each other's progress, and attempt events are appended as one
+    columnar chunk per flush; everything else is one JSON document per user.
+    Another backend only has to provide load, load_attempts, write and delete.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def load(self, user_key: str) -> Dict[str, Any]:
+        """Return {"counters": {...}, "state": {...} or None} for a user."""
+        conn = self._connection()
+        counters = dict(conn.execute("SELECT name, value FROM profile_counters WHERE user_key = ?", (user_key,)).fetchall())
+        row = conn.execute("SELECT data FROM profile_state WHERE user_key = ?", (user_key,)).fetchone()
+        return {"counters": counters, "state": json.loads(row[0]) if row else None}
+
+    def load_attempts(self, user_key: str) -> "AttemptLog":
+        from attempt_log import AttemptLog
+        chunks = self._connection().execute(
+            "SELECT topics, data FROM attempt_chunks WHERE user_key = ? ORDER BY seq", (user_key,)
+        ).fetchall()
+        return AttemptLog.from_chunks(chunks)
+
+    def write(self, counter_deltas: Dict[str, Dict[str, int]], states: Dict[str, Dict[str, Any]],
+              attempts: Dict[str, "AttemptLog"]):
+        """Apply buffered counter deltas, replace state documents and append attempt chunks, all in one transaction."""
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(
+                """INSERT INTO profile_counters (user_key, name, value) VALUES (?, ?, ?)
+                   ON CONFLICT (user_key, name) DO UPDATE SET value = value + excluded.value""",
+                [(user_key, name, delta) for user_key, deltas in counter_deltas.items() for name, delta in deltas.items()]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO profile_state (user_key, data, updated_at) VALUES (?, ?, ?)",
+                [(user_key, json.dumps(state, ensure_ascii=False), now) for user_key, state in states.items()]
+            )
+            conn.executemany(
+                "INSERT INTO attempt_chunks (user_key, topics, data) VALUES (?, ?, ?)",
+                [(user_key, *log.to_chunk()) for user_key, log in attempts.items()]
+            )
+
+    def delete(self, user_key: str):
+        conn = self._connection()
+        with conn:
+            conn.execute("DELETE FROM profile_counters WHERE user_key = ?", (user_key,))
+            conn.execute("DELETE FROM profile_state WHERE user_key = ?", (user_key,))
+            conn.execute("DELETE FROM attempt_chunks WHERE user_key = ?", (user_key,))
+
+
+class ProfileStore:
+    """
+    Write-behind front of a profile backend.
+
+    Counter updates and state snapshots are only recorded in memory, so answering a question never
+    waits on disk. A background thread flushes them in one batch every PROFILE_FLUSH_INTERVAL_SECONDS,
+    and callers flush explicitly at natural checkpoints such as the end of a quiz. Loads include
+    whatever is still buffered, so a profile read back before the next flush is up to date.
+    """
+
+    def __init__(self, backend, flush_interval: float):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._counter_deltas: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._states: Dict[str, Dict[str, Any]] = {}
+        self._attempts: Dict[str, "AttemptLog"] = {}
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="profile-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
+
+    def load(self, user_key: str) -> Dict[str, Any]:
+        profile = self.backend.load(user_key)
+        with self._lock:
+            for name, delta in self._counter_deltas.get(user_key, {}).items():
+                profile["counters"][name] = profile["counters"].get(name, 0) + delta
+            if user_key in self._states:
+                profile["state"] = self._states[user_key]
+        return profile
+
+    def load_attempts(self, user_key: str) -> "AttemptLog":
+        """A user's stored attempt log, including attempts still buffered."""
+        attempts = self.backend.load_attempts(user_key)
+        with self._lock:
+            if user_key in self._attempts:
+                attempts.merge(self._attempts[user_key])
+        return attempts
+
+    def add_counters(self, user_key: str, deltas: Dict[str, int]):
+        with self._lock:
+            buffered = self._counter_deltas[user_key]
+            for name, delta in deltas.items():
+                buffered[name] += delta
+
+    def add_attempts(self, user_key: str, attempts: "AttemptLog"):
+        """Buffer attempt events for a user; each flush appends them as one chunk."""
+        from attempt_log import AttemptLog
+        with self._lock:
+            self._attempts.setdefault(user_key, AttemptLog()).merge(attempts)
+
+    def save_state(self, user_key: str, state: Dict[str, Any]):
+        """Buffer the latest state document for a user; only the newest one is written."""
+        with self._lock:
+            self._states[user_key] = state
+
+    def flush(self):
+        with self._flush_lock:
+            with self._lock:
+                counter_deltas = {user_key: dict(deltas) for user_key, deltas in self._counter_deltas.items() if deltas}
+                states = self._states
+                attempts = self._attempts
+                self._counter_deltas = defaultdict(lambda: defaultdict(int))
+                self._states = {}
+                self._attempts = {}
+            if not counter_deltas and not states and not attempts:
+                return
+            try:
+                self.backend.write(counter_deltas, states, attempts)
+            except Exception:
+                # Put the batch back so the next flush retries it; newer state snapshots win
+                with self._lock:
+                    for user_key, deltas in counter_deltas.items():
+                        for name, delta in deltas.items():
+                            self._counter_deltas[user_key][name] += delta
+                    for user_key, state in states.items():
+                        self._states.setdefault(user_key, state)
+                    for user_key, log in attempts.items(): # Older events go first
+                        if user_key in self._attempts:
+                            log.merge(self._attempts[user_key])
+                        self._attempts[user_key] = log
+                raise
+
+    def delete(self, user_key: str):
+        with self._lock:
+            self._counter_deltas.pop(user_key, None)
+            self._states.pop(user_key, None)
+            self._attempts.pop(user_key, None)
+        self.backend.delete(user_key)
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                pass # Kept in the buffer and retried on the next tick
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """Return the process-wide profile store, creating it on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProfileStore(SQLiteProfileBackend(PROFILE_DB_PATH), PROFILE_FLUSH_INTERVAL_SECONDS)
+        return _store
+
+
+# --- Session glue -----------------------------------------------------------
+
+def _user_key() -> Optional[str]:
+    return st.session_state.get("profile_id") or None
+
+
+def start_profile(name: str):
+    """
+    Start a profile for a new user under a generated id, remembered in the page URL. The name is only
+    for display, so two students who type the same name never share (or clear) each other's progress.
+    """
+    profile_id = uuid.uuid4().hex
+    st.session_state.user_name = name
+    st.session_state.profile_id = profile_id
+    st.query_params[PROFILE_QUERY_PARAM] = profile_id
+
+
+def resume_profile() -> bool:
+    """Pick up the profile whose id is in the page URL. Returns False if there is none to resume."""
+    profile_id = st.query_params.get(PROFILE_QUERY_PARAM)
+    if not profile_id:
+        return False
+    state = get_profile_store().load(profile_id)["state"]
+    if not state or not state.get("user_name"):
+        return False
+    st.session_state.user_name = state["user_name"]
+    st.session_state.profile_id = profile_id
+    return True
+
+
+def delete_profile():
+    """Delete the current user's stored profile and forget its id; other users' profiles are untouched."""
+    user_key = _user_key()
+    if user_key is not None:
+        get_profile_store().delete(user_key)
+    st.query_params.pop(PROFILE_QUERY_PARAM, None)
+
+
+def ensure_profile_loaded():
+    """Load the stored profile of the current user into session state, once per session and user."""
+    user_key = _user_key()
+    if user_key is None or st.session_state.get("profile_user") == user_key:
+        return
+    profile = get_profile_store().load(user_key)
+    counters, state = profile["counters"], profile["state"] or {}
+
+    st.session_state.total_questions_solved = counters.get("total_questions_solved", 0)
+    st.session_state.total_correct_answers = counters.get("total_correct_answers", 0)
+    # Topics are canonicalised on load, so progress saved under older free-text keys merges into one entry
+    topic_performance = {}
+    for name, value in counters.items():
+        if name.startswith(TOPIC_TOTAL_PREFIX):
+            topic_performance.setdefault(canonical_topic(name[len(TOPIC_TOTAL_PREFIX):]), {"total_solved": 0, "correct_solved": 0})["total_solved"] += value
+        elif name.startswith(TOPIC_CORRECT_PREFIX):
+            topic_performance.setdefault(canonical_topic(name[len(TOPIC_CORRECT_PREFIX):]), {"total_solved": 0, "correct_solved": 0})["correct_solved"] += value
+    st.session_state.topic_performance = topic_performance
+    st.session_state.attempt_log = None # Read from the store on first use, see session_attempt_log
+
+    if state:
+        st.session_state.weak_topics = {canonical_topic(topic) for topic in state.get("weak_topics", [])}
+        st.session_state.topics_covered = {canonical_topic(topic) for topic in state.get("topics_covered", [])}
+        st.session_state.activity_calendar = ActivityCalendar.from_dict(state.get("activity", {}))
+        st.session_state.review_scheduler = ReviewScheduler.from_list(state.get("reviews", []))
+        st.session_state.bookmarked_questions = BookmarkStore.from_list(state.get("bookmarks", []))
+    st.session_state.profile_user = user_key
+    mark_profile_changed("topics", "streak")
+
+
+def mark_profile_changed(*parts: str):
+    """Bump the version of changed profile parts ("topics", "streak") so the profile page re-renders them."""
+    for part in parts:
+        st.session_state.profile_versions[part] += 1
+
+
+def record_progress(solved: int, correct: int, topic_counts: Optional[Dict[str, Dict[str, int]]] = None):
+    """
+    Buffer counter increments for the current user (negative values take progress back).
+    `topic_counts` maps a topic to {"total_solved": n, "correct_solved": m}.
+    """
+    mark_profile_changed("topics")
+    user_key = _user_key()
+    if user_key is None:
+        return
+    deltas = {"total_questions_solved": solved, "total_correct_answers": correct}
+    for topic, counts in (topic_counts or {}).items():
+        deltas[TOPIC_TOTAL_PREFIX + topic] = counts.get("total_solved", 0)
+        deltas[TOPIC_CORRECT_PREFIX + topic] = counts.get("correct_solved", 0)
+    get_profile_store().add_counters(user_key, deltas)
+
+
+def session_attempt_log() -> "AttemptLog":
+    """
+    The session's attempt log, read from the current user's stored profile on first use. Until then
+    NumPy (which the log is built on) is not even imported.
+    """
+    if st.session_state.attempt_log is None:
+        from attempt_log import AttemptLog
+        user_key = _user_key()
+        st.session_state.attempt_log = get_profile_store().load_attempts(user_key) if user_key else AttemptLog()
+    return st.session_state.attempt_log
+
+
+def record_attempts(topics: Sequence[str], correct: Sequence[bool], difficulty: str, source: str,
+                    timestamp: Optional[float] = None, weight: int = 1):
+    """
+    Append answered questions to the session's attempt log and buffer them for the current user.
+    A weight of -1 takes back attempts recorded earlier (pass their original timestamp).
+    """
+    from attempt_log import AttemptLog
+    batch = AttemptLog()
+    batch.extend(topics, correct, difficulty, source, timestamp, weight)
+    user_key = _user_key()
+    # A log that is not loaded yet picks the batch up from the store's buffer when it is
+    if st.session_state.attempt_log is not None or user_key is None:
+        session_attempt_log().merge(batch)
+    if user_key is not None:
+        get_profile_store().add_attempts(user_key, batch)
+
+
+def save_profile_state():
+    """Buffer a snapshot of the current user's non-counter progress (weak topics, streaks, bookmarks, review schedule)."""
+    user_key = _user_key()
+    if user_key is None or st.session_state.get("profile_user") != user_key:
+        return
+    get_profile_store().save_state(user_key, {
+        "user_name": st.session_state.user_name,
+        "weak_topics": sorted(st.session_state.weak_topics),
+        "topics_covered": sorted(st.session_state.topics_covered),
+        "activity": st.session_state.activity_calendar.to_dict(),
+        # Question records are never mutated once generated, so the snapshot can share them
+        "bookmarks": st.session_state.bookmarked_questions.to_list(),
+        "reviews": st.session_state.review_scheduler.to_list(),
+    })
+
+
+def flush_profile():
+    """Write buffered progress now, e.g. at the end of a quiz."""
+    save_profile_state()
+    try:
+        get_profile_store().flush()
+    except sqlite3.Error as e:
+        st.warning(f"Could not save your progress yet, will retry in the background: {e}")
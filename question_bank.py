@@ -0,0 +1,141 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from config import QUESTION_BANK_PATH
+from topic_taxonomy import canonical_topic
+from near_duplicates import NEAR_DUPLICATE_THRESHOLD, band_hashes, estimated_similarity, question_signature
+from question_ids import question_id
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS questions (
+    id TEXT PRIMARY KEY,
+    topic TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    signature BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS questions_topic_difficulty ON questions (topic, difficulty);
+CREATE TABLE IF NOT EXISTS question_bands (
+    band INTEGER NOT NULL,
+    hash BLOB NOT NULL,
+    id TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS question_bands_bucket ON question_bands (band, hash);
+"""
+
+
+def normalize_topic(topic: str) -> str:
+    """Key under which a quiz topic is stored: its canonical id, so "Thermo" and "thermodynamics" share questions."""
+    return canonical_topic(topic)
+
+
+class QuestionBank:
+    """
+    Local store of every generated quiz question, so repeated quiz requests can be served without Gemini.
+
+    Questions are deduplicated by a normalised content hash and, for reworded copies of the same question,
+    by MinHash signature through LSH band buckets kept in the question_bands table, so the check touches
+    only a handful of rows however large the bank grows. They are indexed by canonical topic id (see
+    topic_taxonomy) and difficulty; a chapter's quiz can also use its subtopics' questions. SQLite in WAL mode
+    with per-thread connections makes the bank safe to share between threads and worker processes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().executescript(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _find_near_duplicate(self, conn: sqlite3.Connection, signature: np.ndarray) -> Optional[str]:
+        """Id of a stored question whose signature is within the near-duplicate threshold, or None."""
+        buckets = band_hashes(signature)
+        condition = " OR ".join(["(band = ? AND hash = ?)"] * len(buckets))
+        params = [value for band, bucket in enumerate(buckets) for value in (band, bucket)]
+        candidates = conn.execute(
+            f"""SELECT id, signature FROM questions WHERE id IN (
+                    SELECT DISTINCT id FROM question_bands WHERE {condition})""",
+            params
+        ).fetchall()
+        for qid, stored in candidates:
+            if estimated_similarity(signature, np.frombuffer(stored, dtype=np.uint32)) >= NEAR_DUPLICATE_THRESHOLD:
+                return qid
+        return None
+
+    def add_questions(self, questions: Iterable[Dict[str, Any]], topic: str, difficulty: str) -> int:
+        """
+        Store questions under a topic and difficulty, skipping ones already in the bank, verbatim or reworded.
+        Returns how many were added.
+        """
+        topic_key = normalize_topic(topic)
+        now = time.time()
+        added = 0
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for question in questions:
+                qid = question_id(question)
+                if conn.execute("SELECT 1 FROM questions WHERE id = ?", (qid,)).fetchone():
+                    continue
+                signature = question_signature(question)
+                if self._find_near_duplicate(conn, signature) is not None:
+                    continue
+                conn.execute(
+                    "INSERT INTO questions (id, topic, difficulty, payload, signature, created_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (qid, topic_key, difficulty, json.dumps(question, ensure_ascii=False), signature.tobytes(), now)
+                )
+                conn.executemany(
+                    "INSERT INTO question_bands (band, hash, id) VALUES (?, ?, ?)",
+                    [(band, bucket, qid) for band, bucket in enumerate(band_hashes(signature))]
+                )
+                added += 1
+        return added
+
+    def find_questions(self, topic: str, difficulty: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Up to `limit` stored questions for a topic and difficulty: exact topic matches first, then questions
+        filed under the topic's syllabus subtree ("Rotational Motion" also gets "Rolling Motion" questions),
+        each group in random order so repeat requests get variety. Nothing outside the subtree is used.
+        """
+        if limit <= 0:
+            return []
+        topic_key = normalize_topic(topic)
+        # Topic ids are slugs ([a-z0-9-] and "/"), so they contain no LIKE wildcards
+        rows = self._connection().execute(
+            """SELECT payload FROM questions
+               WHERE difficulty = ? AND (topic = ? OR topic LIKE ?)
+               ORDER BY topic != ?, random() LIMIT ?""",
+            (difficulty, topic_key, topic_key + "/%", topic_key, limit)
+        ).fetchall()
+        return [json.loads(payload) for payload, in rows]
+
+
+_bank = None
+_bank_lock = threading.Lock()
+
+
+def get_question_bank() -> QuestionBank:
+    """Return the process-wide question bank, creating it on first use."""
+    global _bank
+    with _bank_lock:
+        if _bank is None:
+            _bank = QuestionBank(QUESTION_BANK_PATH)
+        return _bank
@@ -0,0 +1,17 @@
+import hashlib
+import re
+import unicodedata
+from typing import Any, Dict
+
+
+def normalize_text(text: Any) -> str:
+    """Lowercase, Unicode-normalised text with punctuation and repeated whitespace removed."""
+    text = unicodedata.normalize("NFKC", str(text or "")).lower()
+    return " ".join(re.findall(r"\w+", text))
+
+
+def question_id(question: Dict[str, Any]) -> str:
+    """Stable id of a question: a hash of its normalised text and answer options."""
+    answers = question.get("answers") or []
+    content = normalize_text(question.get("question", "")) + "\x1f" + "\x1f".join(normalize_text(a) for a in answers)
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
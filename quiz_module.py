@@ -1,17 +1,59 @@
 import streamlit as st
-import google.generativeai as genai
 import json
-from typing import List, Dict, Any
-from datetime import datetime, timedelta
-from utils import get_solution_link, get_youtube_solution_link
+import queue
+import threading
+import concurrent.futures
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Iterable, Iterator
+from datetime import datetime
+from llm_gateway import get_gateway
+from json_stream import JSONArrayStreamParser
+from question_bank import get_question_bank
+from question_ids import question_id
+from near_duplicates import LSHIndex, question_signature, unique_questions
+from profile_store import record_progress, record_attempts, flush_profile, mark_profile_changed
+from topic_taxonomy import canonical_topic, topic_names
+from utils import prefetch_question_links, prefetch_quiz_links, cancel_link_prefetch
+
+QUIZ_SHARD_SIZE = 5 # Larger quizzes are split into concurrent requests of at most this many questions
+QUIZ_SHARD_RETRIES = 2 # Extra attempts for a shard that fails or comes back short
+QUIZ_SHARD_TIMEOUT = 120 # Seconds to wait for any shard to make progress
+QUIZ_SHARD_ANGLES = ("core concepts", "numerical problem solving", "previous year questions", "common misconceptions")
+QUIZ_STREAM_FIRST_QUESTION_TIMEOUT = 120 # Seconds to wait for the first streamed question
+QUIZ_STREAM_NEXT_QUESTION_TIMEOUT = 60 # Seconds to wait for a later question before re-checking
+QUIZ_AVOID_MAX_QUESTIONS = 20 # Banked questions listed in a top-up prompt for Gemini not to repeat
+QUIZ_AVOID_QUESTION_CHARS = 150 # Each listed question is cut to this length
+REVIEW_SESSION_SIZE = 10 # Due questions per review session
+
+def _quiz_json_text(response_text: str) -> str:
+    """Strip markdown fences and return the outermost JSON array in a quiz response, or "" if there is none."""
+    response_text = response_text.replace("```json", "").replace("```", "").strip()
+    json_start = response_text.find("[")
+    json_end = response_text.rfind("]") + 1
+    if json_start != -1 and json_end != -1 and json_end > json_start:
+        return response_text[json_start:json_end]
+    return ""
+
+def _is_valid_quiz_json(response_text: str) -> bool:
+    try:
+        return bool(json.loads(_quiz_json_text(response_text)))
+    except json.JSONDecodeError:
+        return False
 
-def generate_quiz(topic: str, difficulty: str, num_questions: int) -> List[Dict[str, Any]]:
-    """Generate a quiz based on the specified topic, difficulty, number of questions, and weak topics."""
-    model = genai.GenerativeModel('gemini-1.5-flash')
-    
-    weak_topics_str = ", ".join(st.session_state.weak_topics) if st.session_state.weak_topics else "None identified"
+QUIZ_GENERATION_CONFIG = {"temperature": 0.3}
+
+def _build_quiz_prompt(topic: str, difficulty: str, num_questions: int, weak_topics, sub_focus: Optional[str] = None,
+                       avoid: Sequence[Dict[str, Any]] = ()) -> str:
+    """
+    Build the Gemini prompt for a quiz, optionally narrowed to one sub-focus for a shard of a larger quiz.
+    Questions in `avoid` (already served from the question bank) are listed for Gemini not to repeat.
+    """
+    weak_topics_str = ", ".join(topic_names(weak_topics)) if weak_topics else "None identified"
+    sub_focus_str = f"\n    For this set of questions, concentrate specifically on: {sub_focus}.\n" if sub_focus else ""
+    if avoid:
+        avoid_list = "\n".join(f"    - {str(q.get('question', ''))[:QUIZ_AVOID_QUESTION_CHARS]}" for q in avoid[:QUIZ_AVOID_MAX_QUESTIONS])
+        sub_focus_str += f"\n    The student already has the questions below. Do not repeat them or ask the same problem with reworded text:\n{avoid_list}\n"
     
-    prompt = f"""
+    return f"""
     Generate a quiz on the topic "{topic}" for a student who is preparing for Joint Entrance Exam (JEE).
     The desired difficulty level is "{difficulty}".
     The quiz should have exactly {num_questions} single choice questions.
@@ -43,26 +85,70 @@ def generate_quiz(topic: str, difficulty: str, num_questions: int) -> List[Dict[
     {weak_topics_str}
 
     Focus more on these weak topics if they are related to {topic}.
+    {sub_focus_str}
     Ensure all questions are appropriate for JEE level and the specified difficulty.
     Return ONLY valid JSON with no additional text or markdown formatting.
     """
+
+def _normalize_question(question: Any) -> Optional[Dict[str, Any]]:
+    """Fill in the explanation structure of a generated question, or return None if it is unusable."""
+    if not isinstance(question, dict) or not question.get("question") or not isinstance(question.get("answers"), list):
+        return None
+    if not isinstance(question.get("correctAnswer"), int) or not 0 <= question["correctAnswer"] < len(question["answers"]):
+        return None
+    # Ensure explanation structure exists
+    if not isinstance(question.get('explanation'), dict):
+        question['explanation'] = {"detailed_steps": question['explanation']} if question.get('explanation') else {}
+    question['explanation'].setdefault('detailed_steps', 
+        "Explanation not generated. Please refer to solution links.")
+    question['explanation'].setdefault('youtube_link', "")
+    return question
+
+def generate_quiz(topic: str, difficulty: str, num_questions: int) -> List[Dict[str, Any]]:
+    """
+    Build a quiz for the specified topic and difficulty: questions already in the local question bank
+    are used first and only the shortfall is generated by Gemini (taking the weak topics into account).
+    Newly generated questions are added to the bank.
+    """
+    bank = get_question_bank()
+    questions = bank.find_questions(topic, difficulty, num_questions)
+    if len(questions) < num_questions:
+        generated = _generate_new_questions(topic, difficulty, num_questions - len(questions), avoid=questions)
+        bank.add_questions(generated, topic, difficulty)
+        questions = unique_questions(questions + generated)[:num_questions]
+        if len(questions) < num_questions:
+            st.warning(f"Only {len(questions)} of {num_questions} questions could be generated.")
+    return questions
+
+def _generate_new_questions(topic: str, difficulty: str, num_questions: int,
+                            avoid: Sequence[Dict[str, Any]] = ()) -> List[Dict[str, Any]]:
+    """
+    Generate quiz questions with Gemini based on the topic, difficulty, number of questions, and weak topics.
+    When topping up banked questions (`avoid`), the response cache is bypassed: a cached answer to the
+    same prompt would just return the questions that are already in the bank.
+    """
+    if num_questions > QUIZ_SHARD_SIZE:
+        try:
+            questions = list(generate_quiz_sharded(topic, difficulty, num_questions, set(st.session_state.weak_topics), avoid))
+        except Exception as e:
+            st.error(f"Error generating quiz: {str(e)}")
+            return []
+        if len(questions) < num_questions:
+            st.warning(f"Only {len(questions)} of {num_questions} questions could be generated.")
+        return questions
+
+    prompt = _build_quiz_prompt(topic, difficulty, num_questions, st.session_state.weak_topics, avoid=avoid)
     try:
-        response = model.generate_content(
+        response_text = get_gateway().generate(
             prompt,
-            generation_config={"temperature": 0.3}
+            generation_config=QUIZ_GENERATION_CONFIG,
+            use_cache=not avoid,
+            validate=_is_valid_quiz_json
         )
-        
-        response_text = response.text
         questions = []  # Initialize empty list first
         
-        # Clean response text
-        response_text = response_text.replace("```json", "").replace("```", "").strip()
-        
-        json_start = response_text.find("[")
-        json_end = response_text.rfind("]") + 1
-        
-        if json_start != -1 and json_end != -1 and json_end > json_start:
-            json_text = response_text[json_start:json_end]
+        json_text = _quiz_json_text(response_text)
+        if json_text:
             try:
                 questions = json.loads(json_text)
             except json.JSONDecodeError as je:
@@ -73,14 +159,8 @@ def generate_quiz(topic: str, difficulty: str, num_questions: int) -> List[Dict[
             return []
         
         # Process questions and add solution links
+        questions = [q for q in map(_normalize_question, questions) if q is not None]
         if questions:
-            for question in questions:
-                # Ensure explanation structure exists
-                question.setdefault('explanation', {})
-                question['explanation'].setdefault('detailed_steps', 
-                    "Explanation not generated. Please refer to solution links.")
-                question['explanation'].setdefault('youtube_link', "")
-            
             return questions
         else:
             st.error("Generated quiz is empty")
@@ -90,14 +170,265 @@ def generate_quiz(topic: str, difficulty: str, num_questions: int) -> List[Dict[
         st.error(f"Error generating quiz: {str(e)}")
         return []
 
+def stream_quiz_questions(topic: str, difficulty: str, num_questions: int, weak_topics,
+                          sub_focus: Optional[str] = None, avoid: Sequence[Dict[str, Any]] = ()) -> Iterator[Dict[str, Any]]:
+    """
+    Generate a quiz with the streaming Gemini API, yielding each question as soon as its JSON object
+    is complete. Does not touch the UI, so it can run on a background thread; errors are raised.
+    Like _generate_new_questions, a top-up of banked questions (`avoid`) bypasses the response cache.
+    """
+    prompt = _build_quiz_prompt(topic, difficulty, num_questions, weak_topics, sub_focus, avoid)
+    parser = JSONArrayStreamParser()
+    # The gateway caches the full text once the stream ends, if the array was complete and well-formed
+    chunks = get_gateway().stream(prompt, generation_config=QUIZ_GENERATION_CONFIG, use_cache=not avoid,
+                                  validate=lambda text: parser.done and not parser.skipped)
+    for chunk_text in chunks:
+        for question in parser.feed(chunk_text):
+            question = _normalize_question(question)
+            if question is not None:
+                yield question
+
+def _shard_focuses(topic: str, weak_topics, num_shards: int) -> List[str]:
+    """Pick a different sub-focus for each shard, preferring the student's weak topics."""
+    focuses = topic_names(weak_topics) if weak_topics else []
+    focuses += [f"{angle} in {topic}" for angle in QUIZ_SHARD_ANGLES]
+    return [focuses[i % len(focuses)] for i in range(num_shards)]
+
+def generate_quiz_sharded(topic: str, difficulty: str, num_questions: int, weak_topics,
+                          avoid: Sequence[Dict[str, Any]] = ()) -> Iterator[Dict[str, Any]]:
+    """
+    Generate a large quiz as several small concurrent Gemini requests of at most QUIZ_SHARD_SIZE questions,
+    each seeded with its own sub-focus. Questions are yielded as they stream in from any shard, with
+    near-duplicates dropped. A failing shard is retried for just its missing questions, and any shortfall
+    left after deduplication is topped up once. Does not touch the UI; raises only if nothing was produced.
+    The shards run on threads of this quiz's own; closing the generator stops them at their next question.
+    """
+    shard_sizes = [QUIZ_SHARD_SIZE] * (num_questions // QUIZ_SHARD_SIZE)
+    if num_questions % QUIZ_SHARD_SIZE:
+        shard_sizes.append(num_questions % QUIZ_SHARD_SIZE)
+    focuses = _shard_focuses(topic, weak_topics, len(shard_sizes) + 1)
+    results = queue.Queue()
+    stop = threading.Event()
+    # One thread per shard (the top-up only starts once they have all finished)
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=len(shard_sizes), thread_name_prefix="quiz-shard")
+
+    def run_shard(size: int, focus: str):
+        delivered = 0
+        last_error = None
+        for _ in range(1 + QUIZ_SHARD_RETRIES):
+            try:
+                for question in stream_quiz_questions(topic, difficulty, size - delivered, weak_topics, sub_focus=focus, avoid=avoid):
+                    if stop.is_set():
+                        break
+                    results.put(("question", question))
+                    delivered += 1
+                    if delivered >= size:
+                        break
+            except Exception as e:
+                last_error = e
+            if delivered >= size or stop.is_set():
+                break
+        results.put(("done", last_error))
+
+    try:
+        for size, focus in zip(shard_sizes, focuses):
+            executor.submit(run_shard, size, focus)
+
+        pending = len(shard_sizes)
+        topped_up = False
+        yielded = 0
+        seen = LSHIndex()
+        errors = []
+        while pending:
+            try:
+                kind, payload = results.get(timeout=QUIZ_SHARD_TIMEOUT)
+            except queue.Empty:
+                errors.append(TimeoutError("Timed out waiting for quiz shards"))
+                break
+            if kind == "done":
+                pending -= 1
+                if payload is not None:
+                    errors.append(payload)
+                if not pending and not topped_up and yielded < num_questions:
+                    # Duplicates or failed shards left the quiz short: ask once more for the difference
+                    topped_up = True
+                    pending = 1
+                    executor.submit(run_shard, num_questions - yielded, focuses[-1])
+                continue
+
+            if yielded >= num_questions or seen.add_if_new(yielded, question_signature(payload)) is not None:
+                continue
+            yielded += 1
+            yield payload
+
+        if not yielded and errors:
+            raise errors[-1]
+    finally: # Also runs when the consumer closes the generator early
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def quiz_question_producer(topic: str, difficulty: str, num_questions: int, weak_topics,
+                           avoid: Sequence[Dict[str, Any]] = ()) -> Iterator[Dict[str, Any]]:
+    """Pick the streaming generator for a quiz: sharded for large quizzes, a single request otherwise."""
+    if num_questions > QUIZ_SHARD_SIZE:
+        return generate_quiz_sharded(topic, difficulty, num_questions, weak_topics, avoid)
+    return stream_quiz_questions(topic, difficulty, num_questions, weak_topics, avoid=avoid)
+
+def banked_quiz_producer(topic: str, difficulty: str, num_questions: int, weak_topics) -> Iterator[Dict[str, Any]]:
+    """
+    Yield questions from the local question bank first, then stream only the shortfall from Gemini
+    (uncached, and told which questions to avoid), storing each generated question in the bank as it
+    arrives. Does not touch the UI.
+    """
+    bank = get_question_bank()
+    banked = bank.find_questions(topic, difficulty, num_questions)
+    seen = LSHIndex()
+    for question in banked:
+        seen.insert(question_id(question), question_signature(question))
+    yield from banked
+    if len(banked) >= num_questions:
+        return
+    for question in quiz_question_producer(topic, difficulty, num_questions - len(banked), weak_topics, avoid=banked):
+        if seen.add_if_new(question_id(question), question_signature(question)) is not None:
+            continue
+        bank.add_questions([question], topic, difficulty)
+        yield question
+
+class QuizStream:
+    """
+    A quiz whose questions are still being produced on a background thread.
+    `questions` and `links` are shared with st.session_state (quiz_questions / quiz_links) and grow
+    as questions arrive; solution-link prefetch starts for each question the moment it lands.
+    Each stream has its own thread, so one student's quiz never waits for another's; the Gemini
+    requests behind them are bounded process-wide by the LLM gateway. close() stops a quiz that is
+    replaced or abandoned.
+    """
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.questions: List[Dict[str, Any]] = []
+        self.links: Dict[int, Dict[str, Any]] = {}
+        self.done = False
+        self.error: Optional[str] = None
+        self._cond = threading.Condition()
+        self._closed = threading.Event()
+
+    def start(self, producer: Iterable[Dict[str, Any]]) -> "QuizStream":
+        threading.Thread(target=self._consume, args=(producer,), name="quiz-stream", daemon=True).start()
+        return self
+
+    def _consume(self, producer: Iterable[Dict[str, Any]]):
+        try:
+            for question in producer:
+                if self._closed.is_set() or len(self.questions) >= self.expected:
+                    break
+                self.links[len(self.questions)] = prefetch_question_links(question['question'])
+                with self._cond:
+                    self.questions.append(question)
+                    self._cond.notify_all()
+        except Exception as e:
+            self.error = str(e)
+        finally:
+            if hasattr(producer, "close"):
+                producer.close() # Stops a generator's shards and open Gemini streams
+            with self._cond:
+                self.done = True
+                self._cond.notify_all()
+
+    def close(self):
+        """Stop producing questions; generation ends when the next one arrives. Safe to call more than once."""
+        self._closed.set()
+
+    def wait_for(self, count: int, timeout: float) -> bool:
+        """Block until at least `count` questions are available or the stream ends; True if they are."""
+        with self._cond:
+            self._cond.wait_for(lambda: len(self.questions) >= count or self.done, timeout=timeout)
+            return len(self.questions) >= count
+
+    @property
+    def total(self) -> int:
+        """Number of questions the quiz will have: the requested count until the stream has finished."""
+        return len(self.questions) if self.done else self.expected
+
+def _resolved_link(future) -> Optional[str]:
+    """Return a finished lookup's link, or None if it is still running or failed."""
+    if not future.done() or future.cancelled() or future.exception() is not None:
+        return None
+    return future.result()
+
+def get_question_links(q_idx: int, question: Dict[str, Any]) -> Tuple[Optional[str], Optional[str], bool]:
+    """
+    Read a question's solution links from the per-quiz link map without blocking.
+    Returns (textual link, YouTube link, still_searching).
+    """
+    links = st.session_state.quiz_links.get(q_idx)
+    if links is None: # Not prefetched (e.g. quiz restored from an older session), start it now
+        links = prefetch_question_links(question['question'])
+        st.session_state.quiz_links[q_idx] = links
+
+    still_searching = not all(future.done() for future in links.values())
+    return _resolved_link(links["text"]), _resolved_link(links["youtube"]), still_searching
+
+def _question_topic(question_idx: int) -> str:
+    """Canonical topic an answer counts towards: the review item's own topic in a review session, else the quiz topic."""
+    if st.session_state.quiz_question_topics:
+        return st.session_state.quiz_question_topics[question_idx]
+    return canonical_topic(st.session_state.get("current_quiz_main_topic", "General"))
+
+def bookmark_question(question: Dict[str, Any], quiz_topic: str, question_idx: int) -> bool:
+    """
+    Bookmark a question unless it is already bookmarked. Returns True if added.
+    Bookmarked questions are also scheduled for spaced review.
+    """
+    st.session_state.review_scheduler.add(question, _question_topic(question_idx))
+    return st.session_state.bookmarked_questions.add(question, quiz_topic, question_idx) is not None
+
+def unbookmark_question(question: Dict[str, Any]):
+    """Remove this exact question's bookmark, if any."""
+    st.session_state.bookmarked_questions.remove(question_id(question))
+
+def _discard_quiz_stream():
+    """Stop background work for the session's current quiz: question generation and solution-link lookups."""
+    if st.session_state.quiz_stream is not None:
+        st.session_state.quiz_stream.close()
+        st.session_state.quiz_stream = None
+    cancel_link_prefetch(st.session_state.quiz_links)
+
+def start_review_session() -> bool:
+    """
+    Start a quiz made of the most overdue review questions, straight from the schedule (no Gemini call).
+    Returns False if nothing is due.
+    """
+    items = st.session_state.review_scheduler.next_due(REVIEW_SESSION_SIZE)
+    if not items:
+        return False
+    _discard_quiz_stream()
+    st.session_state.quiz_questions = [item["question"] for item in items]
+    st.session_state.quiz_question_topics = [item["topic"] for item in items]
+    st.session_state.quiz_links = prefetch_quiz_links(st.session_state.quiz_questions)
+    st.session_state.showing_quiz = True
+    st.session_state.current_question = 0
+    st.session_state.score = 0
+    st.session_state.answered_questions = {}
+    st.session_state.current_quiz_main_topic = "Review"
+    st.session_state.current_quiz_difficulty = ""
+    return True
+
 def display_quiz_generator():
     """Display the quiz generator interface."""
     st.subheader("📝 Generate a Custom Quiz")
     
     if st.session_state.weak_topics:
-        st.info(f"**Identified weak topics to focus on:** {', '.join(st.session_state.weak_topics)}")
+        st.info(f"**Identified weak topics to focus on:** {', '.join(topic_names(st.session_state.weak_topics))}")
     else:
         st.write("No weak topics identified yet. Chat more or upload test results to help us tailor your quiz.")
+
+    due_count = st.session_state.review_scheduler.due_count()
+    if due_count:
+        st.markdown(f"**🔁 {due_count} question{'s' if due_count != 1 else ''} due for review** (missed or bookmarked earlier)")
+        if st.button(f"Review due questions ({min(due_count, REVIEW_SESSION_SIZE)})", key="start_review_button"):
+            if start_review_session():
+                st.rerun()
     
     with st.form("quiz_form"):
         topic = st.text_input("Enter the quiz topic (e.g., 'Thermodynamics', 'Organic Chemistry Nomenclature'):", key="quiz_topic_input")
@@ -119,22 +450,47 @@ def display_quiz_generator():
                 step=1,
                 key="quiz_num_questions_input"
             )
+
+        stream_questions = st.checkbox(
+            "Start as soon as the first question is ready",
+            value=True,
+            key="quiz_stream_checkbox",
+            help="Questions keep arriving in the background while you answer the first ones."
+        )
             
         submit_quiz = st.form_submit_button("🚀 Generate Quiz")
         
         if submit_quiz and topic:
-            with st.spinner(f"Generating {num_questions} {difficulty} questions on {topic}... This might take a moment."):
-                st.session_state.quiz_questions = generate_quiz(topic, difficulty, num_questions)
+            _discard_quiz_stream()
+            st.session_state.quiz_question_topics = []
+            if stream_questions:
+                with st.spinner(f"Generating the first of {num_questions} {difficulty} questions on {topic}..."):
+                    stream = QuizStream(num_questions).start(
+                        banked_quiz_producer(topic, difficulty, num_questions, set(st.session_state.weak_topics))
+                    )
+                    stream.wait_for(1, timeout=QUIZ_STREAM_FIRST_QUESTION_TIMEOUT)
+                if stream.error and not stream.questions:
+                    st.error(f"Error generating quiz: {stream.error}")
+                st.session_state.quiz_stream = stream
+                st.session_state.quiz_questions = stream.questions
+                st.session_state.quiz_links = stream.links
+            else:
+                with st.spinner(f"Generating {num_questions} {difficulty} questions on {topic}... This might take a moment."):
+                    st.session_state.quiz_questions = generate_quiz(topic, difficulty, num_questions)
+                # Resolve solution links for the whole quiz in the background while the student works
+                st.session_state.quiz_links = prefetch_quiz_links(st.session_state.quiz_questions)
             
             if st.session_state.quiz_questions:
                 st.session_state.showing_quiz = True
                 st.session_state.current_question = 0
                 st.session_state.score = 0
                 st.session_state.answered_questions = {} 
-                # Add topic to topics covered
-                st.session_state.topics_covered.add(topic)
+                # Add topic to topics covered (keyed by canonical id, so spelling variants count as one topic)
+                st.session_state.topics_covered.add(canonical_topic(topic))
+                mark_profile_changed("topics")
                 # Store the main topic of the quiz
                 st.session_state.current_quiz_main_topic = topic
+                st.session_state.current_quiz_difficulty = difficulty
                 st.success("Quiz generated successfully! Let's begin.")
                 st.rerun()
             else:
@@ -153,9 +509,11 @@ def display_quiz():
 
     questions = st.session_state.quiz_questions
     current_q_idx = st.session_state.current_question
+    stream = st.session_state.quiz_stream
 
     # --- Progress Indicators (New) ---
-    total_questions = len(questions)
+    # While questions are still streaming in, count the ones that have been requested
+    total_questions = stream.total if stream is not None else len(questions)
     
     # Corrected: questions_attempted should be based on the number of answered_questions
     questions_attempted = len(st.session_state.answered_questions) 
@@ -175,29 +533,24 @@ def display_quiz():
     st.markdown("---")
     # --- End Progress Indicators ---
 
+    if stream is not None and stream.done and len(questions) < stream.expected:
+        reason = f": {stream.error}" if stream.error else "."
+        st.warning(f"Only {len(questions)} of {stream.expected} questions could be generated{reason}")
+
+    if stream is not None and current_q_idx >= len(questions) and not stream.done:
+        with st.spinner(f"Question {current_q_idx + 1} is still being generated..."):
+            stream.wait_for(current_q_idx + 1, timeout=QUIZ_STREAM_NEXT_QUESTION_TIMEOUT)
+        st.rerun()
+
     if current_q_idx >= total_questions:
         st.balloons()
         x= st.session_state.score / total_questions * 100
         st.success(f"🎉 Quiz Completed! Your final score: {x:.2f}% 🎉")
         
-        # Update streak history for today
-        today = datetime.now().date()
-        st.session_state.streak_history[today.isoformat()] = True
-
-        # Calculate streak
-        if st.session_state.last_quiz_date:
-            # Check if today is the day after the last quiz date
-            if today == st.session_state.last_quiz_date + timedelta(days=1):
-                st.session_state.current_streak += 1
-            # Check if it's the same day (don't break streak if multiple quizzes today)
-            elif today == st.session_state.last_quiz_date:
-                pass # Streak remains the same, already logged for today
-            else:
-                st.session_state.current_streak = 1 # Reset if not consecutive
-        else:
-            st.session_state.current_streak = 1 # First quiz completed
-
-        st.session_state.last_quiz_date = today
+        # Mark today as active; streaks are derived from the calendar (a second quiz today changes nothing)
+        if st.session_state.activity_calendar.mark(datetime.now().date()):
+            mark_profile_changed("streak")
+        flush_profile()
 
         st.write("### Review Your Answers:")
         for i, q_data in enumerate(questions):
@@ -219,9 +572,7 @@ def display_quiz():
             
             st.write(f"Correct answer: {q_data['answers'][q_data['correctAnswer']]}")
 
-            with st.spinner("Searching for solution..."):
-                txt_link = get_solution_link(q_data['question'])
-                yt_link = get_youtube_solution_link(q_data['question'])
+            txt_link, yt_link, still_searching = get_question_links(i, q_data)
 
             with st.expander("View Detailed Explanation"):
                 explanation_obj = q_data.get("explanation", {})
@@ -236,18 +587,27 @@ def display_quiz():
                     
                     if txt_link:
                         st.markdown(f"[📖 View Textual Solution]({txt_link})")
+                    elif still_searching:
+                        st.info("Still searching for solution links online...")
                     else:
                         st.info("Could not find a textual solution link online for this question.")
                 else: 
                     st.markdown(f"**Explanation:**\n{explanation_obj}")
 
+        if any(not future.done() for links in st.session_state.quiz_links.values() for future in links.values()):
+            if st.button("🔄 Refresh Solution Links", key="refresh_links_button"):
+                st.rerun()
+
 
         if st.button("Start New Quiz", key="new_quiz_button"):
             st.session_state.showing_quiz = False
             st.session_state.quiz_questions = []
+            _discard_quiz_stream()
+            st.session_state.quiz_links = {}
             st.session_state.current_question = 0
             st.session_state.score = 0
             st.session_state.answered_questions = {}
+            st.session_state.quiz_question_topics = []
             st.rerun()
         return
 
@@ -270,19 +630,10 @@ def display_quiz():
                 st.session_state.answered_questions[current_q_idx] = answer_info
                 
                 # Update bookmarked questions list
-                question_with_meta = question.copy()
-                question_with_meta["quiz_topic"] = st.session_state.current_quiz_main_topic
-                question_with_meta["question_idx"] = current_q_idx
-                
                 if not is_bookmarked:  # If previously not bookmarked, add to bookmarks
-                    st.session_state.bookmarked_questions.append(question_with_meta)
+                    bookmark_question(question, st.session_state.current_quiz_main_topic, current_q_idx)
                 else:  # If previously bookmarked, remove from bookmarks
-                    # Remove from bookmarked questions by filtering
-                    st.session_state.bookmarked_questions = [
-                        q for q in st.session_state.bookmarked_questions 
-                        if not (q.get("question") == question["question"] and 
-                                q.get("quiz_topic") == st.session_state.current_quiz_main_topic)
-                    ]
+                    unbookmark_question(question)
                 st.rerun()
         
         # The key issue starts here - need to handle the bookmarked-only case
@@ -313,13 +664,18 @@ def display_quiz():
                         st.session_state.total_correct_answers += 1
 
                     # Update topic-specific performance from quiz
-                    quiz_main_topic = st.session_state.get("current_quiz_main_topic", "General") 
+                    quiz_main_topic = _question_topic(current_q_idx)
                     if quiz_main_topic not in st.session_state.topic_performance:
                         st.session_state.topic_performance[quiz_main_topic] = {"total_solved": 0, "correct_solved": 0}
                     
                     st.session_state.topic_performance[quiz_main_topic]["total_solved"] += 1
                     if is_correct:
                         st.session_state.topic_performance[quiz_main_topic]["correct_solved"] += 1
+                    # Buffered in memory and written to the profile store in the next batch
+                    record_progress(1, int(is_correct), {quiz_main_topic: {"total_solved": 1, "correct_solved": int(is_correct)}})
+                    record_attempts([quiz_main_topic], [is_correct], st.session_state.current_quiz_difficulty, "quiz")
+                    # Missed questions are scheduled for review; a correct answer to a scheduled one pushes it further out
+                    st.session_state.review_scheduler.review(question, quiz_main_topic, is_correct)
 
                     st.rerun()
             
@@ -358,9 +714,7 @@ def display_quiz():
         
         # Only show explanation if question was answered or skipped
         if "selected_idx" in answer_info or is_skipped:
-            with st.spinner("Searching for textual solution..."):
-                txt_link = get_solution_link(question['question'])
-                yt_link = get_youtube_solution_link(question['question'])
+            txt_link, yt_link, still_searching = get_question_links(current_q_idx, question)
 
             explanation_obj = question.get("explanation", {})
             if isinstance(explanation_obj, dict):
@@ -374,6 +728,8 @@ def display_quiz():
                 
                 if txt_link:
                     st.markdown(f"[📖 View Textual Solution]({txt_link})")
+                elif still_searching:
+                    st.info("Still searching for solution links online...")
                 else:
                     st.info("Could not find a textual solution link online for this question.")
             else: 
@@ -404,13 +760,11 @@ def display_quiz():
                 else:
                     st.session_state.answered_questions[current_q_idx]["is_bookmarked"] = True
                 
-                # Add to bookmarked questions
-                question_with_meta = question.copy()
-                question_with_meta["quiz_topic"] = st.session_state.current_quiz_main_topic
-                question_with_meta["question_idx"] = current_q_idx
-                st.session_state.bookmarked_questions.append(question_with_meta)
-                
-                st.success("Question bookmarked! You can view it later in your profile.")
+                # Add to bookmarked questions, unless the same question is already saved
+                if bookmark_question(question, st.session_state.current_quiz_main_topic, current_q_idx):
+                    st.success("Question bookmarked! You can view it later in your profile.")
+                else:
+                    st.info("This question is already in your bookmarks.")
                 st.rerun()
         
         with col_submit:
@@ -436,13 +790,18 @@ def display_quiz():
                     st.session_state.total_correct_answers += 1
 
                 # Update topic-specific performance from quiz
-                quiz_main_topic = st.session_state.get("current_quiz_main_topic", "General") 
+                quiz_main_topic = _question_topic(current_q_idx)
                 if quiz_main_topic not in st.session_state.topic_performance:
                     st.session_state.topic_performance[quiz_main_topic] = {"total_solved": 0, "correct_solved": 0}
                 
                 st.session_state.topic_performance[quiz_main_topic]["total_solved"] += 1
                 if is_correct:
                     st.session_state.topic_performance[quiz_main_topic]["correct_solved"] += 1
+                # Buffered in memory and written to the profile store in the next batch
+                record_progress(1, int(is_correct), {quiz_main_topic: {"total_solved": 1, "correct_solved": int(is_correct)}})
+                record_attempts([quiz_main_topic], [is_correct], st.session_state.current_quiz_difficulty, "quiz")
+                # Missed questions are scheduled for review; a correct answer to a scheduled one pushes it further out
+                st.session_state.review_scheduler.review(question, quiz_main_topic, is_correct)
 
                 st.rerun() 
         
@@ -0,0 +1,144 @@
+import re
+from typing import Any, Dict, List, Optional
+
+# Student answers that mean the question was left unattempted
+_UNATTEMPTED = {"", "-", "--", "na", "n/a", "none", "not attempted", "unattempted", "not answered", "skipped", "blank"}
+
+_STUDENT_LABELS = r"(?:answer\s+by\s+(?:the\s+)?student|student'?s?\s+answer|your\s+answer|your\s+response|marked\s+(?:answer|option)|chosen\s+(?:answer|option)|selected\s+(?:answer|option)|response|attempted)"
+# "Solution:", "Ans:" and "Key" also head worked solutions in question papers, so they only count as the
+# answer key in a block or table that also has a student-answer label
+_CORRECT_LABELS = r"(?:correct\s+(?:answer|option|response)|right\s+answer|answer\s+key|key|correct|solution|ans(?:wer)?)"
+
+MIN_LABELLED_QUESTIONS = 3 # Labelled blocks needed before a text counts as that layout
+MIN_SCORE_ROWS = 5 # Score-table rows needed below the header (a 3x3 matrix must not pass)
+
+_ARROW_LINE = re.compile(r"^\s*->\s*(.*)$")
+_STUDENT_PREFIX = re.compile(rf"^\s*{_STUDENT_LABELS}\s*[:\-=]?\s*", re.IGNORECASE)
+_CORRECT_PREFIX = re.compile(rf"^\s*{_CORRECT_LABELS}\s*[:\-=]?\s*", re.IGNORECASE)
+_QUESTION_PREFIX = re.compile(r"^\s*(?:question|ques|que|q)(?=[\s.:\d])\s*\.?\s*(?:no\.?\s*)?\d*\s*[:.)\-]?\s*", re.IGNORECASE)
+
+# "Q12. ...", "Question 12:", "12) ..." at the start of a line
+_NUMBERED_QUESTION = re.compile(r"(?im)^[ \t]*(?:(?:q|que|ques|question)[ \t]*\.?[ \t]*(?:no\.?[ \t]*)?(\d{1,3})|(\d{1,3})[ \t]*[.)])[ \t]*[:.)\-]?[ \t]*")
+_LABELLED_STUDENT = re.compile(rf"(?im)^[ \t]*{_STUDENT_LABELS}[ \t]*[:\-=][ \t]*(.*)$")
+_LABELLED_CORRECT = re.compile(rf"(?im)^[ \t]*{_CORRECT_LABELS}[ \t]*[:\-=][ \t]*(.*)$")
+# Score-sheet header: one line naming both the student's answer and the key ("Q.No | Your Answer | Correct Answer")
+_SCORE_HEADER = re.compile(rf"(?im)^(?=.*\b{_STUDENT_LABELS}\b)(?=.*\b{_CORRECT_LABELS}\b).*$")
+
+# Score-sheet rows: "12 | B | C", "12, --, 4.5", "12   (b)   (c)   Correct"
+_SCORE_ROW = re.compile(
+    r"(?m)^[ \t]*(?:q[ \t]*\.?[ \t]*)?(\d{1,3})[ \t]*[|,\t ][ \t]*(\(?[A-Da-d]\)?|-?\d+(?:\.\d+)?|--?|NA|N/A)[ \t]*[|,\t ][ \t]*(\(?[A-Da-d]\)?|-?\d+(?:\.\d+)?)\b"
+)
+
+
+def normalize_answer(answer: Any) -> str:
+    """Canonical form of an answer for comparison: "(B)", "option b", "b." and "B" all become "b"."""
+    text = str(answer if answer is not None else "").strip().lower()
+    text = re.sub(r"^(?:option|opt\.?|choice)\s*", "", text)
+    text = text.strip(" \t.()[]:")
+    return " ".join(text.split())
+
+
+def is_unattempted(answer: Any) -> bool:
+    return normalize_answer(answer) in _UNATTEMPTED
+
+
+def answers_match(student_answer: Any, correct_answer: Any) -> bool:
+    """Compare a student answer with the key, treating numeric answers with a small tolerance."""
+    if is_unattempted(student_answer):
+        return False
+    student, correct = normalize_answer(student_answer), normalize_answer(correct_answer)
+    if student == correct:
+        return True
+    try:
+        return abs(float(student) - float(correct)) <= 1e-6 * max(1.0, abs(float(correct)))
+    except ValueError:
+        return False
+
+
+def _entry(question: str, student_answer: str, correct_answer: str) -> Dict[str, Any]:
+    student_answer, correct_answer = student_answer.strip(), correct_answer.strip()
+    return {
+        "question": " ".join(question.split()),
+        "student_answer": student_answer if not is_unattempted(student_answer) else "Not attempted",
+        "correct_answer": correct_answer,
+        "is_correct": answers_match(student_answer, correct_answer),
+    }
+
+
+def parse_arrow_format(text: str) -> List[Dict[str, Any]]:
+    """
+    The layout documented for the analyzer: each question is three "->" entries,
+    question, answer by student, correct answer (optionally labelled). Question text may wrap onto
+    following lines without an arrow.
+    """
+    fields: List[str] = []
+    for line in text.splitlines():
+        match = _ARROW_LINE.match(line)
+        if match:
+            fields.append(match.group(1))
+        elif fields and line.strip():
+            fields[-1] += " " + line.strip()
+
+    entries = []
+    for i in range(0, len(fields) - 2, 3):
+        question = _QUESTION_PREFIX.sub("", fields[i], count=1)
+        student = _STUDENT_PREFIX.sub("", fields[i + 1], count=1)
+        correct = _CORRECT_PREFIX.sub("", fields[i + 2], count=1)
+        if question.strip() and correct.strip():
+            entries.append(_entry(question, student, correct))
+    return entries
+
+
+def parse_labelled_format(text: str) -> List[Dict[str, Any]]:
+    """
+    Common coaching-portal layout: numbered questions, each followed by labelled lines such as
+    "Your Answer: B" and "Correct Answer: C". A block needs both labels: a question paper with
+    "Answer:" or "Solution:" lines but no student answers is not a result sheet.
+    """
+    starts = list(_NUMBERED_QUESTION.finditer(text))
+    entries = []
+    for match, next_match in zip(starts, starts[1:] + [None]):
+        block = text[match.end():next_match.start() if next_match else len(text)]
+        student = _LABELLED_STUDENT.search(block)
+        correct = _LABELLED_CORRECT.search(block)
+        if not student or not correct:
+            continue
+        question = block[:min(student.start(), correct.start())].strip() or f"Question {match.group(1) or match.group(2)}"
+        entries.append(_entry(question, student.group(1), correct.group(1)))
+    return entries if len(entries) >= MIN_LABELLED_QUESTIONS else []
+
+
+def parse_score_table(text: str) -> List[Dict[str, Any]]:
+    """
+    Score-sheet tables with one row per question: number, student response, key. Rows are only read
+    below a header naming both answer columns, and at least MIN_SCORE_ROWS of them are needed.
+    """
+    header = _SCORE_HEADER.search(text)
+    if not header:
+        return []
+    entries = []
+    seen = set()
+    for match in _SCORE_ROW.finditer(text, header.end()):
+        number = int(match.group(1))
+        if number in seen:
+            continue
+        seen.add(number)
+        entries.append(_entry(f"Question {number}", match.group(2), match.group(3)))
+    return entries if len(entries) >= MIN_SCORE_ROWS else []
+
+
+_PARSERS = (parse_arrow_format, parse_labelled_format, parse_score_table)
+
+
+def parse_test_results(text: str, min_questions: int = 1) -> Optional[List[Dict[str, Any]]]:
+    """
+    Try each known layout and return the entries of the one that recognises the most questions,
+    or None if none of them finds at least `min_questions`. Each entry has question, student_answer,
+    correct_answer and a locally computed is_correct.
+    """
+    best: List[Dict[str, Any]] = []
+    for parser in _PARSERS:
+        entries = parser(text)
+        if len(entries) > len(best):
+            best = entries
+    return best if len(best) >= min_questions else None
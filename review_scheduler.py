@@ -0,0 +1,116 @@
+import heapq
+import itertools
+import time
+from typing import Any, Dict, List, Optional
+
+from question_ids import question_id
+
+DAY_SECONDS = 24 * 3600
+RELEARN_DELAY_SECONDS = 10 * 60 # A missed question comes back this soon
+DEFAULT_EASE = 2.5 # SM-2 starting ease factor
+MIN_EASE = 1.3
+CORRECT_QUALITY = 4 # SM-2 grade given to a correct answer ("correct after some thought")
+WRONG_QUALITY = 1
+HEAP_SLACK = 64 # Stale heap entries tolerated beyond 2x the live items before a rebuild
+
+
+class ReviewScheduler:
+    """
+    SM-2 spaced repetition over questions the student got wrong or bookmarked.
+
+    Items are keyed by question id; a min-heap of (due time, sequence, id) orders them by next review.
+    Rescheduling pushes a new heap entry and leaves the old one behind, which is skipped when it
+    surfaces (its due time no longer matches the item's), so adding, reviewing and taking the next
+    due item are all O(log n).
+    """
+
+    def __init__(self):
+        self._items: Dict[str, Dict[str, Any]] = {}
+        self._heap: List[tuple] = []
+        self._sequence = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, question: Dict[str, Any]) -> bool:
+        return question_id(question) in self._items
+
+    def _push(self, item: Dict[str, Any]):
+        heapq.heappush(self._heap, (item["due"], next(self._sequence), item["id"]))
+        if len(self._heap) > 2 * len(self._items) + HEAP_SLACK:
+            # Mostly stale entries: rebuild from the live items so the heap stays O(n)
+            self._heap = [(entry["due"], next(self._sequence), entry["id"]) for entry in self._items.values()]
+            heapq.heapify(self._heap)
+
+    def _is_current(self, entry: tuple) -> bool:
+        item = self._items.get(entry[2])
+        return item is not None and item["due"] == entry[0]
+
+    def add(self, question: Dict[str, Any], topic: str, due: Optional[float] = None) -> str:
+        """Schedule a question (due now by default). A question already scheduled keeps its progress."""
+        qid = question_id(question)
+        if qid not in self._items:
+            self._items[qid] = {"id": qid, "question": question, "topic": topic, "ease": DEFAULT_EASE,
+                                "interval_days": 0.0, "repetitions": 0, "due": time.time() if due is None else due}
+            self._push(self._items[qid])
+        return qid
+
+    def review(self, question: Dict[str, Any], topic: str, correct: bool, now: Optional[float] = None):
+        """
+        Apply an answer to the schedule. A wrong answer schedules the question (or restarts its
+        progress) for a quick relearn; a correct one on a scheduled question moves it further out.
+        """
+        now = time.time() if now is None else now
+        qid = question_id(question)
+        item = self._items.get(qid)
+        if item is None:
+            if correct:
+                return
+            self.add(question, topic, now)
+            item = self._items[qid]
+
+        quality = CORRECT_QUALITY if correct else WRONG_QUALITY
+        item["ease"] = max(MIN_EASE, item["ease"] + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+        if correct:
+            item["repetitions"] += 1
+            if item["repetitions"] == 1:
+                item["interval_days"] = 1.0
+            elif item["repetitions"] == 2:
+                item["interval_days"] = 6.0
+            else:
+                item["interval_days"] = round(item["interval_days"] * item["ease"], 1)
+            item["due"] = now + item["interval_days"] * DAY_SECONDS
+        else:
+            item["repetitions"] = 0
+            item["interval_days"] = 0.0
+            item["due"] = now + RELEARN_DELAY_SECONDS
+        self._push(item)
+
+    def next_due(self, limit: int, now: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Up to `limit` due items, most overdue first. The items stay scheduled until reviewed."""
+        now = time.time() if now is None else now
+        due, taken = [], []
+        while self._heap and len(due) < limit and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            if self._is_current(entry): # Stale entries are simply dropped
+                due.append(self._items[entry[2]])
+                taken.append(entry)
+        for entry in taken:
+            heapq.heappush(self._heap, entry)
+        return due
+
+    def due_count(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        return sum(1 for item in self._items.values() if item["due"] <= now)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Items for the stored profile (questions are shared, not copied)."""
+        return list(self._items.values())
+
+    @classmethod
+    def from_list(cls, items: List[Dict[str, Any]]) -> "ReviewScheduler":
+        scheduler = cls()
+        for item in items:
+            scheduler._items[item["id"]] = dict(item)
+            scheduler._push(scheduler._items[item["id"]])
+        return scheduler
@@ -0,0 +1,54 @@
+from datetime import date, timedelta
+
+from activity_calendar import ActivityCalendar
+
+START = date(2024, 2, 26) # Runs over a month end and a leap day
+
+
+def _calendar(*offsets):
+    calendar = ActivityCalendar()
+    for offset in offsets:
+        calendar.mark(START + timedelta(days=offset))
+    return calendar
+
+
+def test_mark_is_idempotent():
+    calendar = ActivityCalendar()
+    assert calendar.mark(START)
+    assert not calendar.mark(START)
+    assert len(calendar) == 1 and START in calendar
+
+
+def test_count_is_inclusive_and_ignores_days_outside_the_history():
+    calendar = _calendar(0, 1, 2, 9, 10, 20)
+    assert calendar.count(START, START + timedelta(days=20)) == 6
+    assert calendar.count(START + timedelta(days=1), START + timedelta(days=9)) == 3
+    assert calendar.count(START - timedelta(days=30), START + timedelta(days=100)) == 6
+    assert calendar.count(START + timedelta(days=3), START + timedelta(days=8)) == 0
+    assert calendar.count(START + timedelta(days=5), START) == 0
+    assert ActivityCalendar().count(START, START) == 0
+
+
+def test_longest_streak_joins_runs_marked_out_of_order():
+    calendar = _calendar(0, 1, 4, 5, 6, 3)
+    assert calendar.longest_streak() == 4
+    calendar.mark(START + timedelta(days=2))
+    assert calendar.longest_streak() == 7
+
+
+def test_current_streak_counts_back_from_today_or_yesterday():
+    calendar = _calendar(0, 1, 2, 5, 6)
+    assert calendar.current_streak(START + timedelta(days=6)) == 2
+    assert calendar.current_streak(START + timedelta(days=7)) == 2 # Nothing done yet today
+    assert calendar.current_streak(START + timedelta(days=8)) == 0
+    assert calendar.current_streak(START + timedelta(days=1)) == 2 # A past day inside a longer run
+
+
+def test_dict_round_trip():
+    calendar = _calendar(-20, 0, 1, 2, 40)
+    restored = ActivityCalendar.from_dict(calendar.to_dict())
+    assert restored.to_dict() == calendar.to_dict()
+    assert restored.longest_streak() == 3
+    assert restored.current_streak(START + timedelta(days=2)) == 3
+    assert len(ActivityCalendar.from_dict(ActivityCalendar().to_dict())) == 0
+    assert len(ActivityCalendar.from_dict({})) == 0
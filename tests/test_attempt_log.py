@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+import pytest
+
+from attempt_analytics import DAY_SECONDS, topic_analytics
+from attempt_log import INITIAL_CAPACITY, AttemptLog
+
+NOW = 1_700_000_000.0
+CAPACITORS = "physics/electrostatics/capacitors"
+FIELD = "physics/electrostatics/electric-field"
+OPTICS = "physics/ray-optics"
+
+
+def _days_ago(days):
+    return NOW - days * DAY_SECONDS
+
+
+def test_chunks_round_trip_and_merge_topic_codes():
+    first, second = AttemptLog(), AttemptLog()
+    first.extend([CAPACITORS, OPTICS], [True, False], "JEE Mains", "quiz", timestamp=_days_ago(3))
+    second.extend([OPTICS, FIELD, CAPACITORS], [True, True, False], "", "pdf", timestamp=_days_ago(1))
+    second.append(OPTICS, False, weight=-1, timestamp=_days_ago(1))
+
+    restored = AttemptLog.from_chunks([first.to_chunk(), second.to_chunk()])
+    merged = AttemptLog()
+    merged.merge(first)
+    merged.merge(second)
+    assert len(restored) == len(merged) == 6
+    assert restored.topics == merged.topics == [CAPACITORS, OPTICS, FIELD]
+    for name in ("timestamp", "topic", "correct", "difficulty", "source", "weight"):
+        assert np.array_equal(restored.column(name), merged.column(name))
+    assert [restored.topics[code] for code in restored.column("topic")] == [CAPACITORS, OPTICS, OPTICS, FIELD, CAPACITORS, OPTICS]
+    assert restored.column("weight").tolist() == [1, 1, 1, 1, 1, -1]
+
+
+def test_columns_grow_past_the_initial_capacity_and_are_read_only():
+    log = AttemptLog()
+    for n in range(INITIAL_CAPACITY * 2 + 3):
+        log.append(OPTICS if n % 2 else FIELD, n % 3 == 0, timestamp=float(n))
+    assert len(log) == INITIAL_CAPACITY * 2 + 3
+    assert log.column("timestamp")[-1] == INITIAL_CAPACITY * 2 + 2
+    with pytest.raises(ValueError):
+        log.column("correct")[0] = 1
+
+
+def test_per_topic_accuracy_counts_taken_back_attempts():
+    log = AttemptLog()
+    log.extend([CAPACITORS] * 4, [True, True, True, False], timestamp=_days_ago(1))
+    log.extend([FIELD] * 2, [False, False], timestamp=_days_ago(20))
+    log.extend([FIELD], [False], timestamp=_days_ago(20), weight=-1) # A revised test took one back
+    stats = topic_analytics(log, now=NOW, rollup=False)
+    assert set(stats) == {CAPACITORS, FIELD}
+    assert stats[CAPACITORS]["attempts"] == 4 and stats[CAPACITORS]["accuracy"] == 0.75
+    assert stats[FIELD]["attempts"] == 1 and stats[FIELD]["accuracy"] == 0
+    assert stats[FIELD]["recent_attempts"] == 0 and math.isnan(stats[FIELD]["recent_accuracy"])
+    assert stats[CAPACITORS]["weakness"] < stats[FIELD]["weakness"]
+    assert stats[CAPACITORS]["accuracy_percentile"] == 50 and stats[FIELD]["accuracy_percentile"] == 0
+
+
+def test_recent_window_and_trend():
+    log = AttemptLog()
+    log.extend([OPTICS] * 4, [False, False, False, True], timestamp=_days_ago(20)) # Previous window: 25%
+    log.extend([OPTICS] * 2, [True, True], timestamp=_days_ago(2)) # Recent window: 100%
+    stats = topic_analytics(log, now=NOW, rollup=False)[OPTICS]
+    assert stats["recent_attempts"] == 2 and stats["recent_accuracy"] == 1
+    assert stats["trend"] == pytest.approx(0.75)
+    assert stats["accuracy"] == pytest.approx(0.5)
+    assert stats["decayed_accuracy"] > stats["accuracy"] # Recent answers count for more
+
+
+def test_rollup_adds_subtopics_into_their_chapter_and_subject():
+    log = AttemptLog()
+    log.extend([CAPACITORS, CAPACITORS, FIELD, OPTICS], [True, False, True, False], timestamp=_days_ago(1))
+    stats = topic_analytics(log, now=NOW)
+    assert stats["physics/electrostatics"]["attempts"] == 3
+    assert stats["physics/electrostatics"]["accuracy"] == pytest.approx(2 / 3)
+    assert stats["physics"]["attempts"] == 4 and stats["physics"]["accuracy"] == 0.5
+    assert stats[CAPACITORS]["attempts"] == 2
+
+
+def test_empty_log_has_no_analytics():
+    assert topic_analytics(AttemptLog(), now=NOW) == {}
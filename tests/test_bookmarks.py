@@ -0,0 +1,46 @@
+from bookmarks import BookmarkStore
+from question_ids import question_id
+
+
+def _question(text):
+    return {"question": text, "answers": ["A", "B", "C", "D"], "correct_answer": "A"}
+
+
+SIMILAR_A = _question("A Carnot engine operates between two reservoirs. Which change increases its efficiency the most?")
+SIMILAR_B = _question("A Carnot engine works between two reservoirs. Which change increases its efficiency the most?")
+
+
+def test_similar_questions_are_bookmarked_separately():
+    store = BookmarkStore()
+    assert store.add(SIMILAR_A, "Thermodynamics", 3) == question_id(SIMILAR_A)
+    assert store.add(SIMILAR_B, "Thermodynamics", 4) == question_id(SIMILAR_B)
+    assert store.add(SIMILAR_A) is None # Exact repeat
+    assert len(store) == 2
+
+
+def test_remove_only_touches_the_exact_question():
+    store = BookmarkStore()
+    store.add(SIMILAR_A)
+    assert not store.remove(question_id(SIMILAR_B))
+    assert question_id(SIMILAR_A) in store
+    assert store.remove(question_id(SIMILAR_A))
+    assert len(store) == 0
+
+
+def test_pages_keep_bookmarking_order():
+    store = BookmarkStore()
+    questions = [_question(f"Question number {n}") for n in range(5)]
+    for question in questions:
+        store.add(question)
+    assert store.page_count(2) == 3
+    assert [entry["question"] for entry in store.page(1, 2)] == questions[2:4]
+    assert BookmarkStore().page_count(2) == 1
+
+
+def test_from_list_restores_saved_entries_as_they_were():
+    store = BookmarkStore()
+    store.add(SIMILAR_A, "Thermodynamics", 3)
+    store.add(SIMILAR_B, "Thermodynamics", 4)
+    restored = BookmarkStore.from_list(store.to_list())
+    assert restored.to_list() == store.to_list()
+    assert question_id(SIMILAR_B) in restored
@@ -0,0 +1,105 @@
+import threading
+
+import pytest
+
+import chat_context
+from chat_context import CHAT_CONTEXT_TURNS, CHAT_MAX_PENDING_TURNS, CHAT_SUMMARY_MAX_CHARS, ChatContext
+
+
+class _FakeGateway:
+    """Summariser that records what it was asked to fold in and can be held mid-call."""
+
+    def __init__(self):
+        self.prompts = []
+        self.release = threading.Event()
+        self.release.set()
+        self.started = threading.Event()
+        self.fail = False
+
+    def generate(self, prompt, **kwargs):
+        self.prompts.append(prompt)
+        self.started.set()
+        assert self.release.wait(5)
+        if self.fail:
+            raise RuntimeError("quota exceeded")
+        return f"summary {len(self.prompts)} " + "x" * CHAT_SUMMARY_MAX_CHARS
+
+
+@pytest.fixture
+def gateway(monkeypatch):
+    fake = _FakeGateway()
+    monkeypatch.setattr(chat_context, "get_gateway", lambda: fake)
+    return fake
+
+
+def _turn(n):
+    return f"question {n}", f"answer {n}"
+
+
+def _settle(context):
+    """Wait for compaction rounds, including ones started by a finishing round."""
+    future = context._compaction
+    while future is not None:
+        future.result(timeout=5)
+        future = context._compaction
+
+
+def test_window_keeps_the_last_turns_verbatim(gateway):
+    context = ChatContext()
+    assert context.context_text() == ""
+    for n in range(CHAT_CONTEXT_TURNS):
+        context.add_turn(*_turn(n))
+    assert context._compaction is None and gateway.prompts == []
+    text = context.context_text()
+    assert "Summary" not in text
+    assert all(f"Student: question {n}\nYou: answer {n}" in text for n in range(CHAT_CONTEXT_TURNS))
+
+
+def test_evicted_turns_are_compacted_into_a_capped_summary(gateway):
+    context = ChatContext()
+    for n in range(CHAT_CONTEXT_TURNS + 2):
+        context.add_turn(*_turn(n))
+    _settle(context)
+    assert "question 0" in gateway.prompts[0]
+    assert context.summary.startswith("summary ") and len(context.summary) == CHAT_SUMMARY_MAX_CHARS
+    text = context.context_text()
+    assert "question 0" not in text and "question 1" not in text
+    assert f"question {CHAT_CONTEXT_TURNS + 1}" in text
+    assert len(context._recent) == CHAT_CONTEXT_TURNS and context._pending == []
+
+
+def test_turn_added_during_compaction_is_kept_and_summarised_next(gateway):
+    context = ChatContext()
+    for n in range(CHAT_CONTEXT_TURNS):
+        context.add_turn(*_turn(n))
+    gateway.release.clear()
+    context.add_turn(*_turn(CHAT_CONTEXT_TURNS)) # Evicts turn 0 and starts a compaction
+    assert gateway.started.wait(5)
+    context.add_turn(*_turn(CHAT_CONTEXT_TURNS + 1)) # Evicts turn 1 while the summariser is busy
+    assert len(gateway.prompts) == 1 # Only one compaction in flight at a time
+    text = context.context_text()
+    assert "question 0" in text and "question 1" in text # Pending turns are still sent verbatim
+
+    gateway.release.set()
+    _settle(context)
+    assert len(gateway.prompts) == 2
+    assert "question 0" in gateway.prompts[0] and "question 1" not in gateway.prompts[0]
+    assert "question 1" in gateway.prompts[1] and "question 0" not in gateway.prompts[1]
+    assert "summary 1" in gateway.prompts[1] # The second round builds on the first summary
+    assert context._pending == [] and context.summary.startswith("summary 2")
+
+
+def test_failed_compaction_keeps_turns_pending_and_bounded(gateway):
+    context = ChatContext()
+    gateway.fail = True
+    for n in range(CHAT_CONTEXT_TURNS + CHAT_MAX_PENDING_TURNS + 3):
+        context.add_turn(*_turn(n))
+        _settle(context)
+    assert context.summary == ""
+    assert len(context._pending) == CHAT_MAX_PENDING_TURNS
+    assert "question 2" not in context.context_text() # The oldest waiting turns were forgotten
+
+    gateway.fail = False
+    context.add_turn(*_turn(99))
+    _settle(context)
+    assert context._pending == [] and context.summary.startswith("summary ")
@@ -0,0 +1,16 @@
+import concurrent.futures
+import time
+
+import chat_module
+
+
+def test_video_lookup_does_not_wait_on_its_own_pool(monkeypatch):
+    # With one pipeline thread, a task that queued its searches behind itself would never finish
+    monkeypatch.setattr(chat_module, "_chat_executor", concurrent.futures.ThreadPoolExecutor(max_workers=1))
+    monkeypatch.setattr(chat_module, "extract_weak_topics", lambda message: {"physics/ray-optics"})
+    monkeypatch.setattr(chat_module, "search_youtube_videos", lambda topic: [{"title": "Lenses", "url": "https://youtu.be/x"}])
+
+    future = chat_module._chat_executor.submit(chat_module._find_videos_for_message, "optics", time.monotonic() + 5)
+    topics, links = future.result(timeout=5)
+    assert topics == {"physics/ray-optics"}
+    assert links == {"physics/ray-optics": [{"title": "Lenses", "url": "https://youtu.be/x"}]}
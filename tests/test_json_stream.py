@@ -0,0 +1,70 @@
+import json
+
+import pytest
+
+from json_stream import JSONArrayStreamParser
+
+ELEMENTS = [
+    {"question": 'Which bracket closes "{[(" ?', "answers": ["}", "]", ")"], "correctAnswer": 1},
+    {"question": "A path like C:\\temp\\new and a quote \\\" inside", "explanation": {"detailed_steps": "v = u + at"}},
+    {"question": "Unicode: \u03bb = h/p, \u00e9t\u00e9", "answers": [], "nested": [[1, 2], {"a": "]"}]},
+]
+TEXT = "```json\n" + json.dumps(ELEMENTS, indent=2) + "\n```\nHope this helps!"
+
+
+def _feed_all(parser, chunks):
+    completed = []
+    for chunk in chunks:
+        completed += parser.feed(chunk)
+    return completed
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, len(TEXT)])
+def test_any_chunking_yields_every_element(size):
+    parser = JSONArrayStreamParser()
+    assert _feed_all(parser, [TEXT[i:i + size] for i in range(0, len(TEXT), size)]) == ELEMENTS
+    assert parser.done and parser.skipped == 0
+
+
+@pytest.mark.parametrize("marker", ['{"question":"Which', "\\\\temp", '\\"', "\\u03bb", '"nested":[[1,'])
+def test_split_inside_strings_escapes_and_objects(marker):
+    text = json.dumps(ELEMENTS, separators=(",", ":"))
+    split = text.index(marker) + len(marker) // 2
+    parser = JSONArrayStreamParser()
+    first = parser.feed(text[:split])
+    assert first == ELEMENTS[:len(first)]
+    assert first + parser.feed(text[split:]) == ELEMENTS
+
+
+def test_each_element_is_returned_as_soon_as_it_completes():
+    text = json.dumps(ELEMENTS)
+    parser = JSONArrayStreamParser()
+    end_of_first = len(json.dumps(ELEMENTS[0])) + 1
+    assert parser.feed(text[:end_of_first]) == ELEMENTS[:1]
+    assert parser.feed(text[end_of_first:]) == ELEMENTS[1:]
+
+
+def test_malformed_elements_are_skipped_and_counted():
+    parser = JSONArrayStreamParser()
+    completed = parser.feed('[{"a": 1}, {"b": 2,}, {"c": tru}, {"d": 4}]')
+    assert completed == [{"a": 1}, {"d": 4}]
+    assert parser.skipped == 2 and parser.done
+
+
+def test_truncated_input_returns_only_complete_elements():
+    text = json.dumps(ELEMENTS)
+    parser = JSONArrayStreamParser()
+    assert _feed_all(parser, [text[:len(text) - 10]]) == ELEMENTS[:2]
+    assert not parser.done
+
+
+def test_text_after_the_array_is_ignored():
+    parser = JSONArrayStreamParser()
+    assert parser.feed('[{"a": 1}] and then [{"b": 2}]') == [{"a": 1}]
+    assert parser.feed('{"c": 3}]') == [] and parser.done
+
+
+def test_no_array_yields_nothing():
+    parser = JSONArrayStreamParser()
+    assert _feed_all(parser, ["I could not generate ", "a quiz {for this} topic."]) == []
+    assert not parser.done
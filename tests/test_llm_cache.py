@@ -0,0 +1,86 @@
+import threading
+
+import pytest
+
+import llm_cache
+from llm_cache import LLMResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    return now
+
+
+def _cache(tmp_path, ttl_seconds=3600, max_bytes=1024):
+    return LLMResponseCache(str(tmp_path / "llm.sqlite3"), ttl_seconds, max_bytes)
+
+
+def test_entries_expire_after_the_ttl(tmp_path, clock):
+    cache = _cache(tmp_path, ttl_seconds=60)
+    cache.set("model", "prompt", None, "reply")
+    clock[0] += 59
+    assert cache.get("model", "prompt") == "reply"
+    clock[0] += 2
+    assert cache.get("model", "prompt") is None
+    cache.set("model", "other", None, "x") # Stores evict expired entries
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"]) == (1, 1, 1)
+    assert (stats["entries"], stats["bytes"]) == (1, 1)
+
+
+def test_least_recently_used_entries_are_evicted_over_the_byte_budget(tmp_path, clock):
+    cache = _cache(tmp_path, max_bytes=10)
+    for prompt in ("a", "b"):
+        cache.set("model", prompt, None, "1234")
+        clock[0] += 1
+    assert cache.get("model", "a") == "1234" # "b" is now the least recently used
+    clock[0] += 1
+    cache.set("model", "c", None, "1234")
+    assert cache.get("model", "b") is None
+    assert cache.get("model", "a") == "1234" and cache.get("model", "c") == "1234"
+    assert cache.stats()["bytes"] == 8
+
+
+def test_replacing_an_entry_keeps_the_byte_total(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set("model", "prompt", None, "12345678")
+    cache.set("model", "prompt", None, "1234")
+    assert cache.stats()["bytes"] == 4
+
+
+def test_lookups_are_written_in_batches(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set("model", "prompt", None, "reply")
+    other = _cache(tmp_path) # Another process's view of the same file
+    for _ in range(llm_cache.ACCESS_BATCH - 1):
+        cache.get("model", "prompt")
+    assert other.stats()["hits"] == 0
+    cache.get("model", "prompt")
+    assert other.stats()["hits"] == llm_cache.ACCESS_BATCH
+
+
+def test_threads_and_processes_can_share_the_cache(tmp_path):
+    caches = [_cache(tmp_path, max_bytes=10_000), _cache(tmp_path, max_bytes=10_000)]
+    errors = []
+
+    def worker(cache, worker_id):
+        try:
+            for n in range(50):
+                cache.set("model", f"{worker_id}-{n}", None, f"reply {worker_id}-{n}")
+                assert cache.get("model", f"{worker_id}-{n}") == f"reply {worker_id}-{n}"
+                cache.get("model", "never stored")
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(caches[i % 2], i)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    caches[1].stats() # Write the other cache's buffered lookups
+    stats = caches[0].stats()
+    assert (stats["entries"], stats["hits"], stats["misses"]) == (400, 400, 400)
+    assert stats["bytes"] == sum(len(f"reply {i}-{n}") for i in range(8) for n in range(50))
@@ -0,0 +1,26 @@
+from types import SimpleNamespace
+
+from llm_gateway import LLMGateway, TokenBucket
+
+
+class _FakeModel:
+    def generate_content(self, prompt, generation_config=None):
+        return SimpleNamespace(text=f"reply to {prompt}", usage_metadata=SimpleNamespace(prompt_token_count=3, candidates_token_count=5))
+
+
+def test_token_bucket_reports_time_spent_waiting():
+    bucket = TokenBucket(rate=50, capacity=1)
+    assert bucket.acquire() == 0
+    assert bucket.acquire() > 0
+
+
+def test_stats_count_rate_limit_waits():
+    gateway = LLMGateway()
+    gateway._bucket = TokenBucket(rate=50, capacity=1)
+    gateway.model = lambda model_name=None: _FakeModel()
+    assert gateway.generate("a", use_cache=False) == "reply to a"
+    gateway.generate("b", use_cache=False)
+    stats = gateway.stats()
+    assert stats["calls"] == 2 and stats["errors"] == 0
+    assert stats["throttled"] == 1 and stats["throttle_seconds"] > 0
+    assert stats["prompt_tokens"] == 6 and stats["output_tokens"] == 10
@@ -0,0 +1,74 @@
+from near_duplicates import LSHIndex, estimated_similarity, question_signature, unique_questions
+from question_ids import question_id
+
+
+def _question(text, answers):
+    return {"question": text, "answers": answers, "correct_answer": answers[0]}
+
+
+FRICTION_A = _question(
+    "A block of mass 2 kg rests on a rough horizontal surface with coefficient of friction 0.3. "
+    "A horizontal force of 10 N is applied. Find the acceleration of the block (g = 9.8 m/s^2).",
+    ["2.06 m/s^2", "3.5 m/s^2", "5 m/s^2", "0 m/s^2"],
+)
+FRICTION_B = _question(
+    "A block of mass 5 kg rests on a rough horizontal surface with coefficient of friction 0.2. "
+    "A horizontal force of 20 N is applied. Find the acceleration of the block (g = 9.8 m/s^2).",
+    ["2.04 m/s^2", "4 m/s^2", "1.5 m/s^2", "0 m/s^2"],
+)
+CARNOT_A = _question(
+    "A Carnot engine operates between 500 K and 300 K. What is its efficiency?",
+    ["40%", "60%", "25%", "50%"],
+)
+CARNOT_B = _question(
+    "A Carnot engine operates between 800 K and 400 K. What is its efficiency?",
+    ["50%", "40%", "25%", "75%"],
+)
+IUPAC_A = _question(
+    "What is the IUPAC name of the compound CH3CH(CH3)CH2CH3?",
+    ["2-methylbutane", "3-methylbutane", "pentane", "2-ethylpropane"],
+)
+IUPAC_B = _question(
+    "What is the IUPAC name of the compound CH3CH2CH(CH3)CH2CH3?",
+    ["3-methylpentane", "2-ethylbutane", "hexane", "3-ethylbutane"],
+)
+PROJECTILES = [
+    _question(f"A ball is projected at {angle} degrees with a speed of {speed} m/s. Find its maximum height.",
+              [f"{height} m", "10 m", "20 m", "40 m"])
+    for angle, speed, height in ((30, 20, 5.1), (45, 20, 10.2), (60, 30, 34.4))
+]
+
+
+def test_question_id_ignores_case_punctuation_and_spacing():
+    reformatted = _question(FRICTION_A["question"].upper().replace(".", " . "), FRICTION_A["answers"])
+    assert question_id(reformatted) == question_id(FRICTION_A)
+    assert question_id(FRICTION_B) != question_id(FRICTION_A)
+
+
+def test_questions_differing_only_in_values_are_distinct():
+    for a, b in ((FRICTION_A, FRICTION_B), (CARNOT_A, CARNOT_B), (IUPAC_A, IUPAC_B)):
+        assert estimated_similarity(question_signature(a), question_signature(b)) == 0.0
+    questions = [FRICTION_A, FRICTION_B, CARNOT_A, CARNOT_B, IUPAC_A, IUPAC_B]
+    assert unique_questions(questions) == questions
+    assert unique_questions(PROJECTILES) == PROJECTILES
+
+
+def test_reworded_copy_with_same_values_is_a_duplicate():
+    reworded = _question(
+        "A Carnot engine works between 500 K and 300 K. What is its efficiency?",
+        ["40%", "60%", "25%", "50%"],
+    )
+    assert estimated_similarity(question_signature(CARNOT_A), question_signature(reworded)) >= 0.85
+    assert unique_questions([CARNOT_A, reworded, CARNOT_B]) == [CARNOT_A, CARNOT_B]
+
+
+def test_index_insert_remove_and_find():
+    index = LSHIndex()
+    index.insert("a", question_signature(CARNOT_A))
+    assert index.find_duplicate(question_signature(CARNOT_A)) == "a"
+    assert index.find_duplicate(question_signature(CARNOT_B)) is None
+    assert index.add_if_new("b", question_signature(CARNOT_B)) is None
+    assert len(index) == 2
+    index.remove("a")
+    assert "a" not in index
+    assert index.find_duplicate(question_signature(CARNOT_A)) is None
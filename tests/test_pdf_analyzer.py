@@ -0,0 +1,60 @@
+import pytest
+import streamlit as st
+
+from pdf_analyzer_module import _find_previous_version, _replace_previous_version, page_fingerprint, review_question
+
+
+def _entry(question, student_answer, correct_answer="B"):
+    return {"question": question, "student_answer": student_answer, "correct_answer": correct_answer}
+
+
+def test_review_question_offers_the_key_and_the_students_answer():
+    question = review_question(_entry("Find the escape velocity from the Earth's surface.", "A"))
+    assert question["answers"] == ["A", "B"]
+    assert question["answers"][question["correctAnswer"]] == "B"
+
+
+@pytest.mark.parametrize("entry", [
+    _entry("Question 12", "A"), # Score-table row without the question's text
+    _entry("Q. 3", "A"),
+    _entry("", "A"),
+    _entry("Find the escape velocity from the Earth's surface.", "Not attempted"),
+    _entry("Find the escape velocity from the Earth's surface.", "--"),
+    _entry("Find the escape velocity from the Earth's surface.", "B"), # Answered correctly
+])
+def test_review_question_skips_entries_without_a_real_question_or_answer(entry):
+    assert review_question(entry) is None
+
+
+def _test_pages(version):
+    # A cover page, then ten question pages of which the last one changes between versions
+    pages = ["JEE Main mock test. Read the instructions carefully."]
+    pages += [f"Q{n}. A question about page {n} of the paper." for n in range(1, 10)]
+    pages.append(f"Q10. The final question, revision {version}.")
+    return pages
+
+
+def _store(doc_hash, pages):
+    fingerprints = [page_fingerprint(page) for page in pages]
+    st.session_state.pdf_analyses[doc_hash] = {"fingerprints": fingerprints, "chunks": {}, "result": {}, "lineage": doc_hash}
+    return st.session_state.pdf_analyses[doc_hash]
+
+
+def test_each_revision_in_a_row_replaces_the_one_before(monkeypatch):
+    monkeypatch.setattr(st.session_state, "pdf_analyses", {}, raising=False)
+    latest = _store("v1", _test_pages(1))
+    for version in (2, 3, 4):
+        pages = _test_pages(version)
+        previous = _find_previous_version(pages, [page_fingerprint(page) for page in pages])
+        assert previous is latest
+        new = _store(f"v{version}", pages)
+        _replace_previous_version(new, previous)
+        latest = new
+    assert [stored.get("superseded", False) for stored in st.session_state.pdf_analyses.values()] == [True, True, True, False]
+
+
+def test_another_test_is_not_a_revision(monkeypatch):
+    monkeypatch.setattr(st.session_state, "pdf_analyses", {}, raising=False)
+    _store("v1", _test_pages(1))
+    other = [page.replace("question", "problem") for page in _test_pages(1)]
+    assert _find_previous_version(other, [page_fingerprint(page) for page in other]) is None
@@ -0,0 +1,16 @@
+from profile_store import ProfileStore, SQLiteProfileBackend
+
+
+def _store(tmp_path):
+    return ProfileStore(SQLiteProfileBackend(str(tmp_path / "profiles.sqlite3")), flush_interval=3600)
+
+
+def test_delete_only_removes_one_profile(tmp_path):
+    store = _store(tmp_path)
+    store.add_counters("id-1", {"total_questions_solved": 3})
+    store.add_counters("id-2", {"total_questions_solved": 7})
+    store.flush()
+    store.delete("id-1")
+    assert store.load("id-1")["counters"] == {}
+    assert store.load("id-2")["counters"] == {"total_questions_solved": 7}
+    store.close()
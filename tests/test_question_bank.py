@@ -0,0 +1,48 @@
+import pytest
+
+from question_bank import QuestionBank
+
+
+def _question(text, answers=("A", "B", "C", "D")):
+    return {"question": text, "answers": list(answers), "correct_answer": answers[0]}
+
+
+@pytest.fixture
+def bank(tmp_path):
+    return QuestionBank(str(tmp_path / "bank.sqlite3"))
+
+
+def test_add_skips_exact_and_reworded_copies(bank):
+    original = _question("A Carnot engine operates between 500 K and 300 K. What is its efficiency?", ["40%", "60%", "25%", "50%"])
+    reworded = _question("A Carnot engine works between 500 K and 300 K. What is its efficiency?", ["40%", "60%", "25%", "50%"])
+    assert bank.add_questions([original], "Thermodynamics", "JEE Mains") == 1
+    assert bank.add_questions([original, reworded], "Thermodynamics", "JEE Mains") == 0
+
+
+def test_add_keeps_problems_that_differ_in_values(bank):
+    projectiles = [
+        _question(f"A ball is projected at {angle} degrees with a speed of {speed} m/s. Find its maximum height.")
+        for angle, speed in ((30, 20), (45, 20), (60, 30))
+    ]
+    assert bank.add_questions(projectiles, "Projectile Motion", "JEE Mains") == 3
+    assert len(bank.find_questions("Projectile Motion", "JEE Mains", 10)) == 3
+
+
+def _fill(bank, topic, count, difficulty="JEE Mains"):
+    bank.add_questions([_question(f"{topic} question {n}: compute quantity {n}") for n in range(count)], topic, difficulty)
+
+
+def test_find_prefers_the_exact_topic_then_its_subtree(bank):
+    _fill(bank, "Rotational Motion", 2)
+    _fill(bank, "Rolling Motion", 3)
+    found = bank.find_questions("Rotational Motion", "JEE Mains", 4)
+    assert [q["question"].split(" question")[0] for q in found] == ["Rotational Motion"] * 2 + ["Rolling Motion"] * 2
+
+
+def test_find_never_fills_from_unrelated_topics_sharing_a_word(bank):
+    _fill(bank, "Projectile Motion", 3)
+    _fill(bank, "Simple Harmonic Motion", 3)
+    _fill(bank, "Moment of Inertia", 3, difficulty="JEE Advanced")
+    assert bank.find_questions("Rotational Motion", "JEE Mains", 5) == []
+    assert bank.find_questions("Rolling Motion", "JEE Mains", 5) == []
+
@@ -0,0 +1,102 @@
+import itertools
+import json
+import threading
+import time
+
+import pytest
+
+import quiz_module
+from question_bank import QuestionBank
+
+
+class FakeGateway:
+    """Streams numbered questions, caching responses by prompt the way LLMGateway does."""
+
+    def __init__(self):
+        self.cache = {}
+        self.calls = []
+        self._numbers = itertools.count(1)
+
+    def stream(self, prompt, generation_config=None, use_cache=True, validate=None):
+        if use_cache and prompt in self.cache:
+            yield self.cache[prompt]
+            return
+        count = int(prompt.split("exactly ")[1].split()[0])
+        self.calls.append(count)
+        text = json.dumps([
+            {"question": f"Problem {next(self._numbers)}: find the work done by the force",
+             "answers": ["1 J", "2 J", "3 J", "4 J"], "correctAnswer": 0, "explanation": "W = F d"}
+            for _ in range(count)
+        ])
+        if use_cache:
+            self.cache[prompt] = text
+        yield text
+
+
+@pytest.fixture
+def gateway(tmp_path, monkeypatch):
+    bank = QuestionBank(str(tmp_path / "bank.sqlite3"))
+    fake = FakeGateway()
+    monkeypatch.setattr(quiz_module, "get_question_bank", lambda: bank)
+    monkeypatch.setattr(quiz_module, "get_gateway", lambda: fake)
+    return fake
+
+
+def test_bank_shortfall_is_generated_fresh(gateway):
+    first = list(quiz_module.banked_quiz_producer("Work Energy", "JEE Mains", 5, set()))
+    second = list(quiz_module.banked_quiz_producer("Work Energy", "JEE Mains", 10, set()))
+    assert len(first) == 5
+    assert len(second) == 10
+    assert gateway.calls == [5, 5]
+
+
+def test_top_up_prompt_lists_banked_questions():
+    banked = [{"question": "What is the SI unit of work?", "answers": ["J", "N", "W", "Pa"]}]
+    prompt = quiz_module._build_quiz_prompt("Work Energy", "JEE Mains", 4, set(), avoid=banked)
+    assert "What is the SI unit of work?" in prompt
+    assert prompt != quiz_module._build_quiz_prompt("Work Energy", "JEE Mains", 4, set())
+
+
+def test_closing_a_stream_stops_its_producer(monkeypatch):
+    monkeypatch.setattr(quiz_module, "prefetch_question_links", lambda text: {})
+    produced, closed = [], threading.Event()
+
+    def producer():
+        try:
+            for n in itertools.count():
+                time.sleep(0.01)
+                produced.append(n)
+                yield {"question": f"Question {n}"}
+        finally:
+            closed.set()
+
+    stream = quiz_module.QuizStream(1000).start(producer())
+    assert stream.wait_for(2, timeout=5)
+    stream.close()
+    assert closed.wait(timeout=5)
+    assert stream.wait_for(1000, timeout=5) is False and stream.done
+    assert len(stream.questions) < 1000
+
+
+def test_closing_a_sharded_quiz_stops_its_shards(monkeypatch):
+    running = []
+
+    def endless_shard(topic, difficulty, num_questions, weak_topics, sub_focus=None, avoid=()):
+        running.append(sub_focus)
+        try:
+            for n in itertools.count():
+                time.sleep(0.01)
+                yield {"question": f"{sub_focus}: question {n} about force {n}", "answers": ["A", "B"], "correctAnswer": 0}
+        finally:
+            running.remove(sub_focus)
+
+    monkeypatch.setattr(quiz_module, "stream_quiz_questions", endless_shard)
+    monkeypatch.setattr(quiz_module, "QUIZ_SHARD_SIZE", 1000) # Shards that would never finish on their own
+    quiz = quiz_module.generate_quiz_sharded("Laws of Motion", "JEE Mains", 3000, set())
+    next(quiz)
+    assert len(running) == 3
+    quiz.close()
+    deadline = time.monotonic() + 5
+    while running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert running == []
@@ -0,0 +1,86 @@
+from result_parser import answers_match, normalize_answer, parse_test_results
+
+LABELLED_SHEET = """
+Q1. A body is thrown vertically upward with speed 20 m/s. Find the maximum height.
+Your Answer: (B)
+Correct Answer: B
+Q2. Which of the following is an aromatic compound?
+Your Answer: --
+Correct Answer: C
+Q3. The value of the integral of x from 0 to 2 is
+Your Answer: 2
+Correct Answer: 2.0
+Q4. Find the pH of 0.01 M HCl.
+Your Answer: A
+Correct Answer: D
+"""
+
+SCORE_TABLE = """
+Candidate: A. Student            Test: Full Syllabus Mock 3
+Q.No | Your Answer | Correct Answer
+1 | B | B
+2 | C | A
+3 | -- | D
+4 | 4.5 | 4.5
+5 | A | A
+6 | D | B
+"""
+
+MATRIX_PAPER = """
+Section A: Mathematics
+Q1. Find the determinant of the matrix
+1 2 3
+4 5 6
+7 8 9
+Q2. If A is the matrix above, find the trace of A.
+"""
+
+PAPER_WITH_SOLUTIONS = """
+Q1. A ball is dropped from a height of 20 m. Find the time taken to reach the ground.
+(A) 1 s (B) 2 s (C) 3 s (D) 4 s
+Answer: B
+Solution: h = g t^2 / 2 gives t = 2 s.
+Q2. What is the hybridisation of carbon in methane?
+(A) sp (B) sp2 (C) sp3 (D) dsp2
+Answer: C
+Solution: Four sigma bonds, so sp3.
+Q3. The derivative of sin x is
+(A) cos x (B) -cos x (C) tan x (D) sec x
+Ans: A
+"""
+
+ARROW_SHEET = """
+-> Question 1: Unit of electric flux is
+-> Answer by student: (a)
+-> Correct answer: c
+"""
+
+
+def test_answers_are_compared_in_canonical_form():
+    assert normalize_answer("Option (B).") == "b"
+    assert answers_match("(b)", "B")
+    assert answers_match("2", "2.0")
+    assert not answers_match("--", "D")
+
+
+def test_labelled_sheet():
+    entries = parse_test_results(LABELLED_SHEET)
+    assert [entry["is_correct"] for entry in entries] == [True, False, True, False]
+    assert entries[1]["student_answer"] == "Not attempted"
+    assert entries[3]["question"] == "Find the pH of 0.01 M HCl."
+
+
+def test_score_table():
+    entries = parse_test_results(SCORE_TABLE)
+    assert [entry["question"] for entry in entries] == [f"Question {n}" for n in range(1, 7)]
+    assert sum(entry["is_correct"] for entry in entries) == 3
+
+
+def test_arrow_format():
+    entries = parse_test_results(ARROW_SHEET)
+    assert entries == [{"question": "Unit of electric flux is", "student_answer": "(a)", "correct_answer": "c", "is_correct": False}]
+
+
+def test_question_papers_are_not_result_sheets():
+    assert parse_test_results(MATRIX_PAPER) is None
+    assert parse_test_results(PAPER_WITH_SOLUTIONS) is None
@@ -0,0 +1,82 @@
+import pytest
+
+from review_scheduler import (DAY_SECONDS, DEFAULT_EASE, HEAP_SLACK, MIN_EASE, RELEARN_DELAY_SECONDS,
+                              ReviewScheduler)
+
+NOW = 1_700_000_000.0
+
+
+def _question(text):
+    return {"question": text, "answers": ["A", "B", "C", "D"], "correct_answer": "A"}
+
+
+def test_wrong_answer_schedules_a_quick_relearn():
+    scheduler = ReviewScheduler()
+    question = _question("What is the unit of capacitance?")
+    scheduler.review(question, "Capacitors", correct=True, now=NOW)
+    assert len(scheduler) == 0 # Correct answers alone never schedule a question
+    scheduler.review(question, "Capacitors", correct=False, now=NOW)
+    item = scheduler.to_list()[0]
+    assert item["due"] == NOW + RELEARN_DELAY_SECONDS
+    assert item["repetitions"] == 0 and item["interval_days"] == 0
+    assert item["ease"] == pytest.approx(DEFAULT_EASE - 0.54)
+
+
+def test_correct_answers_follow_sm2_intervals_and_ease():
+    scheduler = ReviewScheduler()
+    question = _question("State Gauss's law.")
+    scheduler.add(question, "Electrostatics", due=NOW)
+    now = NOW
+    for expected_interval in (1.0, 6.0, 15.0, 37.5):
+        scheduler.review(question, "Electrostatics", correct=True, now=now)
+        item = scheduler.to_list()[0]
+        assert item["interval_days"] == expected_interval
+        assert item["ease"] == pytest.approx(DEFAULT_EASE) # Quality 4 leaves the ease unchanged
+        assert item["due"] == now + expected_interval * DAY_SECONDS
+        now = item["due"]
+
+    scheduler.review(question, "Electrostatics", correct=False, now=now)
+    item = scheduler.to_list()[0]
+    assert item["repetitions"] == 0 and item["due"] == now + RELEARN_DELAY_SECONDS
+
+
+def test_ease_never_drops_below_the_minimum():
+    scheduler = ReviewScheduler()
+    question = _question("Define self inductance.")
+    for n in range(10):
+        scheduler.review(question, "Inductance", correct=False, now=NOW + n)
+    assert scheduler.to_list()[0]["ease"] == MIN_EASE
+
+
+def test_next_due_orders_by_due_time_and_keeps_items_scheduled():
+    scheduler = ReviewScheduler()
+    questions = [_question(f"Question {n}") for n in range(4)]
+    for question, offset in zip(questions, (300, 100, 200, 5000)):
+        scheduler.add(question, "Optics", due=NOW + offset)
+    assert scheduler.due_count(now=NOW + 1000) == 3
+    due = scheduler.next_due(10, now=NOW + 1000)
+    assert [item["question"] for item in due] == [questions[1], questions[2], questions[0]]
+    assert [item["question"] for item in scheduler.next_due(2, now=NOW + 1000)] == [questions[1], questions[2]]
+
+    scheduler.review(questions[1], "Optics", correct=True, now=NOW + 1000) # Moves a day out
+    assert [item["question"] for item in scheduler.next_due(10, now=NOW + 1000)] == [questions[2], questions[0]]
+    assert scheduler.due_count(now=NOW + 1000) == 2
+
+
+def test_rescheduling_many_times_keeps_the_heap_bounded():
+    scheduler = ReviewScheduler()
+    question = _question("Find the focal length of the lens.")
+    for n in range(HEAP_SLACK * 4):
+        scheduler.review(question, "Optics", correct=n % 2 == 0, now=NOW + n)
+    assert len(scheduler._heap) <= 2 * len(scheduler) + HEAP_SLACK + 1
+    assert len(scheduler.next_due(10, now=NOW + DAY_SECONDS * 10)) == 1
+
+
+def test_from_list_restores_the_schedule():
+    scheduler = ReviewScheduler()
+    first, second = _question("First"), _question("Second")
+    scheduler.add(first, "Optics", due=NOW + 50)
+    scheduler.add(second, "Optics", due=NOW + 10)
+    restored = ReviewScheduler.from_list(scheduler.to_list())
+    assert first in restored and second in restored
+    assert [item["question"] for item in restored.next_due(5, now=NOW + 100)] == [second, first]
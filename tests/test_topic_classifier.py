@@ -0,0 +1,24 @@
+import pytest
+
+from topic_classifier import get_topic_classifier
+
+
+@pytest.mark.parametrize("message, topic_id", [
+    ("I'm struggling with rotational motion and torque", "physics/rotational-motion/torque"),
+    ("tests for anions", "inorganic-chemistry/qualitative-analysis/tests-for-anions"),
+    ("my physics score dropped in electrostatics", "physics/electrostatics"),
+])
+def test_tag_answers_syllabus_messages_locally(message, topic_id):
+    def fallback(_):
+        raise AssertionError("should not fall back")
+
+    assert topic_id in get_topic_classifier().tag(message, fallback)
+
+
+@pytest.mark.parametrize("message", ["My mock test score dropped", "How do I improve my marks in the exam?"])
+def test_exam_talk_falls_back_to_the_llm(message):
+    classifier = get_topic_classifier()
+    assert classifier.classify(message).confidence == 0
+    before = classifier.stats()["fallbacks"]
+    assert classifier.tag(message, lambda _: {"custom/llm"}) == {"custom/llm"}
+    assert classifier.stats()["fallbacks"] == before + 1
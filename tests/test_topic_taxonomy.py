@@ -0,0 +1,37 @@
+import pytest
+
+from topic_taxonomy import canonical_topic, match_topic, topic_label, topic_name
+
+
+@pytest.mark.parametrize("text, topic_id", [
+    ("Thermodynamics", "physics/thermodynamics"),
+    ("thermo", "physics/thermodynamics"),
+    ("Thermodynamics numericals", "physics/thermodynamics"),
+    ("organic chemistry nomenclature", "organic-chemistry/general-organic-chemistry/iupac-nomenclature"),
+    ("Newton's laws", "physics/laws-of-motion/newtons-laws-of-motion"),
+    ("electrostat", "physics/electrostatics"), # Prefix spelling out most of the name
+    ("thermodynamcis", "physics/thermodynamics"), # Misspellings
+    ("gravitaton", "physics/gravitation"),
+    ("electric feild", "physics/electrostatics/electric-field"),
+    ("Simple harmonic motoin", "physics/oscillations-and-waves/simple-harmonic-motion"),
+])
+def test_match_topic(text, topic_id):
+    assert match_topic(text) == topic_id
+
+
+@pytest.mark.parametrize("text", ["Mechanics", "Algebra", "waves", "Geometry", "General", "biology"])
+def test_partial_or_ambiguous_names_do_not_match(text):
+    assert match_topic(text) is None
+
+
+def test_canonical_topic_falls_back_to_a_custom_id():
+    assert canonical_topic("General") == "custom/general"
+    assert canonical_topic("Waves") == "custom/waves"
+    assert canonical_topic("custom/waves") == "custom/waves"
+    assert canonical_topic("physics/thermodynamics") == "physics/thermodynamics"
+    assert topic_name("custom/fluid-mechanics") == "Fluid Mechanics"
+
+
+def test_topic_label_and_name():
+    assert topic_name("physics/thermodynamics/carnot-engine") == "Carnot Engine"
+    assert topic_label("physics/thermodynamics/carnot-engine") == "Thermodynamics Carnot Engine"
@@ -0,0 +1,156 @@
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from config import TOPIC_CLASSIFIER_MIN_CONFIDENCE
+from topic_taxonomy import Topic, all_topics, topic_aliases
+
+# Function words, chat filler and exam talk ("my mock test score dropped") that never identify a topic
+_STOP_WORDS = {"a", "an", "the", "and", "or", "of", "in", "on", "to", "for", "with", "by", "at", "from", "into", "under",
+               "between", "about", "is", "am", "are", "was", "be", "it", "its", "this", "that", "i", "im", "me", "my", "we", "you",
+               "do", "dont", "does", "not", "how", "what", "why", "when", "which", "can", "cant", "please", "help", "some",
+               "jee", "main", "mains", "advanced", "topic", "chapter", "question", "questions", "problem", "problems",
+               "test", "tests", "mock", "mocks", "exam", "exams", "paper", "papers", "score", "scores", "scored", "marks",
+               "result", "results", "rank", "percentile"}
+
+SUBTOPIC_NAME_WEIGHT = 3 # Term frequency given to a subtopic's own name in its document, vs 1 for its chapter's name
+RELATED_TOPIC_RATIO = 0.6 # Further topics are reported if they score at least this share of the best one
+MAX_TOPICS_PER_MESSAGE = 3
+
+
+class TopicPrediction(NamedTuple):
+    topics: Set[str] # Canonical topic ids
+    confidence: float # Cosine similarity of the best topic, 0 when the message has no syllabus vocabulary
+
+
+def _stem(word: str) -> str:
+    """Crude plural strip so "lenses", "capacitors" and "alkenes" meet their syllabus names."""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies"):
+        return word[:-3] + "y"
+    if word.endswith("es") and word[:-2].endswith(("s", "x", "ch", "sh")):
+        word = word[:-2] # "lenses" -> "lens", then on to "len" like the singular
+    if word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+
+def _terms(text: str) -> List[str]:
+    """Stemmed unigrams plus adjacent-word bigrams ("electric field" is not "magnetic field")."""
+    text = text.lower().replace("'", "").replace("’", "")
+    words = [_stem(word) for word in re.findall(r"[a-z0-9]+", text) if word not in _STOP_WORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+class TopicClassifier:
+    """
+    TF-IDF nearest-topic classifier over the JEE syllabus.
+
+    Every chapter and subtopic gets a short document made of its own name, its parents' names and
+    its aliases. Document vectors are computed once and kept in an inverted index (term -> [(topic, weight)]),
+    so scoring a message only touches the postings of the syllabus terms it contains: a few dict
+    lookups, well under a millisecond. Words outside the syllabus vocabulary are ignored, and a
+    message without any scores zero confidence.
+    """
+
+    def __init__(self, topics: List[Topic]):
+        documents: Dict[str, Dict[str, int]] = {}
+        for topic in topics:
+            counts: Dict[str, int] = defaultdict(int)
+            weighted_names = [(topic.subject, 1)]
+            if topic.chapter:
+                weighted_names.append((topic.chapter, 1 if topic.subtopic else SUBTOPIC_NAME_WEIGHT))
+            if topic.subtopic:
+                weighted_names.append((topic.subtopic, SUBTOPIC_NAME_WEIGHT))
+            weighted_names.extend((alias, SUBTOPIC_NAME_WEIGHT) for alias in topic_aliases(topic.id))
+            for name, weight in weighted_names:
+                for term in _terms(name):
+                    counts[term] += weight
+            documents[topic.id] = counts
+
+        document_frequency: Dict[str, int] = defaultdict(int)
+        for counts in documents.values():
+            for term in counts:
+                document_frequency[term] += 1
+        self.idf = {term: math.log((1 + len(documents)) / (1 + df)) + 1 for term, df in document_frequency.items()}
+
+        self.postings: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+        for topic_id, counts in documents.items():
+            weights = {term: count * self.idf[term] for term, count in counts.items()}
+            norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+            for term, weight in weights.items():
+                self.postings[term].append((topic_id, weight / norm))
+
+        self._stats_lock = threading.Lock()
+        self._counters = {"messages": 0, "local": 0, "fallbacks": 0, "fallback_errors": 0}
+
+    def classify(self, message: str) -> TopicPrediction:
+        """Best matching topics for a message and the cosine score of the best one."""
+        query: Dict[str, float] = defaultdict(float)
+        for term in _terms(message):
+            if term in self.idf:
+                query[term] += self.idf[term]
+        if not query:
+            return TopicPrediction(set(), 0.0)
+        norm = math.sqrt(sum(weight * weight for weight in query.values()))
+
+        scores: Dict[str, float] = defaultdict(float)
+        for term, weight in query.items():
+            for topic_id, topic_weight in self.postings[term]:
+                scores[topic_id] += weight / norm * topic_weight
+        ranked = sorted(scores.items(), key=lambda item: -item[1])
+        best_score = ranked[0][1]
+
+        # A topic nested in (or containing) a better-scoring pick adds nothing, so take distinct branches only
+        chosen: List[str] = []
+        for topic_id, score in ranked:
+            if len(chosen) == MAX_TOPICS_PER_MESSAGE or score < best_score * RELATED_TOPIC_RATIO:
+                break
+            if not any(topic_id.startswith(other + "/") or other.startswith(topic_id + "/") for other in chosen):
+                chosen.append(topic_id)
+        return TopicPrediction(set(chosen), best_score)
+
+    def tag(self, message: str, fallback: Callable[[str], Set[str]],
+            min_confidence: float = TOPIC_CLASSIFIER_MIN_CONFIDENCE) -> Set[str]:
+        """
+        Topic ids for a message from the local classifier, or from `fallback` (the LLM) when the
+        classifier's confidence is below `min_confidence`. Errors from the fallback propagate.
+        """
+        prediction = self.classify(message)
+        use_local = prediction.confidence >= min_confidence
+        self._count("messages", "local" if use_local else "fallbacks")
+        if use_local:
+            return prediction.topics
+        try:
+            return fallback(message)
+        except Exception:
+            self._count("fallback_errors")
+            raise
+
+    def _count(self, *names: str):
+        with self._stats_lock:
+            for name in names:
+                self._counters[name] += 1
+
+    def stats(self) -> Dict[str, float]:
+        """Message counts by path taken, plus the share of messages that fell back to the LLM."""
+        with self._stats_lock:
+            summary = dict(self._counters)
+        summary["fallback_rate"] = summary["fallbacks"] / summary["messages"] if summary["messages"] else 0.0
+        return summary
+
+
+_classifier: Optional[TopicClassifier] = None
+_classifier_lock = threading.Lock()
+
+
+def get_topic_classifier() -> TopicClassifier:
+    """Return the process-wide topic classifier, building its vectors on first use."""
+    global _classifier
+    with _classifier_lock:
+        if _classifier is None:
+            _classifier = TopicClassifier(all_topics())
+        return _classifier
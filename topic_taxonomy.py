@@ -0,0 +1,409 @@
+import re
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+
+# JEE syllabus: subject -> chapter -> subtopics. Chemistry is split the way it is taught for JEE.
+SYLLABUS: Dict[str, Dict[str, List[str]]] = {
+    "Physics": {
+        "Units and Measurements": ["Dimensional Analysis", "Errors in Measurement", "Significant Figures"],
+        "Kinematics": ["Motion in a Straight Line", "Projectile Motion", "Relative Velocity", "Circular Motion"],
+        "Laws of Motion": ["Newton's Laws of Motion", "Friction", "Pulleys and Constraints", "Dynamics of Circular Motion"],
+        "Work, Energy and Power": ["Work Energy Theorem", "Conservation of Mechanical Energy", "Collisions", "Power"],
+        "Rotational Motion": ["Centre of Mass", "Moment of Inertia", "Torque", "Angular Momentum", "Rolling Motion"],
+        "Gravitation": ["Kepler's Laws", "Gravitational Potential", "Escape Velocity", "Satellite Motion"],
+        "Properties of Solids and Liquids": ["Elasticity", "Fluid Pressure", "Bernoulli's Theorem", "Viscosity", "Surface Tension",
+                                             "Thermal Expansion", "Calorimetry", "Heat Transfer"],
+        "Thermodynamics": ["Laws of Thermodynamics", "Thermodynamic Processes", "Carnot Engine", "Heat Engines and Refrigerators"],
+        "Kinetic Theory of Gases": ["Ideal Gas Equation", "Degrees of Freedom", "Mean Free Path", "RMS Speed"],
+        "Oscillations and Waves": ["Simple Harmonic Motion", "Simple Pendulum", "Spring Mass System", "Wave Motion",
+                                   "Standing Waves", "Doppler Effect", "Beats", "Sound Waves"],
+        "Electrostatics": ["Coulomb's Law", "Electric Field", "Gauss's Law", "Electric Potential", "Capacitors", "Dielectrics"],
+        "Current Electricity": ["Ohm's Law", "Kirchhoff's Laws", "Wheatstone Bridge", "Potentiometer", "Meter Bridge", "Resistivity"],
+        "Magnetic Effects of Current and Magnetism": ["Biot-Savart Law", "Ampere's Law", "Lorentz Force", "Moving Coil Galvanometer",
+                                                     "Magnetic Materials", "Earth's Magnetism"],
+        "Electromagnetic Induction and Alternating Currents": ["Faraday's Law", "Lenz's Law", "Self Inductance", "Mutual Inductance",
+                                                               "AC Circuits", "LCR Circuit", "Resonance", "Transformers"],
+        "Electromagnetic Waves": ["Electromagnetic Spectrum", "Displacement Current"],
+        "Ray Optics": ["Reflection", "Refraction", "Lenses", "Prisms", "Total Internal Reflection", "Optical Instruments"],
+        "Wave Optics": ["Interference", "Young's Double Slit Experiment", "Diffraction", "Polarisation"],
+        "Dual Nature of Matter and Radiation": ["Photoelectric Effect", "De Broglie Wavelength", "Davisson Germer Experiment"],
+        "Atoms and Nuclei": ["Bohr Model", "Hydrogen Spectrum", "Radioactivity", "Nuclear Fission", "Nuclear Fusion",
+                             "Mass Defect and Binding Energy"],
+        "Electronic Devices": ["Semiconductors", "P-N Junction Diode", "Zener Diode", "Transistors", "Logic Gates"],
+        "Experimental Physics": ["Vernier Callipers", "Screw Gauge", "Experimental Errors"],
+    },
+    "Physical Chemistry": {
+        "Some Basic Concepts of Chemistry": ["Mole Concept", "Stoichiometry", "Concentration Terms", "Empirical Formula"],
+        "Atomic Structure": ["Quantum Numbers", "Electronic Configuration", "Atomic Orbitals", "Bohr's Atomic Model"],
+        "States of Matter": ["Gas Laws", "Van der Waals Equation", "Solid State"],
+        "Chemical Thermodynamics": ["Enthalpy", "Hess's Law", "Entropy", "Gibbs Free Energy", "Thermochemistry"],
+        "Solutions": ["Colligative Properties", "Raoult's Law", "Osmotic Pressure", "Henry's Law"],
+        "Equilibrium": ["Chemical Equilibrium", "Ionic Equilibrium", "Le Chatelier's Principle", "pH", "Buffer Solutions",
+                        "Solubility Product"],
+        "Redox Reactions and Electrochemistry": ["Oxidation Number", "Balancing Redox Reactions", "Electrochemical Cells",
+                                                 "Nernst Equation", "Conductance", "Electrolysis"],
+        "Chemical Kinetics": ["Rate Law", "Order of Reaction", "Arrhenius Equation", "Half Life"],
+        "Surface Chemistry": ["Adsorption", "Catalysis", "Colloids"],
+    },
+    "Inorganic Chemistry": {
+        "Classification of Elements and Periodicity": ["Periodic Trends", "Ionisation Enthalpy", "Electron Gain Enthalpy", "Atomic Radius"],
+        "Chemical Bonding and Molecular Structure": ["VSEPR Theory", "Hybridisation", "Molecular Orbital Theory", "Hydrogen Bonding",
+                                                     "Ionic Bonding", "Dipole Moment"],
+        "s-Block Elements": ["Alkali Metals", "Alkaline Earth Metals"],
+        "p-Block Elements": ["Group 13 Elements", "Group 14 Elements", "Group 15 Elements", "Group 16 Elements",
+                             "Group 17 Elements", "Noble Gases"],
+        "d- and f-Block Elements": ["Transition Elements", "Lanthanoids", "Actinoids", "Potassium Dichromate", "Potassium Permanganate"],
+        "Coordination Compounds": ["Werner's Theory", "Nomenclature of Coordination Compounds", "Isomerism in Coordination Compounds",
+                                   "Crystal Field Theory", "Valence Bond Theory"],
+        "Metallurgy": ["Extraction of Metals", "Ellingham Diagram"],
+        "Qualitative Analysis": ["Salt Analysis", "Tests for Cations", "Tests for Anions"],
+    },
+    "Organic Chemistry": {
+        "Purification and Characterisation of Organic Compounds": ["Chromatography", "Distillation", "Detection of Elements",
+                                                                   "Quantitative Analysis"],
+        "General Organic Chemistry": ["IUPAC Nomenclature", "Isomerism", "Inductive Effect", "Resonance", "Hyperconjugation",
+                                      "Reaction Intermediates", "Acidity and Basicity"],
+        "Hydrocarbons": ["Alkanes", "Alkenes", "Alkynes", "Aromatic Hydrocarbons", "Conformations"],
+        "Haloalkanes and Haloarenes": ["SN1 Reaction", "SN2 Reaction", "Elimination Reactions"],
+        "Alcohols, Phenols and Ethers": ["Alcohols", "Phenols", "Ethers"],
+        "Aldehydes, Ketones and Carboxylic Acids": ["Nucleophilic Addition", "Aldol Condensation", "Cannizzaro Reaction",
+                                                    "Carboxylic Acids"],
+        "Amines": ["Diazonium Salts", "Basicity of Amines"],
+        "Biomolecules": ["Carbohydrates", "Proteins", "Vitamins", "Nucleic Acids"],
+        "Polymers": ["Addition Polymers", "Condensation Polymers"],
+        "Practical Organic Chemistry": ["Functional Group Tests", "Titration"],
+    },
+    "Mathematics": {
+        "Sets, Relations and Functions": ["Sets", "Relations", "Functions", "Domain and Range", "Inverse Functions",
+                                          "Composite Functions"],
+        "Complex Numbers": ["Argand Plane", "Modulus and Argument", "De Moivre's Theorem", "Cube Roots of Unity"],
+        "Quadratic Equations": ["Nature of Roots", "Relation between Roots and Coefficients", "Location of Roots"],
+        "Matrices and Determinants": ["Matrices", "Determinants", "Inverse of a Matrix", "System of Linear Equations", "Adjoint"],
+        "Permutations and Combinations": ["Permutations", "Combinations", "Circular Permutations"],
+        "Binomial Theorem": ["General Term", "Binomial Coefficients"],
+        "Sequences and Series": ["Arithmetic Progression", "Geometric Progression", "Harmonic Progression", "AM GM Inequality"],
+        "Limits, Continuity and Differentiability": ["Limits", "Continuity", "Differentiability", "L'Hopital's Rule"],
+        "Differentiation": ["Chain Rule", "Implicit Differentiation", "Derivatives of Inverse Trigonometric Functions"],
+        "Application of Derivatives": ["Rate of Change", "Tangents and Normals", "Maxima and Minima", "Monotonicity",
+                                       "Mean Value Theorem"],
+        "Integral Calculus": ["Indefinite Integrals", "Definite Integrals", "Integration by Parts", "Area under Curves"],
+        "Differential Equations": ["Variable Separable", "Linear Differential Equations", "Homogeneous Differential Equations"],
+        "Coordinate Geometry": ["Straight Lines", "Circles", "Parabola", "Ellipse", "Hyperbola"],
+        "Three Dimensional Geometry": ["Direction Cosines", "Lines in Space", "Planes", "Shortest Distance"],
+        "Vector Algebra": ["Dot Product", "Cross Product", "Scalar Triple Product"],
+        "Statistics": ["Mean and Median", "Variance and Standard Deviation"],
+        "Probability": ["Conditional Probability", "Bayes' Theorem", "Binomial Distribution", "Random Variables"],
+        "Trigonometry": ["Trigonometric Ratios", "Trigonometric Equations", "Inverse Trigonometric Functions",
+                         "Heights and Distances", "Properties of Triangles"],
+    },
+}
+
+# Abbreviations and everyday names students use, mapped to the node they mean (by display name path)
+ALIASES: Dict[str, Tuple[str, ...]] = {
+    "maths": ("Mathematics",),
+    "math": ("Mathematics",),
+    "thermo": ("Physics", "Thermodynamics"),
+    "projectile": ("Physics", "Kinematics", "Projectile Motion"),
+    "work energy": ("Physics", "Work, Energy and Power"),
+    "rotation": ("Physics", "Rotational Motion"),
+    "rotational": ("Physics", "Rotational Motion"),
+    "heat and thermodynamics": ("Physics", "Thermodynamics"),
+    "nlm": ("Physics", "Laws of Motion"),
+    "newtons laws": ("Physics", "Laws of Motion", "Newton's Laws of Motion"),
+    "wpe": ("Physics", "Work, Energy and Power"),
+    "shm": ("Physics", "Oscillations and Waves", "Simple Harmonic Motion"),
+    "fluids": ("Physics", "Properties of Solids and Liquids", "Fluid Pressure"),
+    "fluid mechanics": ("Physics", "Properties of Solids and Liquids", "Fluid Pressure"),
+    "ktg": ("Physics", "Kinetic Theory of Gases"),
+    "capacitance": ("Physics", "Electrostatics", "Capacitors"),
+    "magnetism": ("Physics", "Magnetic Effects of Current and Magnetism"),
+    "emi": ("Physics", "Electromagnetic Induction and Alternating Currents"),
+    "electromagnetic induction": ("Physics", "Electromagnetic Induction and Alternating Currents"),
+    "alternating current": ("Physics", "Electromagnetic Induction and Alternating Currents", "AC Circuits"),
+    "em waves": ("Physics", "Electromagnetic Waves"),
+    "optics": ("Physics", "Ray Optics"),
+    "ydse": ("Physics", "Wave Optics", "Young's Double Slit Experiment"),
+    "modern physics": ("Physics", "Atoms and Nuclei"),
+    "nuclear physics": ("Physics", "Atoms and Nuclei"),
+    "semiconductor devices": ("Physics", "Electronic Devices"),
+    "mole concept": ("Physical Chemistry", "Some Basic Concepts of Chemistry", "Mole Concept"),
+    "thermochemistry": ("Physical Chemistry", "Chemical Thermodynamics", "Thermochemistry"),
+    "electrochemistry": ("Physical Chemistry", "Redox Reactions and Electrochemistry"),
+    "electrochem": ("Physical Chemistry", "Redox Reactions and Electrochemistry"),
+    "physical chem": ("Physical Chemistry",),
+    "inorganic": ("Inorganic Chemistry",),
+    "organic": ("Organic Chemistry",),
+    "ionic equilibrium": ("Physical Chemistry", "Equilibrium", "Ionic Equilibrium"),
+    "kinetics": ("Physical Chemistry", "Chemical Kinetics"),
+    "periodic table": ("Inorganic Chemistry", "Classification of Elements and Periodicity"),
+    "periodicity": ("Inorganic Chemistry", "Classification of Elements and Periodicity"),
+    "chemical bonding": ("Inorganic Chemistry", "Chemical Bonding and Molecular Structure"),
+    "mot": ("Inorganic Chemistry", "Chemical Bonding and Molecular Structure", "Molecular Orbital Theory"),
+    "coordination chemistry": ("Inorganic Chemistry", "Coordination Compounds"),
+    "cft": ("Inorganic Chemistry", "Coordination Compounds", "Crystal Field Theory"),
+    "goc": ("Organic Chemistry", "General Organic Chemistry"),
+    "nomenclature": ("Organic Chemistry", "General Organic Chemistry", "IUPAC Nomenclature"),
+    "carbonyl compounds": ("Organic Chemistry", "Aldehydes, Ketones and Carboxylic Acids"),
+    "nitrogen compounds": ("Organic Chemistry", "Amines"),
+    "calculus": ("Mathematics", "Integral Calculus"),
+    "integration": ("Mathematics", "Integral Calculus"),
+    "aod": ("Mathematics", "Application of Derivatives"),
+    "conic sections": ("Mathematics", "Coordinate Geometry"),
+    "conics": ("Mathematics", "Coordinate Geometry"),
+    "3d geometry": ("Mathematics", "Three Dimensional Geometry"),
+    "vectors": ("Mathematics", "Vector Algebra"),
+    "p and c": ("Mathematics", "Permutations and Combinations"),
+    "pnc": ("Mathematics", "Permutations and Combinations"),
+    "progressions": ("Mathematics", "Sequences and Series"),
+    "trigo": ("Mathematics", "Trigonometry"),
+    "itf": ("Mathematics", "Trigonometry", "Inverse Trigonometric Functions"),
+}
+
+# Words that say how a topic is studied rather than what it is ("thermodynamics numericals")
+_NOISE_WORDS = {"jee", "main", "mains", "advanced", "adv", "topic", "topics", "chapter", "problems", "problem", "questions",
+                "question", "numericals", "numerical", "basics", "basic", "concepts", "concept", "theory", "pyqs", "pyq",
+                "revision", "in", "on", "for", "of", "the", "and", "a", "an"}
+
+CUSTOM_TOPIC_PREFIX = "custom/" # Ids of free-text topics that are not in the syllabus
+FUZZY_MAX_EDIT_RATIO = 0.2 # Edits allowed per character of the name for a misspelling ("gravitaton" -> "gravitation")
+PREFIX_MIN_CHARS = 4 # Shortest input that may match as a prefix
+PREFIX_MIN_COVERAGE = 0.8 # Share of the completed name a prefix must spell out ("electrostat" -> "electrostatics")
+MAX_NGRAM_WORDS = 6 # Longest word n-gram of the input looked up as a syllabus name
+
+
+class Topic(NamedTuple):
+    id: str
+    name: str
+    subject: str
+    chapter: Optional[str]
+    subtopic: Optional[str]
+
+
+def normalize_topic_text(text: str) -> str:
+    """Lowercase, drop apostrophes and punctuation, and spell "&" as "and"."""
+    text = str(text or "").lower().replace("&", " and ").replace("'", "").replace("’", "")
+    return " ".join(re.findall(r"[a-z0-9]+", text))
+
+
+def _match_key(text: str) -> str:
+    """Normalised text with a crude plural strip, applied alike to syllabus names and input ("compounds" ~ "compound")."""
+    return " ".join(word[:-1] if len(word) > 4 and word.endswith("s") and not word.endswith("ss") else word
+                    for word in normalize_topic_text(text).split())
+
+
+def _slug(name: str) -> str:
+    return normalize_topic_text(name).replace(" ", "-")
+
+
+def _trigrams(text: str) -> Set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a: str, b: str) -> int:
+    """Levenshtein distance, counting a swap of adjacent characters as one edit."""
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[len(b)]
+
+
+def _within(topic_id: str, root_id: str) -> bool:
+    return topic_id == root_id or topic_id.startswith(root_id + "/")
+
+
+class _TopicIndex:
+    """
+    Lookup structures over every syllabus name and alias, built once per process:
+    an exact name table (also used for word n-grams of the input), a character trie for prefixes,
+    and a trigram inverted index that finds candidate names for misspellings.
+    """
+
+    def __init__(self, syllabus: Dict[str, Dict[str, List[str]]], aliases: Dict[str, Tuple[str, ...]]):
+        self.topics: Dict[str, Topic] = {}
+        self.names: Dict[str, str] = {} # normalised name or alias -> topic id (first definition wins)
+        self.trie: dict = {}
+        self.trigram_index: Dict[str, Set[str]] = defaultdict(set)
+        self.aliases: Dict[str, List[str]] = defaultdict(list) # topic id -> aliases that point to it
+        by_path: Dict[Tuple[str, ...], str] = {}
+
+        for subject, chapters in syllabus.items():
+            subject_id = _slug(subject)
+            self._add(Topic(subject_id, subject, subject, None, None))
+            by_path[(subject,)] = subject_id
+            for chapter, subtopics in chapters.items():
+                chapter_id = f"{subject_id}/{_slug(chapter)}"
+                self._add(Topic(chapter_id, chapter, subject, chapter, None))
+                by_path[(subject, chapter)] = chapter_id
+                for subtopic in subtopics:
+                    subtopic_id = f"{chapter_id}/{_slug(subtopic)}"
+                    self._add(Topic(subtopic_id, subtopic, subject, chapter, subtopic))
+                    by_path[(subject, chapter, subtopic)] = subtopic_id
+
+        for alias, path in aliases.items():
+            self._add_name(_match_key(alias), by_path[path])
+            self.aliases[by_path[path]].append(alias)
+
+        for name in self.names:
+            for trigram in _trigrams(name):
+                self.trigram_index[trigram].add(name)
+
+    def _add(self, topic: Topic):
+        self.topics[topic.id] = topic
+        key = _match_key(topic.name)
+        self._add_name(key, topic.id)
+        # "Work, Energy and Power" is also found as "work energy power"
+        self._add_name(" ".join(w for w in key.split() if w not in _NOISE_WORDS), topic.id)
+
+    def _add_name(self, name: str, topic_id: str):
+        if not name or name in self.names:
+            return
+        self.names[name] = topic_id
+        node = self.trie
+        for char in name:
+            node = node.setdefault(char, {})
+            # Each prefix remembers the shortest name below it and every topic the names below it lead to
+            best = node.get("$best")
+            if best is None or len(name) < len(best):
+                node["$best"] = name
+            node.setdefault("$ids", set()).add(topic_id)
+
+    def exact(self, text: str) -> Optional[str]:
+        return self.names.get(text)
+
+    def ngram(self, text: str) -> Optional[str]:
+        """
+        Longest run of words in the text that is itself a syllabus name, narrowed to a more specific
+        topic under it if the text names one too ("organic chemistry nomenclature" -> IUPAC Nomenclature).
+        """
+        words = text.split()
+        matches = []
+        for size in range(min(MAX_NGRAM_WORDS, len(words)), 0, -1):
+            for start in range(len(words) - size + 1):
+                gram = " ".join(words[start:start + size])
+                if gram in self.names and gram not in _NOISE_WORDS and len(gram) > 2:
+                    matches.append(self.names[gram])
+        if not matches:
+            return None
+        best = matches[0]
+        for topic_id in matches[1:]:
+            if topic_id.startswith(best + "/"):
+                best = topic_id
+        return best
+
+    def prefix(self, text: str) -> Optional[str]:
+        """
+        The name the text is the start of, if it spells out nearly all of it and every name it could
+        complete to is that topic or below it ("wave" could be Wave Optics or Wave Motion: no match).
+        """
+        if len(text) < PREFIX_MIN_CHARS:
+            return None
+        node = self.trie
+        for char in text:
+            node = node.get(char)
+            if node is None:
+                return None
+        best = node["$best"]
+        topic_id = self.names[best]
+        if len(text) < PREFIX_MIN_COVERAGE * len(best) or not all(_within(other, topic_id) for other in node["$ids"]):
+            return None
+        return topic_id
+
+    def fuzzy(self, text: str) -> Optional[str]:
+        """
+        The name the text is a misspelling of: within FUZZY_MAX_EDIT_RATIO edits per character, with
+        no equally close name elsewhere in the syllabus. Candidates are names sharing a trigram.
+        """
+        candidates = set()
+        for trigram in _trigrams(text):
+            candidates |= self.trigram_index.get(trigram, set())
+        best_distance, best_ids = None, set()
+        for name in candidates:
+            allowed = int(FUZZY_MAX_EDIT_RATIO * len(name))
+            if abs(len(name) - len(text)) > allowed or (best_distance is not None and abs(len(name) - len(text)) > best_distance):
+                continue
+            distance = _edit_distance(text, name)
+            if distance > allowed or (best_distance is not None and distance > best_distance):
+                continue
+            if best_distance is None or distance < best_distance:
+                best_distance, best_ids = distance, set()
+            best_ids.add(self.names[name])
+        if not best_ids:
+            return None
+        root = min(best_ids, key=len)
+        return root if all(_within(topic_id, root) for topic_id in best_ids) else None
+
+
+_index = _TopicIndex(SYLLABUS, ALIASES)
+
+
+@lru_cache(maxsize=8192)
+def match_topic(text: str) -> Optional[str]:
+    """
+    Canonical syllabus id for free text, or None if nothing in the syllabus matches. Tries, in order:
+    exact name/alias, the same without noise words, the longest syllabus name inside the text,
+    an unambiguous prefix and a close misspelling. Results are memoised.
+    """
+    normalized = _match_key(text)
+    if not normalized:
+        return None
+    topic_id = _index.exact(normalized)
+    if topic_id:
+        return topic_id
+    core = " ".join(w for w in normalized.split() if w not in _NOISE_WORDS)
+    if not core:
+        return None
+    return _index.exact(core) or _index.ngram(core) or _index.prefix(core) or _index.fuzzy(core)
+
+
+def canonical_topic(text: str) -> str:
+    """
+    Canonical id for any topic text: the syllabus id when it matches ("Thermo", "thermodynamics " and
+    "Thermodynamcis" all give "physics/thermodynamics"), otherwise a stable "custom/<slug>" id.
+    Canonical ids map to themselves.
+    """
+    text = str(text or "").strip()
+    if text in _index.topics or text.startswith(CUSTOM_TOPIC_PREFIX):
+        return text
+    return match_topic(text) or CUSTOM_TOPIC_PREFIX + (_slug(text) or "general")
+
+
+def get_topic(topic_id: str) -> Optional[Topic]:
+    return _index.topics.get(topic_id)
+
+
+def all_topics() -> List[Topic]:
+    """Every syllabus node (subjects, chapters and subtopics) in syllabus order."""
+    return list(_index.topics.values())
+
+
+def topic_aliases(topic_id: str) -> List[str]:
+    return list(_index.aliases.get(topic_id, ()))
+
+
+def topic_name(topic_id: str) -> str:
+    """Display name for a topic id. Custom ids are turned back into words; anything else is shown as is."""
+    topic = _index.topics.get(topic_id)
+    if topic is not None:
+        return topic.name
+    if topic_id.startswith(CUSTOM_TOPIC_PREFIX):
+        return topic_id[len(CUSTOM_TOPIC_PREFIX):].replace("-", " ").title()
+    return topic_id
+
+
+def topic_label(topic_id: str) -> str:
+    """Chapter and subtopic names of a topic, as used in search queries ("Thermodynamics Carnot Engine")."""
+    topic = _index.topics.get(topic_id)
+    if topic is None:
+        return topic_name(topic_id)
+    return " ".join(part for part in (topic.chapter, topic.subtopic) if part) or topic.subject
+
+
+def topic_names(topic_ids) -> List[str]:
+    """Sorted display names for a collection of topic ids."""
+    return sorted(topic_name(topic_id) for topic_id in topic_ids)
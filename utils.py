@@ -1,45 +1,103 @@
 import streamlit as st
 import requests
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-from googlesearch import search
-import os
-from googleapiclient.discovery import build
+import time
+import threading
+import concurrent.futures
+from typing import Any, Dict, List, Optional
+from config import YOUTUBE_API_KEY, YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION
+from topic_taxonomy import canonical_topic, topic_label
 load_dotenv()
-YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY")
-YOUTUBE_API_SERVICE_NAME = "youtube"
-YOUTUBE_API_VERSION = "v3"
-youtube = build(YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=YOUTUBE_API_KEY)
 
+# YouTube Data API client, built on first use and shared by all sessions and threads in this process
+_youtube_client = None
+_youtube_client_lock = threading.Lock()
+_youtube_http = threading.local()
 
-@st.cache_data(ttl=3600)  # Cache results for 1 hour
-def get_youtube_links(topic: str, max_results=3):
-    """Search YouTube for educational content related to the topic."""
-    try:
-        search_response = youtube.search().list(
-            q=f"JEE {topic} tutorial",
-            part="id,snippet",
-            maxResults=max_results,
-            type="video",
-            relevanceLanguage="en",
-            safeSearch="strict"
-        ).execute()
+# Textual solution search
+SOLUTION_KEYWORDS = ("solution", "answer", "explanation", "jee")
+SOLUTION_FETCH_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+SOLUTION_FETCH_WORKERS = 8 # Max concurrent page fetches across all lookups in this process
+SOLUTION_FETCH_TIMEOUT = 7 # Per-page connect/read timeout in seconds
+SOLUTION_LOOKUP_DEADLINE = 15 # Overall budget in seconds for one question's lookup
 
-        videos = []
-        for item in search_response.get("items", []):
-            if item["id"]["kind"] == "youtube#video":
-                videos.append({
-                    "title": item["snippet"]["title"],
-                    "id": item["id"]["videoId"],
-                    "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}"
-                })
-        return videos
-    except Exception as e:
-        st.error(f"YouTube API Error: {str(e)}")
-        return []
+_http_session = None
+_http_session_lock = threading.Lock()
+_fetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=SOLUTION_FETCH_WORKERS, thread_name_prefix="solution-fetch")
+
+# Background prefetch of per-question solution links
+LINK_PREFETCH_WORKERS = 4 # Max questions being resolved at once across all sessions in this process
+_prefetch_executor = concurrent.futures.ThreadPoolExecutor(max_workers=LINK_PREFETCH_WORKERS, thread_name_prefix="link-prefetch")
+
+
+# bs4, googlesearch and googleapiclient are imported where they are used: they are slow to import
+# and most script runs never touch them.
+
+def _thread_http():
+    """This thread's httplib2 connection; httplib2.Http objects must not be shared between threads."""
+    http = getattr(_youtube_http, "http", None)
+    if http is None:
+        from googleapiclient.http import build_http
+        http = _youtube_http.http = build_http()
+    return http
+
+
+def _thread_local_request(http, *args, **kwargs):
+    """requestBuilder for the shared client: every request runs on the calling thread's own Http."""
+    from googleapiclient.http import HttpRequest
+    return HttpRequest(_thread_http(), *args, **kwargs)
+
+
+def get_youtube_client():
+    """
+    Return the process-wide YouTube client, building it on first use. The discovery document is read
+    from the copy bundled with google-api-python-client (static_discovery) instead of being fetched,
+    and requests are executed on per-thread Http objects, so the client is safe for concurrent searches.
+    """
+    global _youtube_client
+    with _youtube_client_lock:
+        if _youtube_client is None:
+            from googleapiclient.discovery import build
+            _youtube_client = build(
+                YOUTUBE_API_SERVICE_NAME, YOUTUBE_API_VERSION, developerKey=YOUTUBE_API_KEY,
+                static_discovery=True, cache_discovery=False, requestBuilder=_thread_local_request
+            )
+        return _youtube_client
+
+
+def search_youtube_videos(topic: str, max_results=3):
+    """
+    Search YouTube for educational content related to the topic. Free-text topics are mapped to their
+    canonical id first, so spelling variants of one topic share a single cached search.
+    Raises on API errors and never touches the UI, so it is safe to call from background threads.
+    """
+    return _search_topic_videos(canonical_topic(topic), max_results)
 
 
-@st.cache_data(ttl=3600)  # Cache results for 1 hour
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache results for 1 hour; also called from chat pipeline threads
+def _search_topic_videos(topic_id: str, max_results=3):
+    search_response = get_youtube_client().search().list(
+        q=f"JEE {topic_label(topic_id)} tutorial",
+        part="id,snippet",
+        maxResults=max_results,
+        type="video",
+        relevanceLanguage="en",
+        safeSearch="strict"
+    ).execute()
+
+    videos = []
+    for item in search_response.get("items", []):
+        if item["id"]["kind"] == "youtube#video":
+            videos.append({
+                "title": item["snippet"]["title"],
+                "id": item["id"]["videoId"],
+                "url": f"https://www.youtube.com/watch?v={item['id']['videoId']}"
+            })
+    return videos
+
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache results for 1 hour; also called from prefetch threads
 def get_youtube_solution_link(jee_question):
     """
     Searches YouTube for a video solution of a given JEE question using YouTube Data API.
@@ -48,7 +106,7 @@ def get_youtube_solution_link(jee_question):
     query = f"{jee_question} JEE solution"
 
     try:
-        search_response = youtube.search().list(
+        search_response = get_youtube_client().search().list(
             q=query,
             part="id",
             maxResults=1,
@@ -66,29 +124,119 @@ def get_youtube_solution_link(jee_question):
 
     return None  # No video found
 
-@st.cache_data(ttl=3600) # Cache the search results for an hour to reduce repeated calls
-def get_solution_link(jee_question, num_results=10):
+@st.cache_data(ttl=3600, show_spinner=False) # Cache the search results for an hour to reduce repeated calls
+def search_solution_link(jee_question, num_results=10):
     """
     Searches for a textual solution link for a given JEE question on specific educational sites.
+    Candidate pages are fetched concurrently; the highest-ranked page that passes the keyword
+    check wins, exactly as if the results had been checked one by one.
+    Raises if the web search itself fails. Safe to call from background threads.
     """
     query = f"{jee_question} JEE solution site:byjus.com OR site:unacademy.com OR site:toppr.com OR site:vedantu.com OR site:mathongo.com"
-    
+
+    deadline = time.monotonic() + SOLUTION_LOOKUP_DEADLINE
+    from googlesearch import search
+    urls = list(search(query, num_results=num_results))
+    return _first_matching_url(urls, deadline)
+
+
+def _resolve_solution_link(jee_question):
+    """Textual solution link for a question, or None; runs on prefetch threads, so failures are only logged."""
     try:
-        for url in search(query, num_results=num_results):
+        return search_solution_link(jee_question)
+    except Exception as e:
+        print(f"Error while searching for solution link: {e}")
+        return None
+
+
+def prefetch_question_links(jee_question: str) -> Dict[str, concurrent.futures.Future]:
+    """Start resolving the textual and YouTube solution links for one question in the background."""
+    return {
+        "text": _prefetch_executor.submit(_resolve_solution_link, jee_question),
+        "youtube": _prefetch_executor.submit(get_youtube_solution_link, jee_question),
+    }
+
+
+def prefetch_quiz_links(questions: List[Dict[str, Any]]) -> Dict[int, Dict[str, concurrent.futures.Future]]:
+    """
+    Start resolving solution links for every question of a quiz.
+    Returns a link map {question index: {"text": Future, "youtube": Future}}.
+    """
+    return {idx: prefetch_question_links(question["question"]) for idx, question in enumerate(questions)}
+
+
+def cancel_link_prefetch(link_map: Dict[int, Dict[str, concurrent.futures.Future]]):
+    """Cancel any link lookups of a link map that have not started yet."""
+    for links in link_map.values():
+        for future in links.values():
+            future.cancel()
+
+
+def _get_http_session() -> requests.Session:
+    """Return the process-wide pooled HTTP session used for solution page fetches."""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=SOLUTION_FETCH_WORKERS, pool_maxsize=SOLUTION_FETCH_WORKERS)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers.update({"User-Agent": SOLUTION_FETCH_USER_AGENT})
+            _http_session = session
+        return _http_session
+
+
+def _page_has_solution(url: str, cancelled: threading.Event) -> bool:
+    """Fetch a candidate page and check it for solution keywords, giving up early once cancelled."""
+    if cancelled.is_set():
+        return False
+    try:
+        with _get_http_session().get(url, timeout=SOLUTION_FETCH_TIMEOUT, stream=True) as response:
+            if response.status_code != 200:
+                return False
+            chunks = []
+            for chunk in response.iter_content(chunk_size=65536):
+                if cancelled.is_set():
+                    return False
+                chunks.append(chunk)
+            html = b"".join(chunks)
+    except requests.exceptions.RequestException:
+        return False
+
+    if cancelled.is_set():
+        return False
+    from bs4 import BeautifulSoup
+    page_text = BeautifulSoup(html, 'html.parser').get_text().lower()
+    return any(kw in page_text for kw in SOLUTION_KEYWORDS)
+
+
+def _first_matching_url(urls: List[str], deadline: float) -> Optional[str]:
+    """
+    Check all candidate URLs in parallel and return the first one, in search-rank order, whose page
+    passes the keyword check. Outstanding fetches are cancelled as soon as the winner is known.
+    If the deadline expires first, the best-ranked page that has already qualified is returned.
+    """
+    cancelled = threading.Event()
+    futures = [_fetch_executor.submit(_page_has_solution, url, cancelled) for url in urls]
+    try:
+        for url, future in zip(urls, futures):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
             try:
-                headers = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"}
-                response = requests.get(url, headers=headers, timeout=7) # Increased timeout slightly
-                if response.status_code == 200:
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    if any(kw in soup.get_text().lower() for kw in ["solution", "answer", "explanation", "jee"]):
-                        return url
-            except requests.exceptions.Timeout:
+                if future.result(timeout=remaining):
+                    return url
+            except concurrent.futures.TimeoutError:
+                break
+            except Exception:
                 continue
-            except requests.exceptions.RequestException as req_e:
-                continue
-            except Exception as e:
-                continue
-    except Exception as google_e:
-        st.warning(f"Could not perform web search for solution: {google_e}. This might be due to rate limits or network issues with the `googlesearch` library.")
 
-    return None # Return None if no suitable link is found
\ No newline at end of file
+        # Deadline hit while a better-ranked page was still loading: settle for what has finished.
+        for url, future in zip(urls, futures):
+            if future.done() and not future.cancelled() and future.exception() is None and future.result():
+                return url
+        return None
+    finally:
+        cancelled.set()
+        for future in futures:
+            future.cancel()